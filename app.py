@@ -14,6 +14,9 @@ from modules.data_manager import DataManager
 from modules.scoring_service import ScoringService
 from modules.visualization import Visualizer
 from utils.helpers import format_percentage
+from ui.common import (display_data_preview, get_cached_gap_report, get_cached_results, get_delta_report,
+                       get_export_cache, get_job_app_index, get_stored_run, load_sample_jobs,
+                       parse_upload, set_dataset_source)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -42,7 +45,10 @@ def load_config():
     """Load configuration with caching"""
     return ConfigManager()
 
+# The shared instance picks up edits to the configuration file without a
+# restart; caches keyed by the configuration version are invalidated
 config_manager = load_config()
+config_manager.reload_if_changed()
 
 # Debug mode toggle in sidebar
 with st.sidebar:
@@ -145,7 +151,7 @@ with main_container:
             
             if st.button("Load Sample Data"):
                 # Load sample data
-                sample_data = DataManager.load_sample_jobs()
+                sample_data = load_sample_jobs()
                 
                 if sample_data:
                     st.success(f"Sample data loaded successfully! {len(sample_data)} job applications available.")
@@ -231,15 +237,12 @@ with main_container:
         
         with upload_tab:
             st.write("Upload a JSON file containing job applications data")
-            uploaded_file = st.file_uploader("Choose a JSON file", type="json")
+            uploaded_file = st.file_uploader("Choose a JSON file", type=["json", "ndjson", "jsonl"])
             
             if uploaded_file is not None:
                 try:
-                    # Read the uploaded file
-                    content = uploaded_file.read().decode('utf-8')
-                    
-                    # Process the uploaded content
-                    success, data, message = DataManager.parse_uploaded_json(content)
+                    # Parse the uploaded bytes (JSON array or NDJSON) once per uploaded file
+                    success, data, message = parse_upload(uploaded_file)
                     
                     if success:
                         st.success(f"File uploaded successfully! {len(data)} job applications loaded.")
@@ -247,10 +250,11 @@ with main_container:
                         # Store the data in session state
                         st.session_state.job_data = data
                         st.session_state.data_source = "upload"
+                        # Re-uploads of the same file are scored as a delta
+                        set_dataset_source(data, f"upload:{uploaded_file.name}")
                         
                         # Show preview
-                        with st.expander("Preview uploaded data", expanded=False):
-                            st.json(data)
+                        display_data_preview(data)
                         
                         # Trigger processing
                         st.session_state.trigger_processing = True
@@ -272,11 +276,16 @@ with main_container:
         else:
             scoring_service = ScoringService(config_manager)
         
-        # Score all applications
-        results = scoring_service.score_all_applications(job_data)
-        
-        # Convert to dataframe for visualization
-        results_df = Visualizer.create_results_dataframe(results)
+        # Score all applications and build the results dataframe, cached by dataset
+        # content, weights and configuration across reruns and sessions
+        results, results_df = get_cached_results(scoring_service, job_data)
+        delta_report = get_delta_report(scoring_service, job_data)
+        if delta_report is not None:
+            Visualizer.display_delta_report(delta_report)
+        job_index = get_job_app_index(job_data)
+        if job_index.duplicates:
+            st.warning(f"{len(job_index.duplicates)} job_app_id values occur more than once; "
+                       f"detail views show the first application with each ID")
         
         # Display data source as a small badge
         data_source = st.session_state.get('data_source', 'unknown')
@@ -293,27 +302,37 @@ with main_container:
         with col1:
             st.subheader("Match Score Results")
             st.caption(source_labels.get(data_source, 'Data'))
-            # Display final scores table with a more compact design
-            Visualizer.display_final_scores_table(results)
+            # Display final scores table with a more compact design, paged from
+            # the results store when results are persisted
+            results_store, run_id = get_stored_run(scoring_service, job_data)
+            if run_id is not None:
+                Visualizer.display_stored_results(
+                    results_store, run_id, config_manager.get_results_store_settings().get("page_size", 50),
+                    key="results_page", weights=scoring_service.weights
+                )
+            else:
+                Visualizer.display_final_scores_table(
+                    results, top_k=config_manager.get_ranking_settings().get("display_top_k")
+                )
             
             # Export options in an expander to save space
             with st.expander("Export Options"):
-                Visualizer.export_results(results)
+                Visualizer.export_results(results, get_export_cache(job_data, scoring_service.weights, config_manager.version))
         
         with col2:
             # Show visualizations right next to the results
             st.subheader("Score Visualization")
-            Visualizer.display_total_scores_chart(results_df)
+            Visualizer.display_total_scores_chart(results_df, config_manager.get_chart_settings())
             
             # Show component score breakdown for the selected job application
             if len(results) > 1:
                 # If multiple results, let user select which one to examine
-                job_ids = [str(r["job_app_id"]) for r in results]
                 selected_job_id = st.selectbox("Select job application for detailed breakdown:", 
-                                            job_ids, key="job_selector")
+                                            job_index.labels, key="job_selector")
                 
-                # Find the selected result
-                selected_result = next((r for r in results if str(r["job_app_id"]) == selected_job_id), results[0])
+                # Find the selected result through the job_app_id index
+                position = job_index.label_position(selected_job_id)
+                selected_result = results[position if position is not None else 0]
             else:
                 # For single result (like from form input)
                 selected_result = results[0]
@@ -342,14 +361,18 @@ with main_container:
         
         # Display component score charts below in full width
         st.write("**Component Scores Comparison**")
-        Visualizer.display_component_scores_chart(results_df)
+        Visualizer.display_component_scores_chart(results_df, config_manager.get_chart_settings())
+        
+        # Population-wide gaps across all job applications
+        with st.expander("Skill Gap Analysis"):
+            Visualizer.display_gap_analysis(
+                get_cached_gap_report(scoring_service, job_data),
+                top_n=config_manager.get_chart_settings().get("top_n", 25)
+            )
         
         # Show detailed breakdown if debug mode is on
         if st.session_state.get('debug_mode', False):
-            st.subheader("Debug Information")
-            for result in results:
-                with st.expander(f"Job Application {result['job_app_id']} - Score: {result['total_score']}"):
-                    st.json(result)
+            Visualizer.display_debug_information(results, job_index, job_data)
     
     # Show JSON structure example in the sidebar
     with st.sidebar:
@@ -0,0 +1,248 @@
+"""
+Headless batch scoring for the job matching system.
+Scores job applications from files or stdin and exports the results without
+importing Streamlit, so it can run from cron jobs and worker processes.
+
+Usage:
+    python -m batch_cli applications.json --output results.csv
+    cat applications.ndjson | python -m batch_cli --output results.json --top-k 100
+    python -m batch_cli pool.jmcol --output results.csv
+    python -m batch_cli applications.json --output results.csv --store data/results.db
+    python -m batch_cli applications.json --output results.csv --store --source nightly
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List, Any, Iterator, Optional
+
+from modules.columnar_dataset import ColumnarDataset
+from modules.config_manager import ConfigManager
+from modules.data_manager import DataManager
+from modules.delta_ingestion import DatasetVersion
+from modules.results_store import ResultsStore
+from modules.score_cache import ScoreCache, application_hashes, hashes_fingerprint
+from modules.scoring_service import ScoringService
+from utils.helpers import export_results_to_columnar, export_results_to_csv, export_results_to_json
+
+logger = logging.getLogger(__name__)
+
+# Exporter per output format
+EXPORTERS = {
+    "csv": export_results_to_csv,
+    "json": export_results_to_json,
+    "npz": lambda results, file_path: export_results_to_columnar(results, file_path, file_format="npz"),
+    "parquet": lambda results, file_path: export_results_to_columnar(results, file_path, file_format="parquet")
+}
+
+
+def iter_applications(sources: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream validated job applications from files, "-" meaning stdin
+
+    Args:
+        sources: Input file paths of JSON arrays or NDJSON
+
+    Returns:
+        Iterator over job application dictionaries from all inputs
+    """
+    for source in sources:
+        if source == "-":
+            yield from DataManager.iter_job_applications(sys.stdin.buffer)
+        else:
+            with open(source, "rb") as f:
+                yield from DataManager.iter_job_applications(f)
+
+
+def parse_weights(assignments: List[str], config_manager: ConfigManager) -> Dict[str, float]:
+    """
+    Apply NAME=VALUE weight overrides on top of the configured weights
+
+    Args:
+        assignments: Weight overrides such as "core_skills=0.6"
+        config_manager: ConfigManager instance
+
+    Returns:
+        Dictionary of scoring weights
+    """
+    weights = dict(config_manager.get_weights())
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+        if not separator or name not in weights:
+            raise ValueError(f"Invalid weight '{assignment}', expected one of {sorted(weights)} as NAME=VALUE")
+        weights[name] = float(value)
+    return weights
+
+
+def load_previous_version(store_settings: Dict[str, Any], source: str, raw_scores_version: str,
+                          education_hierarchy: List[str]) -> Optional[DatasetVersion]:
+    """
+    Load the latest stored version of a source to score a new version against
+
+    Args:
+        store_settings: Results store settings with the path to use
+        source: Source label given with --source
+        raw_scores_version: ScoringService.raw_scores_version
+        education_hierarchy: Education hierarchy of the configuration
+
+    Returns:
+        DatasetVersion instance, or None if the store has no version of the source
+    """
+    if not os.path.isfile(store_settings["path"]):
+        return None
+    try:
+        results_store = ResultsStore.from_settings(store_settings)
+        try:
+            run_id = results_store.find_previous_run(source, raw_scores_version)
+            if run_id is None:
+                return None
+            return results_store.load_dataset_version(run_id, education_hierarchy)
+        finally:
+            results_store.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not load the previous version of {source}, scoring all applications: {str(e)}")
+        return None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m batch_cli",
+                                     description="Score job applications without the Streamlit UI")
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="JSON array or NDJSON files of job applications, '-' for stdin (default), "
+                             "or a single columnar dataset directory")
+    parser.add_argument("-o", "--output", required=True, help="File to write the results to")
+    parser.add_argument("-f", "--format", choices=sorted(EXPORTERS),
+                        help="Output format, inferred from the output file extension by default")
+    parser.add_argument("-c", "--config", default="config/scoring_config.yaml", help="Scoring configuration file")
+    parser.add_argument("-k", "--top-k", type=int, help="Export only the K best results, ordered by score")
+    parser.add_argument("-w", "--weight", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a scoring weight, may be repeated")
+    parser.add_argument("--engine", choices=ScoringService.ENGINES, help="Scoring engine override")
+    parser.add_argument("--parallel", action=argparse.BooleanOptionalAction, default=None,
+                        help="Override the batch.parallel setting")
+    parser.add_argument("--store", nargs="?", const="", metavar="PATH",
+                        help="Also save all results to a results store, results_store.path by default")
+    parser.add_argument("--source", metavar="NAME",
+                        help="Name of the dataset in the results store; with JSON inputs only applications "
+                             "changed since the previous run of NAME are scored (requires --store)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run batch scoring
+
+    Args:
+        argv: Command line arguments, sys.argv[1:] by default
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.source is not None and args.store is None:
+        parser.error("--source requires --store")
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr
+    )
+    extension = os.path.splitext(args.output)[1].lower().lstrip(".")
+    output_format = args.format or (extension if extension in EXPORTERS else "json")
+
+    try:
+        config_manager = ConfigManager(args.config)
+        weights = parse_weights(args.weight, config_manager)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    score_cache = ScoreCache.from_settings(config_manager.get_cache_settings())
+    scoring_service = ScoringService(config_manager, custom_weights=weights, engine=args.engine,
+                                     score_cache=score_cache)
+
+    store_settings = config_manager.get_results_store_settings()
+    store_settings = {**store_settings, "enabled": True,
+                      "path": args.store or store_settings.get("path") or "data/results.db"}
+
+    start = time.perf_counter()
+    stored = None
+    try:
+        if len(args.inputs) == 1 and ColumnarDataset.is_dataset(args.inputs[0]):
+            # Memory-mapped dataset: no parsing, arrays are scored in place
+            dataset = ColumnarDataset.open(args.inputs[0])
+            results = scoring_service.score_dataset(dataset, parallel=args.parallel, compact=True)
+            if args.store is not None:
+                content_hashes = application_hashes(dataset.iter_job_apps())
+                stored = (results, content_hashes)
+            if args.top_k:
+                results = results.top_k(args.top_k)
+            summary = f"Scored {len(dataset)} job applications from {args.inputs[0]}"
+        elif args.top_k and args.store is None:
+            # Applications are scored chunk by chunk while the input is still being read
+            applications = iter_applications(args.inputs)
+            results = scoring_service.rank_top_k(applications, args.top_k, engine=args.engine)
+            summary = f"Ranked the top {len(results)} job applications"
+        else:
+            job_apps = list(iter_applications(args.inputs))
+            content_hashes = application_hashes(job_apps) if args.store is not None else None
+            previous = None
+            if args.source is not None:
+                previous = load_previous_version(store_settings, args.source, scoring_service.raw_scores_version,
+                                                 scoring_service.plan.education_hierarchy)
+            if previous is not None:
+                # Only applications added or changed since the previous run are scored
+                raw_scores, delta_report = scoring_service.compute_delta_raw_scores(
+                    job_apps, previous, content_hashes, parallel=args.parallel
+                )
+                results = scoring_service.apply_weights(raw_scores, compact=True)
+                summary = (f"Scored {delta_report.rescored} of {len(job_apps)} job applications "
+                           f"({len(delta_report.added)} added, {len(delta_report.changed)} changed, "
+                           f"{len(delta_report.removed)} removed since run {previous.run_id})")
+            else:
+                results = scoring_service.score_all_applications(job_apps, parallel=args.parallel, compact=True)
+                summary = f"Scored {len(job_apps)} job applications"
+            if args.store is not None:
+                # The store keeps every result, so the top K are selected afterwards
+                stored = (results, content_hashes)
+            if args.top_k:
+                results = results.top_k(args.top_k)
+    except (OSError, ValueError) as e:
+        logger.error(f"Invalid job application data: {str(e)}")
+        return 1
+    finally:
+        if score_cache is not None:
+            score_cache.close()
+    scored = time.perf_counter()
+
+    if stored is not None:
+        store_path = store_settings["path"]
+        try:
+            results_store = ResultsStore.from_settings(store_settings)
+            try:
+                run_id = results_store.save_results(
+                    stored[0], hashes_fingerprint(stored[1]), scoring_service.raw_scores_version,
+                    scoring_service.weights, content_hashes=stored[1], source=args.source
+                )
+            finally:
+                results_store.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Could not store results in {store_path}: {str(e)}")
+            return 1
+        logger.info(f"Stored results as run {run_id} in {store_path}")
+
+    if not EXPORTERS[output_format](results, args.output):
+        logger.error(f"Could not write results to {args.output}")
+        return 1
+
+    logger.info(
+        f"{summary} in {scored - start:.3f}s, exported in {time.perf_counter() - scored:.3f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Synthetic data generator for the job matching benchmarks.
+Produces job applications in the DataManager.validate_job_data schema with
+Zipf-distributed skill and certification frequencies.
+"""
+import json
+import logging
+from typing import Dict, List, Any, Iterator, Optional, TextIO
+
+import numpy as np
+
+from modules.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+# Rows generated per vectorized draw
+GENERATION_CHUNK = 10000
+
+
+class SyntheticJobGenerator:
+    """Generates synthetic job applications at arbitrary scale"""
+
+    def __init__(self, education_levels: List[str], n_skills: int = 5000, n_certifications: int = 500,
+                 zipf_exponent: float = 1.1, seed: int = 0):
+        """
+        Initialize the generator
+
+        Args:
+            education_levels: Education levels to draw from, usually the configured hierarchy
+            n_skills: Size of the skill vocabulary
+            n_certifications: Size of the certification vocabulary
+            zipf_exponent: Exponent s of the Zipf law P(rank r) ~ 1 / r^s
+            seed: Random seed
+        """
+        self.education_levels = list(education_levels)
+        self.skills = [f"Skill {i}" for i in range(n_skills)]
+        self.certifications = [f"Certification {i}" for i in range(n_certifications)]
+        self.skill_probabilities = self._zipf_probabilities(n_skills, zipf_exponent)
+        self.certification_probabilities = self._zipf_probabilities(n_certifications, zipf_exponent)
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_config(cls, config_manager: ConfigManager, **kwargs) -> "SyntheticJobGenerator":
+        """
+        Create a generator using the configured education hierarchy
+
+        Args:
+            config_manager: Configuration manager instance
+            **kwargs: Other generator arguments
+
+        Returns:
+            SyntheticJobGenerator instance
+        """
+        return cls(config_manager.get_education_hierarchy(), **kwargs)
+
+    @staticmethod
+    def _zipf_probabilities(size: int, exponent: float) -> np.ndarray:
+        """Normalized Zipf probabilities for ranks 1..size"""
+        weights = 1.0 / np.arange(1, size + 1, dtype=np.float64) ** exponent
+        return weights / weights.sum()
+
+    def _draw_lists(self, names: List[str], probabilities: np.ndarray, counts: np.ndarray) -> List[List[str]]:
+        """Draw one de-duplicated item list per row with the given sizes"""
+        draws = self.rng.choice(len(names), size=int(counts.sum()), p=probabilities).tolist()
+        lists = []
+        position = 0
+        for count in counts.tolist():
+            lists.append([names[i] for i in dict.fromkeys(draws[position:position + count])])
+            position += count
+        return lists
+
+    def _generate_chunk(self, start_id: int, size: int) -> List[Dict[str, Any]]:
+        """Generate applications with ids start_id .. start_id + size - 1"""
+        rng = self.rng
+        required_skills = self._draw_lists(self.skills, self.skill_probabilities, rng.integers(1, 9, size))
+        required_certifications = self._draw_lists(self.certifications, self.certification_probabilities,
+                                                   rng.integers(0, 3, size))
+        talent_skills = self._draw_lists(self.skills, self.skill_probabilities, rng.integers(1, 13, size))
+        talent_certifications = self._draw_lists(self.certifications, self.certification_probabilities,
+                                                 rng.integers(0, 4, size))
+
+        # Talents usually hold part of what the job asks for
+        keep_fraction = rng.random(size)
+        min_experience = rng.integers(0, 11, size).tolist()
+        experience = rng.integers(0, 21, size).tolist()
+        # One extra slot for a missing education level
+        n_levels = len(self.education_levels)
+        required_education = rng.integers(0, n_levels + 1, size).tolist()
+        talent_education = rng.integers(0, n_levels + 1, size).tolist()
+
+        applications = []
+        for row in range(size):
+            required = required_skills[row]
+            kept = required[:int(len(required) * keep_fraction[row])]
+            applications.append({
+                "job_app_id": start_id + row,
+                "job_requirements": {
+                    "core_skills": required,
+                    "min_experience": min_experience[row],
+                    "education": self._education(required_education[row]),
+                    "certifications": required_certifications[row]
+                },
+                "talent_profile": {
+                    "skills": list(dict.fromkeys(kept + talent_skills[row])),
+                    "experience": experience[row],
+                    "education": self._education(talent_education[row]),
+                    "certifications": talent_certifications[row]
+                }
+            })
+        return applications
+
+    def _education(self, index: int) -> str:
+        return self.education_levels[index] if index < len(self.education_levels) else ""
+
+    def iter_applications(self, count: int, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Generate applications lazily, one chunk in memory at a time
+
+        Args:
+            count: Number of applications
+            start_id: First job_app_id
+
+        Yields:
+            Job application dictionaries
+        """
+        for offset in range(0, count, GENERATION_CHUNK):
+            size = min(GENERATION_CHUNK, count - offset)
+            yield from self._generate_chunk(start_id + offset, size)
+
+    def generate(self, count: int, start_id: int = 1) -> List[Dict[str, Any]]:
+        """
+        Generate a list of applications
+
+        Args:
+            count: Number of applications
+            start_id: First job_app_id
+
+        Returns:
+            List of job application dictionaries
+        """
+        return list(self.iter_applications(count, start_id))
+
+    def write_json(self, file: TextIO, count: int, start_id: int = 1, ndjson: bool = False):
+        """
+        Stream applications to a file as a JSON array or newline-delimited JSON
+
+        Args:
+            file: Text file object to write to
+            count: Number of applications
+            start_id: First job_app_id
+            ndjson: Write one application per line instead of a JSON array
+        """
+        if not ndjson:
+            file.write("[")
+        for position, application in enumerate(self.iter_applications(count, start_id)):
+            if ndjson:
+                file.write(json.dumps(application) + "\n")
+            else:
+                file.write(("," if position else "") + "\n" + json.dumps(application))
+        if not ndjson:
+            file.write("\n]\n")
+        logger.info(f"Wrote {count} synthetic job applications")
+
+
+def generate_job_applications(count: int, seed: int = 0, config_manager: Optional[ConfigManager] = None,
+                              **kwargs) -> List[Dict[str, Any]]:
+    """
+    Generate synthetic job applications with the configured education hierarchy
+
+    Args:
+        count: Number of applications
+        seed: Random seed
+        config_manager: Configuration manager, a default one is created if omitted
+        **kwargs: Other SyntheticJobGenerator arguments
+
+    Returns:
+        List of job application dictionaries
+    """
+    config_manager = config_manager or ConfigManager()
+    return SyntheticJobGenerator.from_config(config_manager, seed=seed, **kwargs).generate(count)
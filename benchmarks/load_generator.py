@@ -0,0 +1,283 @@
+"""
+Load generator for the job matching scoring service.
+Sends synthetic job applications to scoring_server over keep-alive connections
+and reports throughput, latency percentiles and the server's micro-batching.
+
+Usage:
+    python -m benchmarks.load_generator --spawn --requests 50000 --connections 128
+    python -m benchmarks.load_generator --port 8080 --duration 30 --output load_report.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.generator import SyntheticJobGenerator
+from modules.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+LATENCY_PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LoadClient:
+    """One keep-alive HTTP/1.1 connection to the scoring service"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        """
+        Send a request, reconnecting if the server closed the connection
+
+        Args:
+            method: HTTP method
+            path: Request target
+            body: Request body
+
+        Returns:
+            Tuple of (status code, response body)
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await self._writer.drain()
+
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        payload = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return int(status_line.split(" ")[1]), payload
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+
+
+async def run_load(host: str, port: int, bodies: List[bytes], path: str, connections: int,
+                   requests: int = None, duration: float = None) -> Dict[str, Any]:
+    """
+    Send requests from concurrent closed-loop connections
+
+    Each connection sends its next request as soon as the previous response
+    arrived, cycling through the request bodies.
+
+    Args:
+        host: Service host
+        port: Service port
+        bodies: Request bodies to cycle through
+        path: Request target, e.g. "/score"
+        connections: Number of concurrent connections
+        requests: Total number of requests to send
+        duration: Seconds to keep sending, used when requests is not given
+
+    Returns:
+        Dictionary with requests, errors, seconds, requests_per_second and
+        latency_ms percentiles
+    """
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    async def worker():
+        nonlocal sent
+        client = LoadClient(host, port)
+        try:
+            while True:
+                if requests is not None and sent >= requests:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                body = bodies[sent % len(bodies)]
+                sent += 1
+                request_start = time.perf_counter()
+                try:
+                    status, _ = await client.request("POST", path, body)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    logger.warning(f"Request failed: {str(e)}")
+                    await client.close()
+                    status = 0
+                latencies.append(time.perf_counter() - request_start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "path": path,
+        "connections": connections,
+        "requests": len(latencies),
+        "errors": len(latencies) - statuses.get(200, 0),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed > 0 else None,
+        "latency_ms": {
+            f"p{percentile:g}": float(np.percentile(latency_ms, percentile)) if len(latency_ms) else None
+            for percentile in LATENCY_PERCENTILES
+        } | {"max": float(latency_ms.max()) if len(latency_ms) else None}
+    }
+
+
+def build_bodies(config_manager: ConfigManager, pool: int, batch_size: int, seed: int) -> List[bytes]:
+    """
+    Encode synthetic job applications as request bodies
+
+    Args:
+        config_manager: Configuration manager for the education hierarchy
+        pool: Number of distinct applications
+        batch_size: Applications per body, 1 sends single applications
+        seed: Random seed of the generator
+
+    Returns:
+        List of JSON request bodies
+    """
+    job_apps = SyntheticJobGenerator.from_config(config_manager, seed=seed).generate(pool)
+    if batch_size <= 1:
+        return [json.dumps(job_app).encode("utf-8") for job_app in job_apps]
+    return [
+        json.dumps(job_apps[start:start + batch_size]).encode("utf-8")
+        for start in range(0, len(job_apps), batch_size)
+    ]
+
+
+def free_port() -> int:
+    """Pick an unused local port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(host: str, port: int, timeout: float = 30.0):
+    """Poll /health until the service answers"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        client = LoadClient(host, port)
+        try:
+            status, _ = await client.request("GET", "/health")
+            if status == 200:
+                return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await client.close()
+        if time.perf_counter() >= deadline:
+            raise TimeoutError(f"Scoring service on {host}:{port} did not start within {timeout}s")
+        await asyncio.sleep(0.1)
+
+
+async def fetch_stats(host: str, port: int) -> Optional[Dict[str, Any]]:
+    """Get the service statistics, None if unavailable"""
+    client = LoadClient(host, port)
+    try:
+        status, payload = await client.request("GET", "/stats")
+        return json.loads(payload) if status == 200 else None
+    except (ConnectionError, asyncio.IncompleteReadError):
+        return None
+    finally:
+        await client.close()
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a load report"""
+    latency = report["latency_ms"]
+    print(f"{report['requests']} requests to {report['path']} over {report['connections']} connections "
+          f"in {report['seconds']:.2f}s: {report['requests_per_second']:.0f} req/s, {report['errors']} errors")
+    print("latency ms: " + ", ".join(
+        f"{name} {value:.2f}" for name, value in latency.items() if value is not None
+    ))
+    batching = (report.get("server") or {}).get("batching")
+    if batching:
+        print(f"server: {batching['batches']} batches, mean batch size {batching['mean_batch_size']:.1f}, "
+              f"batch scoring time {batching['service_time_ms']:.2f} ms")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    config_manager = ConfigManager(args.config)
+    bodies = build_bodies(config_manager, args.pool, args.batch_size, args.seed)
+    path = "/score" if args.batch_size <= 1 else "/score/batch"
+    await wait_until_ready(args.host, args.port)
+    # Warm up connections and the scoring path before measuring
+    await run_load(args.host, args.port, bodies, path, args.connections, requests=args.connections)
+    report = await run_load(args.host, args.port, bodies, path, args.connections,
+                            requests=None if args.duration else args.requests, duration=args.duration)
+    report["server"] = await fetch_stats(args.host, args.port)
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate load against the job matching scoring service")
+    parser.add_argument("--host", default="127.0.0.1", help="Service host")
+    parser.add_argument("-p", "--port", type=int, help="Service port, defaults to server.port")
+    parser.add_argument("--spawn", action="store_true", help="Start a scoring_server process for the run")
+    parser.add_argument("-c", "--config", default="config/scoring_config.yaml", help="Scoring configuration file")
+    parser.add_argument("--connections", type=int, default=64, help="Concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=20000, help="Total number of requests")
+    parser.add_argument("--duration", type=float, help="Send requests for this many seconds instead")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Applications per request; above 1 requests go to /score/batch")
+    parser.add_argument("--pool", type=int, default=1000, help="Number of distinct synthetic applications")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generator")
+    parser.add_argument("--output", help="Report file to write")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    process = None
+    if args.spawn:
+        args.port = args.port or free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "scoring_server", "--config", os.path.abspath(args.config), "--host", args.host,
+             "--port", str(args.port)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+    elif args.port is None:
+        args.port = ConfigManager(args.config).get_server_settings().get("port", 8080)
+
+    try:
+        report = asyncio.run(run(args))
+    except (OSError, TimeoutError) as e:
+        logger.error(f"Load test failed: {str(e)}")
+        return 1
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
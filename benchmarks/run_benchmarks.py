@@ -0,0 +1,258 @@
+"""
+Benchmark suite for the job matching system.
+Times the data, scoring, results and export stages on synthetic datasets
+and writes throughput and peak memory per stage to a JSON report.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 --output benchmark_results.json
+    python -m benchmarks.run_benchmarks --compare baseline.json benchmark_results.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generator import SyntheticJobGenerator
+from modules.config_manager import ConfigManager
+from modules.data_manager import DataManager
+from modules.scoring_service import ScoringService
+from modules.visualization import Visualizer
+from utils.helpers import export_results_to_csv, export_results_to_json
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def measure(function: Callable[[], Any], repeat: int = 1, trace_memory: bool = True) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Time a stage and measure its peak traced memory
+
+    Timing runs are untraced; peak memory is taken from one extra run under
+    tracemalloc, which would otherwise slow the timed runs down.
+
+    Args:
+        function: Stage to run
+        repeat: Number of timed runs, the fastest is reported
+        trace_memory: Whether to measure peak memory
+
+    Returns:
+        Tuple of (stage return value, measurement dictionary)
+    """
+    timings = []
+    value = None
+    for _ in range(max(repeat, 1)):
+        value = None
+        start = time.perf_counter()
+        value = function()
+        timings.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if trace_memory:
+        value = None
+        tracemalloc.start()
+        try:
+            value = function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return value, {"seconds": min(timings), "peak_memory_bytes": peak_memory}
+
+
+def run_size(size: int, config_manager: ConfigManager, seed: int, engine: str, compact: bool,
+             repeat: int, trace_memory: bool, output_dir: str) -> List[Dict[str, Any]]:
+    """
+    Run all stages on one synthetic dataset
+
+    Args:
+        size: Number of job applications
+        config_manager: Configuration manager instance
+        seed: Random seed of the generator
+        engine: Scoring engine ("python" or "numpy")
+        compact: Score into ScoreResults instead of result dictionaries
+        repeat: Number of timed runs per stage
+        trace_memory: Whether to measure peak memory
+        output_dir: Directory for exporter output files
+
+    Returns:
+        One measurement dictionary per stage
+    """
+    generator = SyntheticJobGenerator.from_config(config_manager, seed=seed)
+    job_apps = generator.generate(size)
+    content = json.dumps(job_apps)
+    del job_apps
+
+    scoring_service = ScoringService(config_manager, engine=engine)
+    csv_path = os.path.join(output_dir, f"results_{size}.csv")
+    json_path = os.path.join(output_dir, f"results_{size}.json")
+
+    stages = []
+
+    def record(stage: str, function: Callable[[], Any]) -> Any:
+        value, measurement = measure(function, repeat, trace_memory)
+        seconds = measurement["seconds"]
+        stages.append({
+            "size": size,
+            "stage": stage,
+            **measurement,
+            "rows_per_second": size / seconds if seconds > 0 else None
+        })
+        logger.info(f"{stage} on {size} rows: {seconds:.4f}s")
+        return value
+
+    _, data, message = record("parse_uploaded_json", lambda: DataManager.parse_uploaded_json(content))
+    if data is None:
+        raise ValueError(f"Synthetic data failed validation: {message}")
+    del content
+    record("validate_job_data", lambda: DataManager.validate_job_data(data))
+    results = record("score_all_applications",
+                     lambda: scoring_service.score_all_applications(data, compact=compact))
+    record("create_results_dataframe", lambda: Visualizer.create_results_dataframe(results))
+    record("export_results_to_csv", lambda: export_results_to_csv(results, csv_path))
+    record("export_results_to_json", lambda: export_results_to_json(results, json_path))
+    return stages
+
+
+def run_benchmarks(sizes: List[int], seed: int = 0, engine: str = None, compact: bool = False,
+                   repeat: int = 1, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Run the benchmark suite
+
+    Args:
+        sizes: Dataset sizes to benchmark
+        seed: Random seed of the generator
+        engine: Scoring engine override
+        compact: Score into ScoreResults instead of result dictionaries
+        repeat: Number of timed runs per stage
+        trace_memory: Whether to measure peak memory
+
+    Returns:
+        Report dictionary
+    """
+    config_manager = ConfigManager()
+    engine = engine or config_manager.get_batch_settings().get("engine", "python")
+    stages = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            stages.extend(run_size(size, config_manager, seed, engine, compact, repeat, trace_memory, output_dir))
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__
+        },
+        "parameters": {
+            "sizes": sizes,
+            "seed": seed,
+            "engine": engine,
+            "compact": compact,
+            "repeat": repeat,
+            "trace_memory": trace_memory
+        },
+        "stages": stages
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare two reports stage by stage
+
+    Args:
+        baseline: Earlier report
+        current: Later report
+
+    Returns:
+        One dictionary per (size, stage) present in both reports, with the
+        speedup (baseline seconds / current seconds) and memory ratio
+    """
+    previous = {(stage["size"], stage["stage"]): stage for stage in baseline["stages"]}
+    comparison = []
+    for stage in current["stages"]:
+        before = previous.get((stage["size"], stage["stage"]))
+        if before is None:
+            continue
+        memory_ratio = None
+        if before.get("peak_memory_bytes") and stage.get("peak_memory_bytes") is not None:
+            memory_ratio = stage["peak_memory_bytes"] / before["peak_memory_bytes"]
+        comparison.append({
+            "size": stage["size"],
+            "stage": stage["stage"],
+            "baseline_seconds": before["seconds"],
+            "current_seconds": stage["seconds"],
+            "speedup": before["seconds"] / stage["seconds"] if stage["seconds"] > 0 else None,
+            "memory_ratio": memory_ratio
+        })
+    return comparison
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a report as a table"""
+    print(f"{'size':>10}  {'stage':<26} {'seconds':>10} {'rows/s':>14} {'peak MiB':>10}")
+    for stage in report["stages"]:
+        rate = f"{stage['rows_per_second']:.0f}" if stage["rows_per_second"] else "-"
+        memory = f"{stage['peak_memory_bytes'] / 2 ** 20:.1f}" if stage["peak_memory_bytes"] is not None else "-"
+        print(f"{stage['size']:>10}  {stage['stage']:<26} {stage['seconds']:>10.4f} {rate:>14} {memory:>10}")
+
+
+def print_comparison(comparison: List[Dict[str, Any]]):
+    """Print a report comparison as a table"""
+    print(f"{'size':>10}  {'stage':<26} {'baseline s':>11} {'current s':>11} {'speedup':>8} {'memory':>8}")
+    for row in comparison:
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "-"
+        memory = f"{row['memory_ratio']:.2f}x" if row["memory_ratio"] is not None else "-"
+        print(f"{row['size']:>10}  {row['stage']:<26} {row['baseline_seconds']:>11.4f} "
+              f"{row['current_seconds']:>11.4f} {speedup:>8} {memory:>8}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the job matching pipeline on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Dataset sizes to benchmark (1k to 10M)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generator")
+    parser.add_argument("--engine", choices=ScoringService.ENGINES, help="Scoring engine override")
+    parser.add_argument("--compact", action="store_true", help="Score into compact ScoreResults")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage, the fastest is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    parser.add_argument("--output", default="benchmark_results.json", help="Report file to write")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two report files instead of running")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.compare:
+        with open(args.compare[0], "r") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], "r") as f:
+            current = json.load(f)
+        print_comparison(compare_reports(baseline, current))
+        return 0
+
+    report = run_benchmarks(args.sizes, args.seed, args.engine, args.compact, args.repeat, not args.no_memory)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,506 @@
+"""
+Columnar batch scoring engine for the job matching system.
+Scores many job applications at once using whole-array NumPy operations.
+"""
+import gc
+import logging
+from contextlib import contextmanager
+from itertools import chain
+from typing import Dict, List, Any, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.scoring_plan import COMPONENTS, ScoringPlan
+from modules.vocabulary import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Education ranks of levels missing from an application and of levels not in the hierarchy
+MISSING_EDUCATION_RANK = -2
+UNKNOWN_EDUCATION_RANK = -1
+
+# Codes of RawScores.int_scores: the Python type ScoringService.score_job_application
+# gives a score, so batch results serialize exactly like per-row results
+FLOAT_SCORE = 0
+INT_RAW_SCORE = 1  # raw_score is an int, weighted_score is raw_score * weight
+INT_SCORE = 2  # raw_score and weighted_score are the int 0 of a skipped component
+
+
+def _number_column(values: Sequence[Any], name: str, job_app_ids: List[Any],
+                   used: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Convert the values of a numeric field to a float array
+
+    Values that are not numbers raise TypeError, like the arithmetic of the
+    per-row scorer, instead of being converted; where used is False the
+    value is never read by the scorer and becomes 0.
+
+    Args:
+        values: Field value of every application
+        name: Field name for error messages
+        job_app_ids: Job application IDs in row order
+        used: Optional mask of the rows whose value is scored
+
+    Returns:
+        Float64 array
+    """
+    column = np.array(values)
+    if column.ndim == 1 and column.dtype.kind in "biuf":
+        return column.astype(np.float64)
+    numbers = [isinstance(value, (int, float, np.number)) for value in values]
+    for position, is_number in enumerate(numbers):
+        if not is_number and (used is None or used[position]):
+            raise TypeError(f"{name} of job application {job_app_ids[position]!r} must be a number, "
+                            f"got {type(values[position]).__name__}")
+    return np.array([value if is_number else 0 for value, is_number in zip(values, numbers)], dtype=np.float64)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause cyclic garbage collection while building many acyclic containers"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ApplicationColumns:
+    """Job applications loaded once into columnar arrays"""
+
+    # Numeric arrays that fully describe the applications for scoring
+    ARRAY_FIELDS = (
+        "req_skill_ptr", "req_skill_ids", "cand_skill_ptr", "cand_skill_ids",
+        "req_cert_ptr", "req_cert_ids", "cand_cert_ptr", "cand_cert_ids",
+        "min_experience", "experience", "required_education_rank", "candidate_education_rank"
+    )
+
+    def __init__(
+        self,
+        job_app_ids: List[Any],
+        req_skill_ptr: np.ndarray,
+        req_skill_ids: np.ndarray,
+        cand_skill_ptr: np.ndarray,
+        cand_skill_ids: np.ndarray,
+        req_cert_ptr: np.ndarray,
+        req_cert_ids: np.ndarray,
+        cand_cert_ptr: np.ndarray,
+        cand_cert_ids: np.ndarray,
+        min_experience: np.ndarray,
+        experience: np.ndarray,
+        required_education_rank: np.ndarray,
+        candidate_education_rank: np.ndarray,
+        vocabulary: Vocabulary
+    ):
+        """
+        Initialize from prebuilt arrays
+
+        Skill and certification lists are stored as CSR pairs: the ids of
+        row i are ``ids[ptr[i]:ptr[i + 1]]``. Education ranks are indexes into
+        the education hierarchy, MISSING_EDUCATION_RANK for missing levels and
+        UNKNOWN_EDUCATION_RANK for levels not in the hierarchy.
+        """
+        self.job_app_ids = job_app_ids
+        self.req_skill_ptr = req_skill_ptr
+        self.req_skill_ids = req_skill_ids
+        self.cand_skill_ptr = cand_skill_ptr
+        self.cand_skill_ids = cand_skill_ids
+        self.req_cert_ptr = req_cert_ptr
+        self.req_cert_ids = req_cert_ids
+        self.cand_cert_ptr = cand_cert_ptr
+        self.cand_cert_ids = cand_cert_ids
+        self.min_experience = min_experience
+        self.experience = experience
+        self.required_education_rank = required_education_rank
+        self.candidate_education_rank = candidate_education_rank
+        self.vocabulary = vocabulary
+
+    def __len__(self) -> int:
+        return len(self.min_experience)
+
+    def slice_rows(self, start: int, stop: int) -> "ApplicationColumns":
+        """
+        Return the columns for rows [start, stop) without copying id arrays
+
+        Args:
+            start: First row
+            stop: Row after the last row
+
+        Returns:
+            ApplicationColumns instance for the row range
+        """
+        arrays = {}
+        for prefix in ("req_skill", "cand_skill", "req_cert", "cand_cert"):
+            ptr = getattr(self, f"{prefix}_ptr")
+            arrays[f"{prefix}_ptr"] = ptr[start:stop + 1] - ptr[start]
+            arrays[f"{prefix}_ids"] = getattr(self, f"{prefix}_ids")[ptr[start]:ptr[stop]]
+        for name in ("min_experience", "experience", "required_education_rank", "candidate_education_rank"):
+            arrays[name] = getattr(self, name)[start:stop]
+
+        job_app_ids = self.job_app_ids[start:stop] if self.job_app_ids is not None else None
+        return ApplicationColumns(job_app_ids=job_app_ids, vocabulary=self.vocabulary, **arrays)
+
+    @classmethod
+    def from_job_apps(cls, job_apps: List[Dict[str, Any]], plan: ScoringPlan,
+                      vocabulary: Vocabulary = None) -> "ApplicationColumns":
+        """
+        Build columns from a list of job application dictionaries
+
+        Skill and certification fields may be lists or bitsets encoded with
+        the given vocabulary. Items are interned per distinct item rather than
+        per occurrence, and experience values that are not numbers raise
+        TypeError like the per-row scorer.
+
+        Args:
+            job_apps: List of job application dictionaries
+            plan: Compiled scoring plan providing education ranks
+            vocabulary: Optional shared vocabulary, a new one is created if omitted
+
+        Returns:
+            ApplicationColumns instance
+        """
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        job_app_ids = [job_app.get("job_app_id") for job_app in job_apps]
+        requirements = [job_app.get("job_requirements", {}) for job_app in job_apps]
+        profiles = [job_app.get("talent_profile", {}) for job_app in job_apps]
+
+        def csr(sections: List[Dict[str, Any]], field: str) -> Tuple[np.ndarray, np.ndarray]:
+            item_lists = [section.get(field, []) for section in sections]
+            # Bitsets are decoded to their items, which map back to the same ids
+            if int in set(map(type, item_lists)):
+                item_lists = [vocabulary.decode(items) if isinstance(items, int) else items for items in item_lists]
+            ptr = np.zeros(len(item_lists) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter(map(len, item_lists), dtype=np.int64, count=len(item_lists)), out=ptr[1:])
+            return ptr, vocabulary.to_id_array(list(chain.from_iterable(item_lists)))
+
+        req_skill_ptr, req_skill_ids = csr(requirements, "core_skills")
+        cand_skill_ptr, cand_skill_ids = csr(profiles, "skills")
+        req_cert_ptr, req_cert_ids = csr(requirements, "certifications")
+        cand_cert_ptr, cand_cert_ids = csr(profiles, "certifications")
+
+        min_experience = _number_column(
+            [section.get("min_experience", 0) for section in requirements], "min_experience", job_app_ids
+        )
+        # Experience is only read when a minimum is required
+        experience = _number_column(
+            [profile.get("experience", 0) for profile in profiles], "experience", job_app_ids,
+            used=min_experience != 0
+        )
+
+        # Missing levels ("" or None) and unknown levels get distinct negative ranks
+        education_rank = dict(plan.education_rank)
+        education_rank.update({"": MISSING_EDUCATION_RANK, None: MISSING_EDUCATION_RANK})
+        required_education = [education_rank.get(section.get("education"), UNKNOWN_EDUCATION_RANK)
+                              for section in requirements]
+        candidate_education = [education_rank.get(profile.get("education"), UNKNOWN_EDUCATION_RANK)
+                               for profile in profiles]
+
+        return cls(
+            job_app_ids=job_app_ids,
+            req_skill_ptr=req_skill_ptr,
+            req_skill_ids=req_skill_ids,
+            cand_skill_ptr=cand_skill_ptr,
+            cand_skill_ids=cand_skill_ids,
+            req_cert_ptr=req_cert_ptr,
+            req_cert_ids=req_cert_ids,
+            cand_cert_ptr=cand_cert_ptr,
+            cand_cert_ids=cand_cert_ids,
+            min_experience=min_experience,
+            experience=experience,
+            required_education_rank=np.asarray(required_education, dtype=np.int64),
+            candidate_education_rank=np.asarray(candidate_education, dtype=np.int64),
+            vocabulary=vocabulary
+        )
+
+
+def round_scores(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round(value, ndigits)
+
+    np.round scales, rounds and unscales, which only differs from the
+    correctly rounded built-in when the scaled value sits on a rounding
+    midpoint; those few elements are rounded with the built-in.
+
+    Args:
+        values: Float array of any shape
+        ndigits: Number of decimal places
+
+    Returns:
+        Float array of rounded values with the same shape
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.round(scaled) / scale
+    with np.errstate(invalid="ignore"):
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(value, ndigits) for value in values[near_half].tolist()]
+    return rounded
+
+
+def match_required_items(req_ptr: np.ndarray, req_ids: np.ndarray,
+                         cand_ptr: np.ndarray, cand_ids: np.ndarray,
+                         vocab_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Check every required item against the candidate items of its row
+
+    Returns:
+        Tuple of (row of each required item, boolean mask of the required
+        items the candidate has), both aligned with req_ids
+    """
+    n_rows = len(req_ptr) - 1
+    req_rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(req_ptr))
+    cand_rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(cand_ptr))
+
+    # Encode (row, item) pairs as single integers and look them up in the
+    # sorted candidate keys; keys are grouped by row, so the search is cache friendly
+    stride = max(vocab_size, int(req_ids.max(initial=-1)) + 1, int(cand_ids.max(initial=-1)) + 1, 1)
+    req_keys = req_rows * stride + req_ids
+    cand_keys = np.sort(cand_rows * stride + cand_ids)
+    if len(cand_keys):
+        positions = np.minimum(np.searchsorted(cand_keys, req_keys), len(cand_keys) - 1)
+        hits = cand_keys[positions] == req_keys
+    else:
+        hits = np.zeros(len(req_keys), dtype=bool)
+    return req_rows, hits
+
+
+def count_required_matches(req_ptr: np.ndarray, req_ids: np.ndarray,
+                           cand_ptr: np.ndarray, cand_ids: np.ndarray,
+                           vocab_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count, per row, how many required items appear in the candidate items
+
+    Duplicated required items are counted once per occurrence, exactly like
+    the per-row list comprehension in ScoringService.
+
+    Returns:
+        Tuple of (match_counts, required_counts) as float arrays
+    """
+    n_rows = len(req_ptr) - 1
+    req_rows, hits = match_required_items(req_ptr, req_ids, cand_ptr, cand_ids, vocab_size)
+    matches = np.bincount(req_rows, weights=hits, minlength=n_rows)
+
+    return matches, np.diff(req_ptr).astype(np.float64)
+
+
+class RawScores:
+    """Weight-independent raw component scores for one dataset"""
+
+    def __init__(self, job_app_ids: List[Any], raw: np.ndarray, education_hierarchy: Tuple[str, ...],
+                 int_scores: Optional[np.ndarray] = None):
+        """
+        Initialize with job application IDs and their raw score matrix
+
+        Args:
+            job_app_ids: Job application IDs in row order
+            raw: Float array of shape (N, 4) in COMPONENTS order
+            education_hierarchy: Education hierarchy the scores were computed with
+            int_scores: Optional uint8 codes of shape (N, 4) from
+                BatchScoringEngine.compute_int_scores; without them result
+                dictionaries hold every score as a float
+        """
+        self.job_app_ids = job_app_ids
+        self.raw = raw
+        self.education_hierarchy = tuple(education_hierarchy)
+        self.int_scores = int_scores
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+
+class BatchScoringEngine:
+    """Vectorized scoring of job applications held in ApplicationColumns"""
+
+    def __init__(self, plan: ScoringPlan):
+        """
+        Initialize with a compiled scoring plan
+
+        Args:
+            plan: ScoringPlan holding education scores and resolved weights
+        """
+        self.plan = plan
+        self.weight_vector = np.array(plan.weight_vector, dtype=np.float64)
+        self.education_scores = np.array(plan.education_scores, dtype=np.float64).reshape(
+            len(plan.education_hierarchy), len(plan.education_hierarchy)
+        )
+
+    def load(self, job_apps: List[Dict[str, Any]], vocabulary: Vocabulary = None) -> ApplicationColumns:
+        """Load job applications into columnar form"""
+        return ApplicationColumns.from_job_apps(job_apps, self.plan, vocabulary)
+
+    def compute_raw_scores(self, columns: ApplicationColumns) -> np.ndarray:
+        """
+        Compute raw component scores for all applications
+
+        Args:
+            columns: ApplicationColumns instance
+
+        Returns:
+            Float array of shape (N, 4) in COMPONENTS order
+        """
+        n_rows = len(columns)
+        raw = np.zeros((n_rows, len(COMPONENTS)), dtype=np.float64)
+        vocab_size = len(columns.vocabulary) if columns.vocabulary is not None else 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Core skills: percentage of required skills present, 0 if none required
+            matches, required = count_required_matches(
+                columns.req_skill_ptr, columns.req_skill_ids,
+                columns.cand_skill_ptr, columns.cand_skill_ids, vocab_size
+            )
+            raw[:, 0] = np.where(required > 0, (matches / required) * 100, 0.0)
+
+            # Experience: ratio to the minimum, capped at 100, 100 if no minimum
+            ratio = (columns.experience / columns.min_experience) * 100
+            raw[:, 1] = np.where(columns.min_experience == 0, 100.0, np.minimum(ratio, 100))
+
+            # Education: gather from the plan's required-vs-candidate score matrix
+            required_rank = columns.required_education_rank
+            candidate_rank = columns.candidate_education_rank
+            known = (required_rank >= 0) & (candidate_rank >= 0)
+            raw[known, 2] = self.education_scores[required_rank[known], candidate_rank[known]]
+
+            # Certifications: percentage of required certifications, 100 if none required
+            matches, required = count_required_matches(
+                columns.req_cert_ptr, columns.req_cert_ids,
+                columns.cand_cert_ptr, columns.cand_cert_ids, vocab_size
+            )
+            raw[:, 3] = np.where(required > 0, (matches / required) * 100, 100.0)
+
+        return raw
+
+    def compute_int_scores(self, columns: ApplicationColumns, raw: np.ndarray) -> np.ndarray:
+        """
+        Mark the scores that the per-row scorer returns as int
+
+        ScoringService.score_job_application returns int literals for
+        skipped components and min(ratio, 100) returns the int 100 when the
+        experience ratio exceeds it; all other scores are floats.
+
+        Args:
+            columns: ApplicationColumns instance
+            raw: Raw score matrix of the columns from compute_raw_scores
+
+        Returns:
+            Uint8 array of shape (N, 4) holding FLOAT_SCORE, INT_RAW_SCORE or INT_SCORE
+        """
+        codes = np.full(raw.shape, FLOAT_SCORE, dtype=np.uint8)
+        codes[np.diff(columns.req_skill_ptr) == 0, 0] = INT_SCORE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (columns.experience / columns.min_experience) * 100
+        codes[(columns.min_experience == 0) | (ratio > 100), 1] = INT_RAW_SCORE
+        # Hierarchy scores are the int 100 or max(0, partial), which is the int 0 at the bottom
+        codes[(raw[:, 2] == 0) | (raw[:, 2] == 100), 2] = INT_RAW_SCORE
+        missing = ((columns.required_education_rank == MISSING_EDUCATION_RANK)
+                   | (columns.candidate_education_rank == MISSING_EDUCATION_RANK))
+        codes[missing, 2] = INT_SCORE
+        codes[np.diff(columns.req_cert_ptr) == 0, 3] = INT_RAW_SCORE
+        return codes
+
+    def compute_weighted_scores(self, raw: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply weights to a raw score matrix
+
+        Totals are the matrix-vector product raw @ weights, evaluated column
+        by column in the per-row summation order.
+
+        Args:
+            raw: Float array of shape (N, 4) in COMPONENTS order
+
+        Returns:
+            Tuple of (weighted matrix, rounded total scores)
+        """
+        weighted = raw * self.weight_vector
+        # Sum in the same order as ScoringService.score_job_application so
+        # floating point results are bit-identical
+        totals = weighted[:, 0] + weighted[:, 2] + weighted[:, 1] + weighted[:, 3]
+        return weighted, round_scores(totals)
+
+    def compute_scores(self, columns: ApplicationColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute raw, weighted and total scores for all applications
+
+        Args:
+            columns: ApplicationColumns instance
+
+        Returns:
+            Tuple of (raw matrix, weighted matrix, rounded total scores)
+        """
+        raw = self.compute_raw_scores(columns)
+        weighted, totals = self.compute_weighted_scores(raw)
+        return raw, weighted, totals
+
+    def score_columns(self, columns: ApplicationColumns) -> List[Dict[str, Any]]:
+        """
+        Score columnar applications and return per-application result dictionaries
+
+        Args:
+            columns: ApplicationColumns instance
+
+        Returns:
+            List of scoring result dictionaries
+        """
+        raw, weighted, totals = self.compute_scores(columns)
+        return build_results(columns.job_app_ids, raw, weighted, totals,
+                             self.compute_int_scores(columns, raw), self.plan.weight_vector)
+
+    def score_all(self, job_apps: List[Dict[str, Any]], vocabulary: Vocabulary = None) -> List[Dict[str, Any]]:
+        """Load and score a list of job applications"""
+        return self.score_columns(self.load(job_apps, vocabulary))
+
+
+def build_results(job_app_ids: List[Any], raw: np.ndarray, weighted: np.ndarray, totals: np.ndarray,
+                  int_scores: Optional[np.ndarray] = None,
+                  weight_vector: Optional[Sequence[float]] = None) -> List[Dict[str, Any]]:
+    """
+    Convert score arrays into the result dictionaries returned by ScoringService
+
+    Args:
+        job_app_ids: Job application IDs in row order
+        raw: Raw score matrix in COMPONENTS order
+        weighted: Weighted score matrix in COMPONENTS order
+        totals: Rounded total scores
+        int_scores: Optional codes from BatchScoringEngine.compute_int_scores;
+            the marked scores are returned as int like the per-row scorer does
+        weight_vector: Weights the scores were computed with, needed with
+            int_scores since an int raw score times an int weight is an int
+
+    Returns:
+        List of scoring result dictionaries
+    """
+    raw_columns = raw.T.tolist()
+    weighted_columns = weighted.T.tolist()
+    total_list = totals.tolist()
+    if int_scores is not None and len(total_list):
+        weight_vector = weight_vector if weight_vector is not None else (0.0,) * len(COMPONENTS)
+        all_weighted_int = np.ones(len(total_list), dtype=bool)
+        for component, weight in enumerate(weight_vector):
+            codes = int_scores[:, component]
+            raw_int = codes != FLOAT_SCORE
+            weighted_int = (codes == INT_SCORE) | (raw_int & isinstance(weight, int))
+            all_weighted_int &= weighted_int
+            for values, mask in ((raw_columns[component], raw_int), (weighted_columns[component], weighted_int)):
+                for row in np.flatnonzero(mask).tolist():
+                    values[row] = int(values[row])
+        # round() keeps a sum of ints an int
+        for row in np.flatnonzero(all_weighted_int).tolist():
+            total_list[row] = int(total_list[row])
+
+    # Six dictionaries per row would otherwise trigger many needless collections
+    with _gc_paused():
+        return [{
+            "job_app_id": job_app_id,
+            "total_score": total,
+            "scores": {
+                "core_skills": {"raw_score": core_skills, "weighted_score": core_skills_weighted},
+                "education": {"raw_score": education, "weighted_score": education_weighted},
+                "experience": {"raw_score": experience, "weighted_score": experience_weighted},
+                "certifications": {"raw_score": certifications, "weighted_score": certifications_weighted}
+            }
+        } for (job_app_id, total, core_skills, experience, education, certifications,
+               core_skills_weighted, experience_weighted, education_weighted, certifications_weighted)
+            in zip(job_app_ids, total_list, *raw_columns, *weighted_columns)]
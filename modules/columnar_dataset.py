@@ -0,0 +1,477 @@
+"""
+Columnar on-disk datasets for the job matching system.
+Stores job applications as flat binary arrays (skill and certification id
+CSR arrays, numeric columns, string tables) that are opened with
+numpy.memmap, so large pools load instantly and are shared between
+processes through the page cache.
+
+Usage:
+    python -m modules.columnar_dataset to-columnar applications.json pool.jmcol
+    python -m modules.columnar_dataset to-json pool.jmcol applications.json
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import uuid
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator, Optional
+
+import numpy as np
+
+from modules.batch_engine import MISSING_EDUCATION_RANK, UNKNOWN_EDUCATION_RANK, ApplicationColumns
+from modules.data_manager import DataManager
+from modules.ingestion import iter_batches
+from modules.scoring_plan import ScoringPlan
+from modules.vocabulary import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "job-matching-columnar"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Applications converted per batch when writing
+WRITE_BATCH_SIZE = 100000
+
+# CSR list columns: (prefix, section, field)
+LIST_COLUMNS = (
+    ("req_skill", "job_requirements", "core_skills"),
+    ("cand_skill", "talent_profile", "skills"),
+    ("req_cert", "job_requirements", "certifications"),
+    ("cand_cert", "talent_profile", "certifications")
+)
+
+# Numeric columns: (name, section, field)
+NUMBER_COLUMNS = (
+    ("min_experience", "job_requirements", "min_experience"),
+    ("experience", "talent_profile", "experience")
+)
+
+# Education columns hold codes into the education level table, -1 when missing
+EDUCATION_COLUMNS = (
+    ("required_education", "job_requirements", "education"),
+    ("candidate_education", "talent_profile", "education")
+)
+
+ARRAY_DTYPES = {
+    **{f"{prefix}_ptr": "<i8" for prefix, _, _ in LIST_COLUMNS},
+    **{f"{prefix}_ids": "<i4" for prefix, _, _ in LIST_COLUMNS},
+    **{name: "<f8" for name, _, _ in NUMBER_COLUMNS},
+    **{name: "<i4" for name, _, _ in EDUCATION_COLUMNS}
+}
+
+
+def _map_array(path: str, name: str, dtype: str, length: int) -> np.ndarray:
+    """Open a read-only memory map of one array file (empty files cannot be mapped)"""
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(length,))
+
+
+def _write_strings(path: str, name: str, strings: List[str]) -> Dict[str, Any]:
+    """Write a string table as UTF-8 data plus int64 offsets"""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    offsets.tofile(os.path.join(path, f"{name}_offsets.bin"))
+    with open(os.path.join(path, f"{name}_data.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    return {"count": len(strings), "bytes": int(offsets[-1])}
+
+
+def _read_strings(path: str, name: str, spec: Dict[str, Any]) -> List[str]:
+    """Read a string table written by _write_strings"""
+    offsets = _map_array(path, f"{name}_offsets", "<i8", spec["count"] + 1 if spec["count"] else 0)
+    data = _map_array(path, f"{name}_data", "u1", spec["bytes"])
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(spec["count"])]
+
+
+def _plain_number(value: float) -> Any:
+    """Return integral floats as int, as they usually appear in the JSON schema"""
+    return int(value) if value.is_integer() else value
+
+
+class ColumnarDatasetWriter:
+    """Writes job applications to a columnar dataset directory in batches"""
+
+    def __init__(self, path: str, vocabulary: Vocabulary = None):
+        """
+        Create a staging directory next to the dataset and open its array files
+
+        The dataset is written to the staging directory and moved into place
+        by close(), so an existing dataset at path stays intact until the new
+        one is complete.
+
+        Args:
+            path: Dataset directory; must be missing, empty or an existing dataset
+            vocabulary: Vocabulary used to decode bitset fields, if any; new
+                skills and certifications are interned into it
+        """
+        if os.path.exists(path) and not ColumnarDataset.is_dataset(path) and (
+                not os.path.isdir(path) or os.listdir(path)):
+            raise FileExistsError(f"{path} exists and is not a columnar dataset")
+        self.path = path
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.education_levels = Vocabulary()
+        self.rows = 0
+        self.lengths = {name: 0 for name in ARRAY_DTYPES}
+        # Integer job_app_ids are stored as an int64 column, anything else as JSON strings
+        self.int_ids = True
+        self.id_strings: List[str] = []
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        # Created with os.mkdir rather than tempfile.mkdtemp so the dataset gets default permissions
+        self._staging = os.path.join(parent, f".{os.path.basename(os.path.abspath(path))}.{uuid.uuid4().hex[:12]}")
+        os.mkdir(self._staging)
+        self._files: Dict[str, BinaryIO] = {
+            name: open(os.path.join(self._staging, f"{name}.bin"), "wb") for name in ARRAY_DTYPES
+        }
+        self._files["job_app_ids"] = open(os.path.join(self._staging, "job_app_ids.bin"), "wb")
+        self._offsets = {prefix: 0 for prefix, _, _ in LIST_COLUMNS}
+        for prefix, _, _ in LIST_COLUMNS:
+            self._write(f"{prefix}_ptr", np.zeros(1, dtype="<i8"))
+
+    def _write(self, name: str, array: np.ndarray):
+        array.astype(ARRAY_DTYPES.get(name, "<i8"), copy=False).tofile(self._files[name])
+        self.lengths[name] = self.lengths.get(name, 0) + len(array)
+
+    def append(self, job_apps: List[Dict[str, Any]]):
+        """
+        Append a batch of job applications
+
+        Args:
+            job_apps: List of job application dictionaries
+        """
+        for prefix, section, field in LIST_COLUMNS:
+            rows = [self.vocabulary.to_ids(job_app.get(section, {}).get(field, [])) for job_app in job_apps]
+            lengths = np.fromiter((len(ids) for ids in rows), dtype=np.int64, count=len(rows))
+            ends = self._offsets[prefix] + np.cumsum(lengths)
+            self._write(f"{prefix}_ptr", ends)
+            self._write(f"{prefix}_ids", np.fromiter((i for ids in rows for i in ids), dtype=np.int64,
+                                                     count=int(lengths.sum())))
+            if len(ends):
+                self._offsets[prefix] = int(ends[-1])
+
+        for name, section, field in NUMBER_COLUMNS:
+            self._write(name, np.array([job_app.get(section, {}).get(field, 0) for job_app in job_apps],
+                                       dtype=np.float64))
+
+        for name, section, field in EDUCATION_COLUMNS:
+            levels = [job_app.get(section, {}).get(field) for job_app in job_apps]
+            self._write(name, np.array([self.education_levels.intern(level) if level is not None else -1
+                                        for level in levels], dtype=np.int64))
+
+        self._append_ids([job_app.get("job_app_id") for job_app in job_apps])
+        self.rows += len(job_apps)
+
+    def _append_ids(self, job_app_ids: List[Any]):
+        if self.int_ids and all(type(job_app_id) is int for job_app_id in job_app_ids):
+            self._write("job_app_ids", np.array(job_app_ids, dtype="<i8"))
+            return
+        if self.int_ids:
+            # Switch to JSON strings, converting the ids written so far
+            self._files["job_app_ids"].close()
+            written = np.fromfile(os.path.join(self._staging, "job_app_ids.bin"), dtype="<i8")
+            os.remove(os.path.join(self._staging, "job_app_ids.bin"))
+            del self._files["job_app_ids"]
+            self.lengths.pop("job_app_ids", None)
+            self.id_strings = [str(job_app_id) for job_app_id in written.tolist()]
+            self.int_ids = False
+        self.id_strings.extend(json.dumps(job_app_id) for job_app_id in job_app_ids)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Write string tables and the manifest, close all files and move the
+        dataset into place
+
+        Returns:
+            Manifest dictionary
+        """
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+        manifest = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "rows": self.rows,
+            "arrays": {name: {"dtype": ARRAY_DTYPES[name], "length": self.lengths[name]} for name in ARRAY_DTYPES},
+            "job_app_ids": (
+                {"kind": "int", "dtype": "<i8", "length": self.rows} if self.int_ids
+                else {"kind": "json", **_write_strings(self._staging, "job_app_ids", self.id_strings)}
+            ),
+            "vocabulary": _write_strings(self._staging, "vocabulary", self.vocabulary.items),
+            "education_levels": _write_strings(self._staging, "education_levels", self.education_levels.items)
+        }
+        with open(os.path.join(self._staging, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Directories cannot be renamed over non-empty ones, so a previous
+        # dataset is moved aside first; readers never see a partial dataset
+        previous = None
+        if os.path.exists(self.path):
+            previous = f"{self._staging}.old"
+            os.replace(self.path, previous)
+        os.replace(self._staging, self.path)
+        if previous is not None:
+            shutil.rmtree(previous)
+        logger.info(f"Wrote columnar dataset with {self.rows} job applications to {self.path}")
+        return manifest
+
+    def __enter__(self) -> "ColumnarDatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            for f in self._files.values():
+                f.close()
+            shutil.rmtree(self._staging, ignore_errors=True)
+
+
+class ColumnarDataset:
+    """Read-only, memory-mapped columnar dataset of job applications"""
+
+    def __init__(self, path: str, manifest: Dict[str, Any]):
+        """
+        Map the arrays of a dataset directory; use ColumnarDataset.open
+
+        Args:
+            path: Dataset directory
+            manifest: Parsed manifest of the dataset
+        """
+        self.path = path
+        self.manifest = manifest
+        self.arrays = {
+            name: _map_array(path, name, spec["dtype"], spec["length"])
+            for name, spec in manifest["arrays"].items()
+        }
+        self.vocabulary = Vocabulary(_read_strings(path, "vocabulary", manifest["vocabulary"]))
+        self.education_levels = _read_strings(path, "education_levels", manifest["education_levels"])
+        self._job_app_ids: Optional[List[Any]] = None
+
+    @classmethod
+    def open(cls, path: str) -> "ColumnarDataset":
+        """
+        Open a dataset written by ColumnarDatasetWriter
+
+        Args:
+            path: Dataset directory
+
+        Returns:
+            ColumnarDataset instance
+        """
+        with open(os.path.join(path, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME:
+            raise ValueError(f"{path} is not a columnar job application dataset")
+        if manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar dataset version {manifest.get('version')} in {path}")
+        return cls(path, manifest)
+
+    @staticmethod
+    def is_dataset(path: str) -> bool:
+        """Check whether a path is a columnar dataset directory"""
+        return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    @property
+    def job_app_ids(self) -> List[Any]:
+        """Job application IDs as Python values, decoded on first access"""
+        if self._job_app_ids is None:
+            spec = self.manifest["job_app_ids"]
+            if spec["kind"] == "int":
+                self._job_app_ids = _map_array(self.path, "job_app_ids", spec["dtype"], spec["length"]).tolist()
+            else:
+                self._job_app_ids = [json.loads(value) for value in _read_strings(self.path, "job_app_ids", spec)]
+        return self._job_app_ids
+
+    def education_ranks(self, plan: ScoringPlan, name: str) -> np.ndarray:
+        """
+        Translate an education code column into ranks of the plan's hierarchy
+
+        Args:
+            plan: Compiled scoring plan
+            name: "required_education" or "candidate_education"
+
+        Returns:
+            Int64 ranks like ApplicationColumns.from_job_apps
+        """
+        # The trailing entry is picked up by code -1, a missing level
+        rank_map = np.array([plan.education_rank.get(level, UNKNOWN_EDUCATION_RANK) if level
+                             else MISSING_EDUCATION_RANK for level in self.education_levels]
+                            + [MISSING_EDUCATION_RANK], dtype=np.int64)
+        return rank_map[self.arrays[name]]
+
+    def to_columns(self, plan: ScoringPlan, with_ids: bool = True) -> ApplicationColumns:
+        """
+        Build scoring columns backed by the memory maps
+
+        Only the education ranks, which depend on the plan's hierarchy, are
+        computed; every other array is used in place.
+
+        Args:
+            plan: Compiled scoring plan
+            with_ids: Decode job application IDs (not needed for raw scores alone)
+
+        Returns:
+            ApplicationColumns instance
+        """
+        arrays = self.arrays
+        return ApplicationColumns(
+            job_app_ids=self.job_app_ids if with_ids else None,
+            req_skill_ptr=arrays["req_skill_ptr"],
+            req_skill_ids=arrays["req_skill_ids"],
+            cand_skill_ptr=arrays["cand_skill_ptr"],
+            cand_skill_ids=arrays["cand_skill_ids"],
+            req_cert_ptr=arrays["req_cert_ptr"],
+            req_cert_ids=arrays["req_cert_ids"],
+            cand_cert_ptr=arrays["cand_cert_ptr"],
+            cand_cert_ids=arrays["cand_cert_ids"],
+            min_experience=arrays["min_experience"],
+            experience=arrays["experience"],
+            required_education_rank=self.education_ranks(plan, "required_education"),
+            candidate_education_rank=self.education_ranks(plan, "candidate_education"),
+            vocabulary=self.vocabulary
+        )
+
+    def iter_job_apps(self, start: int = 0, stop: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Convert rows back to job application dictionaries
+
+        Integral experience values are returned as int and missing education
+        levels are omitted.
+
+        Args:
+            start: First row
+            stop: Row after the last row, defaults to the end
+
+        Returns:
+            Iterator over job application dictionaries
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        items = self.vocabulary.items
+        levels = self.education_levels
+        job_app_ids = self.job_app_ids
+        for batch_start in range(start, stop, WRITE_BATCH_SIZE):
+            batch_stop = min(batch_start + WRITE_BATCH_SIZE, stop)
+            lists = {}
+            for prefix, _, _ in LIST_COLUMNS:
+                ptr = self.arrays[f"{prefix}_ptr"][batch_start:batch_stop + 1].tolist()
+                ids = self.arrays[f"{prefix}_ids"][ptr[0]:ptr[-1]].tolist()
+                lists[prefix] = [[items[i] for i in ids[ptr[row] - ptr[0]:ptr[row + 1] - ptr[0]]]
+                                 for row in range(batch_stop - batch_start)]
+            numbers = {name: self.arrays[name][batch_start:batch_stop].tolist() for name, _, _ in NUMBER_COLUMNS}
+            education = {name: self.arrays[name][batch_start:batch_stop].tolist() for name, _, _ in EDUCATION_COLUMNS}
+
+            for row in range(batch_stop - batch_start):
+                job_app = {"job_app_id": job_app_ids[batch_start + row],
+                           "job_requirements": {}, "talent_profile": {}}
+                job_app["job_requirements"]["core_skills"] = lists["req_skill"][row]
+                job_app["job_requirements"]["min_experience"] = _plain_number(numbers["min_experience"][row])
+                if education["required_education"][row] >= 0:
+                    job_app["job_requirements"]["education"] = levels[education["required_education"][row]]
+                job_app["job_requirements"]["certifications"] = lists["req_cert"][row]
+                job_app["talent_profile"]["skills"] = lists["cand_skill"][row]
+                job_app["talent_profile"]["experience"] = _plain_number(numbers["experience"][row])
+                if education["candidate_education"][row] >= 0:
+                    job_app["talent_profile"]["education"] = levels[education["candidate_education"][row]]
+                job_app["talent_profile"]["certifications"] = lists["cand_cert"][row]
+                yield job_app
+
+
+def write_columnar_dataset(job_apps: Iterable[Dict[str, Any]], path: str,
+                           vocabulary: Vocabulary = None) -> ColumnarDataset:
+    """
+    Write job applications to a columnar dataset and open it
+
+    Args:
+        job_apps: Iterable of job application dictionaries, consumed in batches
+        path: Dataset directory
+        vocabulary: Vocabulary used to decode bitset fields, if any
+
+    Returns:
+        ColumnarDataset instance
+    """
+    with ColumnarDatasetWriter(path, vocabulary) as writer:
+        for batch in iter_batches(job_apps, WRITE_BATCH_SIZE):
+            writer.append(batch)
+    return ColumnarDataset.open(path)
+
+
+def convert_json_to_columnar(json_path: str, dataset_path: str) -> ColumnarDataset:
+    """
+    Convert a JSON array or NDJSON file of job applications to a columnar dataset
+
+    Applications are validated and converted in batches without loading the
+    whole file.
+
+    Args:
+        json_path: Input JSON or NDJSON file
+        dataset_path: Output dataset directory
+
+    Returns:
+        ColumnarDataset instance
+    """
+    with open(json_path, "rb") as f:
+        return write_columnar_dataset(DataManager.iter_job_applications(f), dataset_path)
+
+
+def convert_columnar_to_json(dataset_path: str, json_path: str, ndjson: bool = False):
+    """
+    Convert a columnar dataset back to the JSON schema
+
+    Args:
+        dataset_path: Input dataset directory
+        json_path: Output file
+        ndjson: Write newline-delimited JSON instead of a JSON array
+    """
+    dataset = ColumnarDataset.open(dataset_path)
+    with open(json_path, "w", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[")
+        for position, job_app in enumerate(dataset.iter_job_apps()):
+            if ndjson:
+                f.write(json.dumps(job_app) + "\n")
+            else:
+                f.write(("," if position else "") + "\n" + json.dumps(job_app))
+        if not ndjson:
+            f.write("\n]\n")
+    logger.info(f"Wrote {len(dataset)} job applications to {json_path}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m modules.columnar_dataset",
+                                     description="Convert job application datasets between JSON and columnar form")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_columnar = subparsers.add_parser("to-columnar", help="Convert a JSON array or NDJSON file")
+    to_columnar.add_argument("source", help="Input JSON or NDJSON file")
+    to_columnar.add_argument("dataset", help="Output dataset directory")
+    to_json = subparsers.add_parser("to-json", help="Convert a columnar dataset to JSON")
+    to_json.add_argument("dataset", help="Input dataset directory")
+    to_json.add_argument("target", help="Output JSON file")
+    to_json.add_argument("--ndjson", action="store_true", help="Write newline-delimited JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        if args.command == "to-columnar":
+            convert_json_to_columnar(args.source, args.dataset)
+        else:
+            convert_columnar_to_json(args.dataset, args.target, args.ndjson)
+    except (OSError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
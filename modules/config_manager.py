@@ -1,24 +1,127 @@
 """
 Configuration manager for the job matching system.
+Loads the YAML configuration into immutable, versioned snapshots and reloads
+it when the file changes on disk.
 """
+import os
+import threading
+import time
 import yaml
 import logging
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Sequence, Tuple
+
+from modules.score_cache import config_fingerprint
 
 logger = logging.getLogger(__name__)
 
+def _freeze(value: Any) -> Any:
+    """Recursively convert dictionaries to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable configuration as loaded at one point in time"""
+    version: int
+    digest: str
+    data: Mapping[str, Any]
+
 class ConfigManager:
     """Manages loading and accessing configuration settings"""
     
-    def __init__(self, config_path: str = "config/scoring_config.yaml"):
+    def __init__(self, config_path: str = "config/scoring_config.yaml", reload_interval: float = 2.0):
         """
         Initialize with path to configuration file
         
         Args:
             config_path: Path to the YAML configuration file
+            reload_interval: Minimum number of seconds between checks of the
+                file for changes in reload_if_changed
         """
         self.config_path = config_path
-        self.config = self._load_config()
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._source = self._file_signature()
+        self._snapshot = self._make_snapshot(self._load_config(), version=1)
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current configuration snapshot"""
+        return self._snapshot
+    
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot, incremented whenever the configuration changes"""
+        return self._snapshot.version
+    
+    @property
+    def config(self) -> Mapping[str, Any]:
+        """Read-only configuration values of the current snapshot"""
+        return self._snapshot.data
+    
+    @staticmethod
+    def _make_snapshot(config: Dict[str, Any], version: int) -> ConfigSnapshot:
+        return ConfigSnapshot(version=version, digest=config_fingerprint(config), data=_freeze(config))
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the configuration file, None if it does not exist"""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_config_file(self) -> Dict[str, Any]:
+        """Read and parse the configuration file, raising on any error"""
+        with open(self.config_path, 'r') as file:
+            config = yaml.safe_load(file)
+        if not isinstance(config, dict):
+            raise ValueError(f"{self.config_path} does not contain a mapping")
+        return config
+    
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        Reload the configuration if the file changed on disk
+        
+        The file is checked at most once per reload_interval. A file that
+        cannot be parsed is logged and the current snapshot is kept. Content
+        that is unchanged keeps the current version.
+        
+        Args:
+            force: Check the file now regardless of reload_interval
+            
+        Returns:
+            True if a new snapshot version was loaded
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.reload_interval:
+            return False
+        
+        with self._lock:
+            self._last_check = now
+            source = self._file_signature()
+            if source is None or source == self._source:
+                return False
+            self._source = source
+            
+            try:
+                config = self._read_config_file()
+            except Exception as e:
+                logger.error(f"Error reloading configuration, keeping version {self.version}: {str(e)}")
+                return False
+            
+            snapshot = self._make_snapshot(config, self.version + 1)
+            if snapshot.digest == self._snapshot.digest:
+                return False
+            self._snapshot = snapshot
+            logger.info(f"Configuration reloaded from {self.config_path} as version {snapshot.version}")
+            return True
         
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -28,10 +131,9 @@ class ConfigManager:
             Dictionary containing configuration values
         """
         try:
-            with open(self.config_path, 'r') as file:
-                config = yaml.safe_load(file)
-                logger.info(f"Configuration loaded from {self.config_path}")
-                return config
+            config = self._read_config_file()
+            logger.info(f"Configuration loaded from {self.config_path}")
+            return config
         except FileNotFoundError:
             logger.warning(f"Config file {self.config_path} not found. Using default configuration.")
             return self._default_config()
@@ -64,21 +166,82 @@ class ConfigManager:
             "thresholds": {
                 "minimum_match_score": 40
             },
+            "ranking": {
+                "display_top_k": 500
+            },
+            "charts": {
+                "large_data_rows": 2000,
+                "histogram_bins": 20,
+                "top_n": 25
+            },
+            "batch": {
+                "engine": "python",
+                "parallel": False,
+                "workers": 0,
+                "chunk_size": 50000,
+                "parallel_min_rows": 100000,
+                "cross_match_block_cells": 4000000
+            },
+            "cache": {
+                "enabled": False,
+                "max_entries": 100000,
+                "max_bytes": 0,
+                "disk_path": ""
+            },
+            "results_store": {
+                "enabled": True,
+                "path": "data/results.db",
+                "keep_runs": 20,
+                "insert_batch_rows": 10000,
+                "page_size": 50
+            },
+            "server": {
+                "host": "127.0.0.1",
+                "port": 8080,
+                "max_batch_size": 256,
+                "max_batch_delay_ms": 5,
+                "max_pending": 10000,
+                "max_body_bytes": 10485760
+            },
             "debug_mode": False
         }
     
-    def get_weights(self) -> Dict[str, float]:
-        """Get scoring weights"""
+    def get_weights(self) -> Mapping[str, float]:
+        """Get scoring weights (read-only; copy with dict() to modify)"""
         return self.config.get("weights", {})
     
-    def get_education_hierarchy(self) -> List[str]:
-        """Get education level hierarchy (highest to lowest)"""
-        return self.config.get("education_hierarchy", [])
+    def get_education_hierarchy(self) -> Sequence[str]:
+        """Get education level hierarchy (highest to lowest) as a tuple; copy with list() to modify"""
+        return self.config.get("education_hierarchy", ())
     
-    def get_thresholds(self) -> Dict[str, float]:
-        """Get threshold settings"""
+    def get_thresholds(self) -> Mapping[str, float]:
+        """Get threshold settings (read-only)"""
         return self.config.get("thresholds", {})
     
+    def get_ranking_settings(self) -> Mapping[str, Any]:
+        """Get ranking settings (read-only)"""
+        return self.config.get("ranking", {})
+    
+    def get_chart_settings(self) -> Mapping[str, Any]:
+        """Get chart settings (read-only)"""
+        return self.config.get("charts", {})
+    
+    def get_batch_settings(self) -> Mapping[str, Any]:
+        """Get batch scoring settings (read-only)"""
+        return self.config.get("batch", {})
+    
+    def get_cache_settings(self) -> Mapping[str, Any]:
+        """Get score cache settings (read-only)"""
+        return self.config.get("cache", {})
+    
+    def get_results_store_settings(self) -> Mapping[str, Any]:
+        """Get persistent results store settings (read-only)"""
+        return self.config.get("results_store", {})
+    
+    def get_server_settings(self) -> Mapping[str, Any]:
+        """Get HTTP scoring service settings (read-only)"""
+        return self.config.get("server", {})
+    
     def is_debug_mode(self) -> bool:
         """Check if debug mode is enabled"""
         return self.config.get("debug_mode", False)
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+Cross-matching for the job matching system.
+Scores every talent against every job using sparse incidence products for
+skill and certification overlap and broadcasting for the other components.
+"""
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from modules.batch_engine import round_scores
+from modules.scoring_plan import COMPONENTS, ScoringPlan
+from modules.vocabulary import Vocabulary
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # Optional dependency, a NumPy implementation is used instead
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+
+class Incidence:
+    """Item incidence of a collection of rows stored as CSR arrays"""
+
+    def __init__(self, ptr: np.ndarray, ids: np.ndarray, n_items: int):
+        """
+        Initialize from CSR arrays
+
+        Args:
+            ptr: Row pointers of length n_rows + 1
+            ids: Item ids, the ids of row i are ids[ptr[i]:ptr[i + 1]]
+            n_items: Vocabulary size
+        """
+        self.ptr = ptr
+        self.ids = ids
+        self.n_items = n_items
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.ptr) - 1
+
+    @property
+    def row_counts(self) -> np.ndarray:
+        """Number of entries per row"""
+        return np.diff(self.ptr)
+
+    @classmethod
+    def from_lists(cls, lists: List[Any], vocabulary: Vocabulary, unique: bool = False) -> "Incidence":
+        """
+        Build an incidence from item lists or bitsets
+
+        Args:
+            lists: One item list or bitset per row
+            vocabulary: Shared vocabulary
+            unique: Drop duplicate items within a row (binary incidence)
+
+        Returns:
+            Incidence instance
+        """
+        rows = [vocabulary.to_ids(items) for items in lists]
+        if unique:
+            rows = [sorted(set(ids)) for ids in rows]
+        ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in rows], out=ptr[1:])
+        ids = np.fromiter((item_id for row in rows for item_id in row), dtype=np.int64, count=int(ptr[-1]))
+        return cls(ptr, ids, len(vocabulary))
+
+    def slice_rows(self, start: int, stop: int) -> "Incidence":
+        """Return the incidence of rows [start, stop)"""
+        return Incidence(self.ptr[start:stop + 1] - self.ptr[start],
+                         self.ids[self.ptr[start]:self.ptr[stop]], self.n_items)
+
+    def to_sparse(self):
+        """Convert to a scipy.sparse CSR matrix, summing duplicate entries"""
+        data = np.ones(len(self.ids), dtype=np.float64)
+        matrix = sparse.csr_matrix((data, self.ids, self.ptr), shape=(self.n_rows, self.n_items))
+        matrix.sum_duplicates()
+        return matrix
+
+    def transpose(self) -> "Incidence":
+        """Return the item-to-rows incidence"""
+        rows = np.repeat(np.arange(self.n_rows, dtype=np.int64), self.row_counts)
+        order = np.argsort(self.ids, kind="stable")
+        ptr = np.zeros(self.n_items + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.ids, minlength=self.n_items), out=ptr[1:])
+        return Incidence(ptr, rows[order], self.n_rows)
+
+
+def overlap_counts(required: Incidence, provided: Incidence) -> np.ndarray:
+    """
+    Count, for every (required row, provided row) pair, how many required
+    items the provided row contains
+
+    This is the product required (rows x items, with multiplicity) times
+    provided transposed (items x rows, binary).
+
+    Args:
+        required: Required items per job, duplicates allowed
+        provided: Provided items per talent, unique per row
+
+    Returns:
+        Float array of shape (required.n_rows, provided.n_rows)
+    """
+    if sparse is not None:
+        product = required.to_sparse() @ provided.to_sparse().T
+        return np.asarray(product.toarray(), dtype=np.float64)
+
+    # Sparse product via the inverted (item -> provided rows) incidence
+    inverted = provided.transpose()
+    overlap = np.zeros((required.n_rows, provided.n_rows), dtype=np.float64)
+    for row in range(required.n_rows):
+        item_ids = required.ids[required.ptr[row]:required.ptr[row + 1]]
+        if len(item_ids) == 0:
+            continue
+        starts = inverted.ptr[item_ids]
+        lengths = inverted.ptr[item_ids + 1] - starts
+        # Gather the provided rows of every required item in one pass
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        gathered = inverted.ids[offsets + np.arange(lengths.sum())]
+        overlap[row] = np.bincount(gathered, minlength=provided.n_rows)
+    return overlap
+
+
+class CrossMatchResult:
+    """Scores of every talent against every job"""
+
+    def __init__(self, job_ids: List[Any], talent_ids: List[Any], scores: np.ndarray,
+                 talent_indices: Optional[np.ndarray] = None):
+        """
+        Initialize with job and talent ids and a score matrix
+
+        Args:
+            job_ids: Job ids in row order
+            talent_ids: Talent ids in column order
+            scores: Total scores; (jobs x talents) when dense, (jobs x K) for top-K
+            talent_indices: For top-K results, talent column index of each score
+        """
+        self.job_ids = job_ids
+        self.talent_ids = talent_ids
+        self.scores = scores
+        self.talent_indices = talent_indices
+
+    @property
+    def is_top_k(self) -> bool:
+        return self.talent_indices is not None
+
+    def matches_for_job(self, job_index: int) -> List[Tuple[Any, float]]:
+        """
+        Return (talent_id, total_score) pairs for a job, best first
+
+        Args:
+            job_index: Row index of the job
+
+        Returns:
+            List of (talent_id, total_score) tuples
+        """
+        if self.is_top_k:
+            indices = self.talent_indices[job_index]
+            scores = self.scores[job_index]
+            keep = indices >= 0
+            return [(self.talent_ids[i], s) for i, s in zip(indices[keep].tolist(), scores[keep].tolist())]
+        order = np.lexsort((np.arange(len(self.talent_ids)), -self.scores[job_index]))
+        return [(self.talent_ids[i], self.scores[job_index, i]) for i in order.tolist()]
+
+
+class CrossMatcher:
+    """Scores a pool of jobs against a pool of talents"""
+
+    def __init__(self, plan: ScoringPlan):
+        """
+        Initialize with a compiled scoring plan
+
+        Args:
+            plan: ScoringPlan holding education scores and resolved weights
+        """
+        self.plan = plan
+        size = len(plan.education_hierarchy)
+        self.education_scores = np.array(plan.education_scores, dtype=np.float64).reshape(size, size)
+
+    def _load(self, jobs: List[Dict[str, Any]], talents: List[Dict[str, Any]],
+              vocabulary: Vocabulary) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build job and talent columns with a shared vocabulary"""
+        rank = self.plan.education_rank
+        job_columns = {
+            "skills": Incidence.from_lists([job.get("core_skills", []) for job in jobs], vocabulary),
+            "certifications": Incidence.from_lists([job.get("certifications", []) for job in jobs], vocabulary),
+            "experience": np.array([job.get("min_experience", 0) for job in jobs], dtype=np.float64),
+            "education": np.array([rank.get(job.get("education", ""), -1) for job in jobs], dtype=np.int64)
+        }
+        talent_columns = {
+            "skills": Incidence.from_lists([talent.get("skills", []) for talent in talents], vocabulary, unique=True),
+            "certifications": Incidence.from_lists([talent.get("certifications", []) for talent in talents],
+                                                   vocabulary, unique=True),
+            "experience": np.array([talent.get("experience", 0) for talent in talents], dtype=np.float64),
+            "education": np.array([rank.get(talent.get("education", ""), -1) for talent in talents], dtype=np.int64)
+        }
+        # Both sides must agree on the final vocabulary size
+        for columns in (job_columns, talent_columns):
+            for name in ("skills", "certifications"):
+                columns[name].n_items = len(vocabulary)
+        return job_columns, talent_columns
+
+    def _score_block(self, job_columns: Dict[str, Any], talent_columns: Dict[str, Any],
+                     start: int, stop: int) -> np.ndarray:
+        """Compute rounded total scores of all jobs against talents [start, stop)"""
+        n_jobs = len(job_columns["experience"])
+        n_talents = stop - start
+        weights = self.plan.weight_vector
+        raw = np.zeros((len(COMPONENTS), n_jobs, n_talents), dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Core skills and certifications: sparse overlap counts
+            for component, name, empty_score in ((0, "skills", 0.0), (3, "certifications", 100.0)):
+                required = job_columns[name]
+                overlap = overlap_counts(required, talent_columns[name].slice_rows(start, stop))
+                counts = required.row_counts.astype(np.float64)[:, None]
+                raw[component] = np.where(counts > 0, (overlap / counts) * 100, empty_score)
+
+            # Experience: broadcast minimums against candidate experience
+            min_experience = job_columns["experience"][:, None]
+            ratio = (talent_columns["experience"][None, start:stop] / min_experience) * 100
+            raw[1] = np.where(min_experience == 0, 100.0, np.minimum(ratio, 100))
+
+            # Education: gather from the plan's score matrix
+            required_rank = job_columns["education"][:, None]
+            candidate_rank = talent_columns["education"][None, start:stop]
+            known = (required_rank >= 0) & (candidate_rank >= 0)
+            gathered = self.education_scores[np.maximum(required_rank, 0), np.maximum(candidate_rank, 0)]
+            raw[2] = np.where(known, gathered, 0.0)
+
+        # Same summation order as the per-application path
+        weighted = raw * np.asarray(weights)[:, None, None]
+        return round_scores(weighted[0] + weighted[2] + weighted[1] + weighted[3])
+
+    def match(self, jobs: List[Dict[str, Any]], talents: List[Dict[str, Any]], top_k: int = None,
+              block_cells: int = 4000000, vocabulary: Vocabulary = None) -> CrossMatchResult:
+        """
+        Score every talent against every job
+
+        Args:
+            jobs: Job requirement dictionaries, optionally with a "job_id"
+            talents: Talent profile dictionaries, optionally with a "talent_id"
+            top_k: Keep only the K best talents per job instead of the dense matrix
+            block_cells: Maximum job x talent pairs scored per block, bounding
+                intermediate memory
+            vocabulary: Vocabulary used to encode bitset fields, if any
+
+        Returns:
+            CrossMatchResult instance
+        """
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        job_columns, talent_columns = self._load(jobs, talents, vocabulary)
+        job_ids = [job.get("job_id", index) for index, job in enumerate(jobs)]
+        talent_ids = [talent.get("talent_id", index) for index, talent in enumerate(talents)]
+        n_jobs, n_talents = len(jobs), len(talents)
+        block_size = max(int(block_cells) // max(n_jobs, 1), 1)
+
+        if not top_k:
+            scores = np.empty((n_jobs, n_talents), dtype=np.float64)
+            for start in range(0, n_talents, block_size):
+                stop = min(start + block_size, n_talents)
+                scores[:, start:stop] = self._score_block(job_columns, talent_columns, start, stop)
+            return CrossMatchResult(job_ids, talent_ids, scores)
+
+        # Running top-K per job; -1 marks empty slots
+        best_scores = np.full((n_jobs, 0), -np.inf)
+        best_indices = np.full((n_jobs, 0), -1, dtype=np.int64)
+        for start in range(0, n_talents, block_size):
+            stop = min(start + block_size, n_talents)
+            block = self._score_block(job_columns, talent_columns, start, stop)
+            scores = np.concatenate([best_scores, block], axis=1)
+            indices = np.concatenate([best_indices, np.broadcast_to(np.arange(start, stop), block.shape)], axis=1)
+            # Highest score first, ties by talent order
+            order = np.lexsort((indices, -scores), axis=-1)[:, :top_k]
+            best_scores = np.take_along_axis(scores, order, axis=1)
+            best_indices = np.take_along_axis(indices, order, axis=1)
+
+        logger.info(f"Cross-matched {n_jobs} jobs against {n_talents} talents (top {top_k})")
+        return CrossMatchResult(job_ids, talent_ids, best_scores, best_indices)
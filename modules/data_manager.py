@@ -4,9 +4,9 @@ Handles loading, validating, and processing job application data.
 """
 import json
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, BinaryIO, Iterator, Tuple
 
-import streamlit as st
+from modules.ingestion import iter_json_records
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +14,6 @@ class DataManager:
     """Manages job application data"""
     
     @staticmethod
-    @st.cache_data
     def load_sample_jobs() -> List[Dict[str, Any]]:
         """
         Load sample job data from file
@@ -53,28 +52,48 @@ class DataManager:
             return False, "Data list is empty"
         
         for job in data:
-            # Check for required fields
-            if "job_app_id" not in job:
-                return False, f"Missing job_app_id in job application"
-            if "job_requirements" not in job:
-                return False, f"Missing job_requirements in job application {job.get('job_app_id', 'unknown')}"
-            if "talent_profile" not in job:
-                return False, f"Missing talent_profile in job application {job.get('job_app_id', 'unknown')}"
-                
-            # Check job requirements structure
-            req = job.get("job_requirements", {})
-            if not isinstance(req.get("core_skills", []), list):
-                return False, f"core_skills must be a list in job application {job.get('job_app_id')}"
-            
-            # Check talent profile structure
-            profile = job.get("talent_profile", {})
-            if not isinstance(profile.get("skills", []), list):
-                return False, f"skills must be a list in job application {job.get('job_app_id')}"
-            if not isinstance(profile.get("certifications", []), list):
-                return False, f"certifications must be a list in job application {job.get('job_app_id')}"
+            is_valid, message = DataManager.validate_job_application(job)
+            if not is_valid:
+                return False, message
         
         return True, "Data is valid"
     
+    @staticmethod
+    def validate_job_application(job: Any) -> Tuple[bool, str]:
+        """
+        Validate the structure of a single job application
+        
+        Args:
+            job: Job application to validate
+            
+        Returns:
+            Tuple of (is_valid, message)
+        """
+        if not isinstance(job, dict):
+            return False, "Each job application must be a JSON object"
+        
+        # Check for required fields
+        if "job_app_id" not in job:
+            return False, f"Missing job_app_id in job application"
+        if "job_requirements" not in job:
+            return False, f"Missing job_requirements in job application {job.get('job_app_id', 'unknown')}"
+        if "talent_profile" not in job:
+            return False, f"Missing talent_profile in job application {job.get('job_app_id', 'unknown')}"
+            
+        # Check job requirements structure
+        req = job.get("job_requirements", {})
+        if not isinstance(req.get("core_skills", []), list):
+            return False, f"core_skills must be a list in job application {job.get('job_app_id')}"
+        
+        # Check talent profile structure
+        profile = job.get("talent_profile", {})
+        if not isinstance(profile.get("skills", []), list):
+            return False, f"skills must be a list in job application {job.get('job_app_id')}"
+        if not isinstance(profile.get("certifications", []), list):
+            return False, f"certifications must be a list in job application {job.get('job_app_id')}"
+        
+        return True, "Job application is valid"
+    
     @staticmethod
     def parse_uploaded_json(content: str) -> Tuple[bool, Any, str]:
         """
@@ -98,6 +117,53 @@ class DataManager:
         except Exception as e:
             return False, None, f"Error processing JSON: {str(e)}"
     
+    @staticmethod
+    def iter_job_applications(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+        """
+        Stream validated job applications from a JSON array or NDJSON upload
+        
+        Applications are parsed from the bytes incrementally and validated one
+        at a time, so consumers can start scoring before the stream is fully read.
+        
+        Args:
+            stream: Binary file-like object (e.g. a Streamlit UploadedFile)
+            
+        Returns:
+            Iterator over job application dictionaries
+            
+        Raises:
+            ValueError: If the content is not valid JSON or an application is invalid
+        """
+        count = 0
+        for job in iter_json_records(stream):
+            is_valid, message = DataManager.validate_job_application(job)
+            if not is_valid:
+                raise ValueError(message)
+            count += 1
+            yield job
+        if count == 0:
+            raise ValueError("Data list is empty")
+    
+    @staticmethod
+    def parse_uploaded_stream(stream: BinaryIO) -> Tuple[bool, Any, str]:
+        """
+        Parse and validate an uploaded JSON array or NDJSON file without
+        decoding or buffering it as a whole
+        
+        Args:
+            stream: Binary file-like object
+            
+        Returns:
+            Tuple of (success, data, message)
+        """
+        try:
+            data = list(DataManager.iter_job_applications(stream))
+            return True, data, f"Successfully loaded {len(data)} job applications"
+        except ValueError as e:
+            return False, None, str(e)
+        except Exception as e:
+            return False, None, f"Error processing JSON: {str(e)}"
+    
     @staticmethod
     def create_custom_job_app(
         core_skills: str,
@@ -0,0 +1,195 @@
+"""
+Delta ingestion for the job matching system.
+Compares a dataset with the previous version from the same source by
+per-application content hashes, so only applications that were added or
+changed are scored.
+"""
+import logging
+import time
+from typing import Dict, List, Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from modules.batch_engine import RawScores
+from modules.scoring_plan import COMPONENTS
+
+logger = logging.getLogger(__name__)
+
+# IDs listed per change type in DeltaReport.to_dict
+REPORT_SAMPLE_IDS = 100
+
+
+class DatasetVersion:
+    """Content hashes and raw scores of one previously scored dataset"""
+
+    def __init__(self, job_app_ids: List[Any], content_hashes: List[bytes], raw_scores: RawScores,
+                 run_id: Optional[int] = None):
+        """
+        Initialize a dataset version
+
+        Args:
+            job_app_ids: Job application IDs in row order
+            content_hashes: Digests from application_hash in row order
+            raw_scores: Raw component scores in row order
+            run_id: Results store run the version was loaded from, if any
+        """
+        self.job_app_ids = job_app_ids
+        self.content_hashes = content_hashes
+        self.raw_scores = raw_scores
+        self.run_id = run_id
+
+    def __len__(self) -> int:
+        return len(self.content_hashes)
+
+
+class DeltaReport:
+    """Changes of a dataset relative to its previous version"""
+
+    def __init__(self, added: List[Any], removed: List[Any], changed: List[Any], unchanged: int,
+                 rescored: int, total: int, previous_run_id: Optional[int] = None, seconds: float = 0.0):
+        """
+        Initialize a report
+
+        IDs are compared by the first application with each ID, like
+        JobAppIndex; rescored counts rows, including duplicates and rows
+        whose content moved to another ID.
+
+        Args:
+            added: IDs not in the previous version
+            removed: IDs not in the new version
+            changed: IDs in both versions whose application content differs
+            unchanged: Number of IDs in both versions with equal content
+            rescored: Number of rows scored, all others reuse previous scores
+            total: Number of rows in the new version
+            previous_run_id: Results store run of the previous version, if any
+            seconds: Time taken to diff and score the delta
+        """
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+        self.rescored = rescored
+        self.total = total
+        self.previous_run_id = previous_run_id
+        self.seconds = seconds
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the report
+
+        Returns:
+            Dictionary of counts, with at most REPORT_SAMPLE_IDS IDs per change type
+        """
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "unchanged": self.unchanged,
+            "rescored": self.rescored,
+            "total": self.total,
+            "previous_run_id": self.previous_run_id,
+            "seconds": self.seconds,
+            "added_ids": self.added[:REPORT_SAMPLE_IDS],
+            "removed_ids": self.removed[:REPORT_SAMPLE_IDS],
+            "changed_ids": self.changed[:REPORT_SAMPLE_IDS]
+        }
+
+
+def diff_versions(previous_ids: Sequence[Any], previous_hashes: Sequence[bytes],
+                  job_app_ids: Sequence[Any], content_hashes: Sequence[bytes]) -> Dict[str, Any]:
+    """
+    Compare two dataset versions by job_app_id
+
+    Args:
+        previous_ids: Job application IDs of the previous version
+        previous_hashes: Content hashes of the previous version
+        job_app_ids: Job application IDs of the new version
+        content_hashes: Content hashes of the new version
+
+    Returns:
+        Dictionary with added, removed and changed ID lists in dataset order
+        and the number of unchanged IDs
+    """
+    previous: Dict[Any, bytes] = {}
+    for job_app_id, content_hash in zip(previous_ids, previous_hashes):
+        previous.setdefault(job_app_id, content_hash)
+    current: Dict[Any, bytes] = {}
+    for job_app_id, content_hash in zip(job_app_ids, content_hashes):
+        current.setdefault(job_app_id, content_hash)
+
+    added = [job_app_id for job_app_id in current if job_app_id not in previous]
+    removed = [job_app_id for job_app_id in previous if job_app_id not in current]
+    changed = [job_app_id for job_app_id, content_hash in current.items()
+               if job_app_id in previous and previous[job_app_id] != content_hash]
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged": len(current) - len(added) - len(changed)
+    }
+
+
+def apply_delta(previous: DatasetVersion, job_apps: List[Dict[str, Any]], content_hashes: List[bytes],
+                compute_raw_scores: Callable[[List[Dict[str, Any]]], RawScores],
+                education_hierarchy: Sequence[str]) -> "tuple[RawScores, DeltaReport]":
+    """
+    Compute raw scores of a new dataset version, scoring only the delta
+
+    Rows are matched by content hash, which covers the job_app_id, so a row
+    reuses previous raw scores exactly when an identical application was
+    scored before, wherever it moved. Raw scores of an application do not
+    depend on the rest of the dataset, so the merged matrix equals a full
+    rescore.
+
+    Args:
+        previous: Previous version of the dataset
+        job_apps: Job application dictionaries of the new version
+        content_hashes: Content hashes of job_apps from application_hashes
+        compute_raw_scores: Scores a list of applications, e.g. ScoringService.compute_raw_scores
+        education_hierarchy: Education hierarchy of the current configuration
+
+    Returns:
+        Tuple of (RawScores of job_apps, DeltaReport)
+    """
+    if tuple(previous.raw_scores.education_hierarchy) != tuple(education_hierarchy):
+        raise ValueError("Previous raw scores were computed with a different education hierarchy")
+    start = time.perf_counter()
+
+    previous_rows: Dict[bytes, int] = {}
+    for position, content_hash in enumerate(previous.content_hashes):
+        previous_rows.setdefault(content_hash, position)
+    sources = np.fromiter((previous_rows.get(content_hash, -1) for content_hash in content_hashes),
+                          dtype=np.int64, count=len(content_hashes))
+    reused = np.flatnonzero(sources >= 0)
+    rescored = np.flatnonzero(sources < 0)
+
+    raw = np.empty((len(job_apps), len(COMPONENTS)), dtype=np.float64)
+    raw[reused] = previous.raw_scores.raw[sources[reused]]
+    # Score types are kept only when known for every row
+    int_scores = None
+    if previous.raw_scores.int_scores is not None:
+        int_scores = np.empty(raw.shape, dtype=np.uint8)
+        int_scores[reused] = previous.raw_scores.int_scores[sources[reused]]
+    if len(rescored):
+        delta_scores = compute_raw_scores([job_apps[i] for i in rescored.tolist()])
+        raw[rescored] = delta_scores.raw
+        if int_scores is not None and delta_scores.int_scores is not None:
+            int_scores[rescored] = delta_scores.int_scores
+        else:
+            int_scores = None
+    job_app_ids = [job_app.get("job_app_id") for job_app in job_apps]
+
+    changes = diff_versions(previous.job_app_ids, previous.content_hashes, job_app_ids, content_hashes)
+    report = DeltaReport(
+        changes["added"], changes["removed"], changes["changed"], changes["unchanged"],
+        rescored=len(rescored), total=len(job_apps), previous_run_id=previous.run_id,
+        seconds=time.perf_counter() - start
+    )
+    logger.info(
+        f"Delta ingestion: {len(report.added)} added, {len(report.removed)} removed, "
+        f"{len(report.changed)} changed, rescored {report.rescored} of {report.total} in {report.seconds:.3f}s"
+    )
+    return RawScores(job_app_ids, raw, education_hierarchy, int_scores), report
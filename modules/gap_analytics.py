@@ -0,0 +1,206 @@
+"""
+Gap analytics for the job matching system.
+Aggregates missing skills and certifications over a whole dataset from the
+CSR item incidence of ApplicationColumns, in one vectorized pass.
+"""
+import logging
+from typing import Dict, List, Any
+
+import numpy as np
+
+from modules.batch_engine import ApplicationColumns, BatchScoringEngine, match_required_items, round_scores
+from modules.cross_matching import Incidence
+from modules.scoring_plan import COMPONENTS, ScoringPlan
+
+logger = logging.getLogger(__name__)
+
+_CERTIFICATIONS = COMPONENTS.index("certifications")
+
+
+class GapReport:
+    """Missing item counts and requirement coverage of one scored dataset"""
+
+    def __init__(self, item_names: List[str], job_app_ids: List[Any], minimum_score: float,
+                 skills_required: np.ndarray, skills_missing: np.ndarray,
+                 certifications_required: np.ndarray, certifications_missing: np.ndarray,
+                 certification_lift: np.ndarray, missing_skills: np.ndarray,
+                 missing_certifications: np.ndarray, required_skills: np.ndarray,
+                 required_certifications: np.ndarray, below_minimum: int):
+        """
+        Initialize from computed aggregates
+
+        Per-item arrays are indexed by vocabulary id, per-application arrays
+        are in dataset order.
+
+        Args:
+            item_names: Vocabulary items by id
+            job_app_ids: Job application IDs in row order
+            minimum_score: Total score an application must reach to pass
+            skills_required: Number of applications requiring each skill
+            skills_missing: Number of those whose candidate lacks the skill
+            certifications_required: Number of applications requiring each certification
+            certifications_missing: Number of those whose candidate lacks the certification
+            certification_lift: Number of applications below minimum_score that
+                would reach it if the candidate held the certification
+            missing_skills: Required skills each candidate lacks
+            missing_certifications: Required certifications each candidate lacks
+            required_skills: Required skills per application
+            required_certifications: Required certifications per application
+            below_minimum: Number of applications below minimum_score
+        """
+        self.item_names = item_names
+        self.job_app_ids = job_app_ids
+        self.minimum_score = minimum_score
+        self.skills_required = skills_required
+        self.skills_missing = skills_missing
+        self.certifications_required = certifications_required
+        self.certifications_missing = certifications_missing
+        self.certification_lift = certification_lift
+        self.missing_skills = missing_skills
+        self.missing_certifications = missing_certifications
+        self.required_skills = required_skills
+        self.required_certifications = required_certifications
+        self.below_minimum = below_minimum
+
+    def __len__(self) -> int:
+        return len(self.job_app_ids)
+
+    @staticmethod
+    def _top_items(counts: np.ndarray, n: int) -> np.ndarray:
+        """Ids of the n largest non-zero counts, largest first, ties by id"""
+        candidates = np.flatnonzero(counts)
+        order = np.argsort(-counts[candidates], kind="stable")
+        return candidates[order[:n]]
+
+    def top_missing_skills(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Required skills that candidates lack most often
+
+        Args:
+            n: Number of skills
+
+        Returns:
+            Dictionaries with skill, required, missing and missing_rate (%)
+        """
+        return [{
+            "skill": self.item_names[item_id],
+            "required": int(self.skills_required[item_id]),
+            "missing": int(self.skills_missing[item_id]),
+            "missing_rate": float(self.skills_missing[item_id] / self.skills_required[item_id] * 100)
+        } for item_id in self._top_items(self.skills_missing, n).tolist()]
+
+    def top_lift_certifications(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Certifications that would lift the most applications to the minimum score
+
+        Args:
+            n: Number of certifications
+
+        Returns:
+            Dictionaries with certification, lifted, missing and required counts
+        """
+        return [{
+            "certification": self.item_names[item_id],
+            "lifted": int(self.certification_lift[item_id]),
+            "missing": int(self.certifications_missing[item_id]),
+            "required": int(self.certifications_required[item_id])
+        } for item_id in self._top_items(self.certification_lift, n).tolist()]
+
+    def coverage(self) -> Dict[str, np.ndarray]:
+        """
+        Requirement coverage per application
+
+        Returns:
+            Dictionary of arrays in dataset order: skill_coverage and
+            certification_coverage (% of requirements held, 100 when none are
+            required), missing_skills and missing_certifications
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            skill_coverage = np.where(
+                self.required_skills > 0,
+                (1 - self.missing_skills / self.required_skills) * 100, 100.0
+            )
+            certification_coverage = np.where(
+                self.required_certifications > 0,
+                (1 - self.missing_certifications / self.required_certifications) * 100, 100.0
+            )
+        return {
+            "skill_coverage": skill_coverage,
+            "certification_coverage": certification_coverage,
+            "missing_skills": self.missing_skills,
+            "missing_certifications": self.missing_certifications
+        }
+
+
+def compute_gap_report(columns: ApplicationColumns, raw: np.ndarray, plan: ScoringPlan,
+                       minimum_score: float) -> GapReport:
+    """
+    Compute gap aggregates for a whole dataset
+
+    Required items are matched against candidate items once; counts per item
+    and per application are bincounts over the matches. Certification lift
+    re-evaluates the total score of each (application, missing certification)
+    pair with the same arithmetic as BatchScoringEngine, so an application
+    counts as lifted exactly when rescoring it would reach minimum_score.
+
+    Args:
+        columns: ApplicationColumns of the dataset
+        raw: Raw score matrix of the dataset in COMPONENTS order
+        plan: Scoring plan the raw scores were computed with
+        minimum_score: Total score an application must reach to pass
+
+    Returns:
+        GapReport instance
+    """
+    vocab_size = len(columns.vocabulary) if columns.vocabulary is not None else 0
+    skills = Incidence(columns.req_skill_ptr, columns.req_skill_ids, vocab_size)
+    certifications = Incidence(columns.req_cert_ptr, columns.req_cert_ids, vocab_size)
+    n_items = max(vocab_size, int(skills.ids.max(initial=-1)) + 1, int(certifications.ids.max(initial=-1)) + 1)
+    n_rows = len(columns)
+
+    skill_rows, skill_hits = match_required_items(
+        skills.ptr, skills.ids, columns.cand_skill_ptr, columns.cand_skill_ids, vocab_size
+    )
+    cert_rows, cert_hits = match_required_items(
+        certifications.ptr, certifications.ids, columns.cand_cert_ptr, columns.cand_cert_ids, vocab_size
+    )
+    skill_misses = ~skill_hits
+    cert_misses = ~cert_hits
+
+    engine = BatchScoringEngine(plan)
+    weighted, totals = engine.compute_weighted_scores(raw)
+    below = totals < minimum_score
+
+    # Each (application, certification) pair below the minimum gains all
+    # occurrences of the certification in its requirements at once
+    stride = max(n_items, 1)
+    candidates = cert_misses & below[cert_rows]
+    keys, occurrences = np.unique(cert_rows[candidates] * stride + certifications.ids[candidates], return_counts=True)
+    pair_rows = keys // stride
+    pair_items = keys % stride
+    matches = np.bincount(cert_rows, weights=cert_hits, minlength=n_rows)
+    required = certifications.row_counts.astype(np.float64)
+    new_raw = ((matches[pair_rows] + occurrences) / required[pair_rows]) * 100
+    pair_weighted = weighted[pair_rows]
+    pair_weighted[:, _CERTIFICATIONS] = new_raw * engine.weight_vector[_CERTIFICATIONS]
+    # Same summation order as BatchScoringEngine.compute_weighted_scores
+    new_totals = round_scores(pair_weighted[:, 0] + pair_weighted[:, 2] + pair_weighted[:, 1] + pair_weighted[:, 3])
+    lifted = new_totals >= minimum_score
+
+    report = GapReport(
+        item_names=columns.vocabulary.items if columns.vocabulary is not None else [],
+        job_app_ids=columns.job_app_ids,
+        minimum_score=minimum_score,
+        skills_required=np.bincount(skills.ids, minlength=n_items),
+        skills_missing=np.bincount(skills.ids[skill_misses], minlength=n_items),
+        certifications_required=np.bincount(certifications.ids, minlength=n_items),
+        certifications_missing=np.bincount(certifications.ids[cert_misses], minlength=n_items),
+        certification_lift=np.bincount(pair_items[lifted], minlength=n_items),
+        missing_skills=np.bincount(skill_rows[skill_misses], minlength=n_rows),
+        missing_certifications=np.bincount(cert_rows[cert_misses], minlength=n_rows),
+        required_skills=skills.row_counts,
+        required_certifications=certifications.row_counts,
+        below_minimum=int(below.sum())
+    )
+    logger.info(f"Computed gap report for {n_rows} applications, {report.below_minimum} below {minimum_score}")
+    return report
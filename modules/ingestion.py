@@ -0,0 +1,202 @@
+"""
+Streaming ingestion for the job matching system.
+Reads job applications incrementally from binary streams holding either a
+top-level JSON array or newline-delimited JSON, so large uploads are never
+held in memory as one document.
+"""
+import codecs
+import json
+import logging
+from itertools import chain
+from typing import Dict, List, Any, BinaryIO, Iterable, Iterator
+
+try:
+    import ijson
+except ImportError:  # Optional dependency, a chunked stdlib parser is used instead
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the stream at a time
+READ_CHUNK_SIZE = 1 << 20
+
+# Largest single record the stdlib parser buffers before giving up
+MAX_RECORD_SIZE = 64 << 20
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def _read_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Yield non-empty chunks of a binary stream"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class _ChunkReader:
+    """File-like reader over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._pending:
+            self._pending = next(self._chunks, b"")
+        if size is None or size < 0 or size >= len(self._pending):
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def _iter_json_array(chunks: Iterator[bytes]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array given as byte chunks"""
+    if ijson is not None:
+        # Parses the bytes directly without decoding them to text
+        yield from ijson.items(_ChunkReader(chunks), "item", use_float=True)
+        return
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    position = 0
+    at_eof = False
+
+    def fill() -> bool:
+        """Append the next chunk, dropping consumed text; False at end of stream"""
+        nonlocal buffer, position, at_eof
+        if at_eof:
+            return False
+        chunk = next(chunks, b"")
+        at_eof = not chunk
+        buffer = buffer[position:] + text_decoder.decode(chunk, final=at_eof)
+        position = 0
+        return True
+
+    def next_token() -> str:
+        """Skip whitespace and return the next character, "" at end of stream"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
+
+    if next_token() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, position)
+    position += 1
+    if next_token() == "]":
+        position += 1
+    else:
+        while True:
+            next_token()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    # A value cut by the chunk boundary (e.g. "2." of "2.5") is only
+                    # complete once a delimiter follows it
+                    if at_eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                        break
+                except json.JSONDecodeError:
+                    if at_eof:
+                        raise
+                if len(buffer) - position > MAX_RECORD_SIZE:
+                    # Invalid data looks like a truncated record; stop buffering and report it
+                    value, end = decoder.raw_decode(buffer, position)
+                    break
+                fill()
+            position = end
+            yield value
+
+            token = next_token()
+            position += 1
+            if token == "]":
+                break
+            if token != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position - 1)
+
+    if next_token():
+        raise json.JSONDecodeError("Extra data", buffer, position)
+
+
+def _iter_ndjson(chunks: Iterator[bytes]) -> Iterator[Any]:
+    """Yield one value per non-empty line of newline-delimited JSON given as byte chunks"""
+    pending = b""
+    line_number = 0
+    for chunk in chain(chunks, [b"\n"]):
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                # json.loads detects the encoding of bytes itself
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {str(e)}")
+
+
+def iter_json_records(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield records from a binary stream holding a JSON array or NDJSON
+
+    The format is detected from the first non-whitespace byte: "[" starts a
+    JSON array, anything else is read as one JSON value per line. Only one
+    chunk of the stream is held in memory at a time.
+
+    Args:
+        stream: Binary file-like object
+        chunk_size: Bytes read at a time
+
+    Returns:
+        Iterator over the parsed records
+    """
+    chunks = _read_chunks(stream, chunk_size)
+    head = b""
+    for chunk in chunks:
+        head = chunk.lstrip(codecs.BOM_UTF8 + b" \t\r\n")
+        if head:
+            break
+    if not head:
+        return
+
+    if head[:1] != b"[":
+        yield from _iter_ndjson(chain([head], chunks))
+        return
+
+    try:
+        yield from _iter_json_array(chain([head], chunks))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON format: {str(e)}")
+    except Exception as e:
+        if ijson is not None and isinstance(e, ijson.JSONError):
+            raise ValueError(f"Invalid JSON format: {str(e)}")
+        raise
+
+
+def iter_batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group records into lists of at most batch_size
+
+    Args:
+        records: Iterable of records
+        batch_size: Maximum batch length
+
+    Returns:
+        Iterator over record batches
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
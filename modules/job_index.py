@@ -0,0 +1,94 @@
+"""
+Job application index for the job matching system.
+Maps job_app_id to row position once per dataset, so applications and their
+results can be looked up without scanning.
+"""
+import logging
+from typing import Dict, List, Any, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class JobAppIndex:
+    """Hash index from job_app_id to the row position in a dataset and its results"""
+
+    def __init__(self, job_app_ids: Iterable[Any]):
+        """
+        Build the index
+
+        When an ID occurs more than once, the first occurrence is indexed,
+        like a scan from the start would find it, and the ID is recorded in
+        duplicates.
+
+        Args:
+            job_app_ids: Job application IDs in row order
+        """
+        self.job_app_ids = list(job_app_ids)
+        self.labels = [str(job_app_id) for job_app_id in self.job_app_ids]
+        self._positions: Dict[Any, int] = {}
+        self._label_positions: Dict[str, int] = {}
+        duplicates = {}
+        for position, (job_app_id, label) in enumerate(zip(self.job_app_ids, self.labels)):
+            if self._positions.setdefault(job_app_id, position) != position:
+                duplicates[job_app_id] = None
+            self._label_positions.setdefault(label, position)
+        self.duplicates: List[Any] = list(duplicates)
+        if self.duplicates:
+            logger.warning(f"{len(self.duplicates)} duplicate job_app_id values, e.g. {self.duplicates[:5]}")
+
+    @classmethod
+    def from_job_apps(cls, job_apps: Iterable[Dict[str, Any]]) -> "JobAppIndex":
+        """
+        Index a list of job applications
+
+        Args:
+            job_apps: Job application dictionaries
+
+        Returns:
+            JobAppIndex instance
+        """
+        return cls(job_app.get("job_app_id") for job_app in job_apps)
+
+    def __len__(self) -> int:
+        return len(self.job_app_ids)
+
+    def __contains__(self, job_app_id: Any) -> bool:
+        return job_app_id in self._positions
+
+    def position(self, job_app_id: Any) -> Optional[int]:
+        """
+        Get the row position of a job application ID
+
+        Args:
+            job_app_id: Job application ID
+
+        Returns:
+            Row position, or None if the ID is not indexed
+        """
+        return self._positions.get(job_app_id)
+
+    def label_position(self, label: str) -> Optional[int]:
+        """
+        Get the row position of a job application ID given as text, e.g. from a selectbox
+
+        Args:
+            label: Job application ID as str(job_app_id)
+
+        Returns:
+            Row position, or None if no ID has this label
+        """
+        return self._label_positions.get(label)
+
+    def get(self, rows: Sequence[Any], job_app_id: Any) -> Optional[Any]:
+        """
+        Look up the row of a job application ID in a sequence in dataset order
+
+        Args:
+            rows: Job applications or scoring results of the indexed dataset
+            job_app_id: Job application ID
+
+        Returns:
+            Row, or None if the ID is not indexed
+        """
+        position = self._positions.get(job_app_id)
+        return rows[position] if position is not None else None
@@ -0,0 +1,186 @@
+"""
+Micro-batching for the job matching system.
+Collects concurrent single-item requests on an asyncio event loop and scores
+them together on the batch path in a worker thread.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Dict, List, Any, Callable, Deque, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor of the batch scoring time average
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class BatcherOverloaded(RuntimeError):
+    """Raised when a MicroBatcher already holds max_pending requests"""
+
+
+class MicroBatcher:
+    """Groups concurrent submissions into batches flushed on size or deadline"""
+
+    def __init__(self, score_batch: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 256,
+                 max_delay: float = 0.005, max_pending: int = 10000, executor: Optional[Executor] = None):
+        """
+        Initialize the batcher
+
+        One batch is scored at a time; requests arriving meanwhile form the
+        next batch. A batch is flushed as soon as it is full, otherwise after
+        a collection window that follows the average batch scoring time,
+        bounded by max_delay: under light load requests barely wait, under
+        heavy load batches fill while the previous one is being scored.
+        When scoring a batch fails, its items are scored one by one so an
+        invalid item only fails its own request.
+
+        Args:
+            score_batch: Scores a list of items, returning one result per item in order
+            max_batch_size: Largest number of items scored together
+            max_delay: Longest time in seconds the first item of a batch waits for others
+            max_pending: Largest number of queued items before submit raises BatcherOverloaded
+            executor: Executor running score_batch, the loop's default executor if omitted
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_delay = max(float(max_delay), 0.0)
+        self.max_pending = max(int(max_pending), 1)
+        self.executor = executor
+        self._queue: Deque[Tuple[Any, asyncio.Future]] = deque()
+        self._arrived = asyncio.Event()
+        self._filled = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._service_time = 0.0
+        self._last_batch_size = 0
+        self.batches = 0
+        self.items = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        """Start flushing batches on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop flushing and cancel requests that are still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue:
+            _, future = self._queue.popleft()
+            future.cancel()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Score one item as part of the next batch
+
+        Args:
+            item: Item passed to score_batch
+
+        Returns:
+            Result of the item
+        """
+        if len(self._queue) >= self.max_pending:
+            raise BatcherOverloaded(f"{len(self._queue)} requests pending")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((item, future))
+        self._arrived.set()
+        if len(self._queue) >= self.max_batch_size:
+            self._filled.set()
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics
+
+        Returns:
+            Dictionary with batches, items, mean_batch_size, pending and
+            service_time_ms (smoothed batch scoring time)
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": len(self._queue),
+            "service_time_ms": self._service_time * 1000
+        }
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for the next batch and take it from the queue"""
+        while not self._queue:
+            self._arrived.clear()
+            await self._arrived.wait()
+
+        # Waiting only pays off when requests arrive concurrently
+        window = min(self.max_delay, self._service_time) if self._last_batch_size > 1 else 0.0
+        if len(self._queue) < self.max_batch_size and window > 0:
+            self._filled.clear()
+            try:
+                await asyncio.wait_for(self._filled.wait(), window)
+            except asyncio.TimeoutError:
+                pass
+
+        batch = []
+        while self._queue and len(batch) < self.max_batch_size:
+            item, future = self._queue.popleft()
+            # Requests whose client went away are not scored
+            if not future.done():
+                batch.append((item, future))
+        if len(self._queue) >= self.max_batch_size:
+            self._filled.set()
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self.executor, self.score_batch, [item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"score_batch returned {len(results)} results for {len(batch)} items")
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+                raise
+            except Exception as e:
+                logger.warning(f"Error scoring a batch of {len(batch)}, scoring items individually: {str(e)}")
+                outcomes = await loop.run_in_executor(self.executor, self._score_each, [item for item, _ in batch])
+            else:
+                outcomes = [(result, None) for result in results]
+            finally:
+                elapsed = time.perf_counter() - start
+                self._service_time += SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+
+            self.batches += 1
+            self.items += len(batch)
+            self._last_batch_size = len(batch)
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _score_each(self, items: List[Any]) -> List[Tuple[Any, Optional[Exception]]]:
+        """Score items one at a time, returning (result, error) pairs"""
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((self.score_batch([item])[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
@@ -0,0 +1,164 @@
+"""
+Parallel batch scoring for the job matching system.
+Scores chunks of columnar applications in a process pool, sharing the
+input arrays through multiprocessing.shared_memory.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from modules.batch_engine import ApplicationColumns, BatchScoringEngine
+from modules.scoring_plan import COMPONENTS, ScoringPlan
+
+logger = logging.getLogger(__name__)
+
+# (field name, dtype string, length, byte offset) for each shared array
+Layout = List[Tuple[str, str, int, int]]
+
+
+class SharedColumns:
+    """Numeric ApplicationColumns arrays copied into one shared memory block"""
+
+    def __init__(self, columns: ApplicationColumns):
+        """
+        Copy the numeric arrays of columns into a new shared memory block
+
+        Args:
+            columns: ApplicationColumns instance
+        """
+        self.layout: Layout = []
+        offset = 0
+        for name in ApplicationColumns.ARRAY_FIELDS:
+            array = getattr(columns, name)
+            # Keep every array 8-byte aligned
+            offset = (offset + 7) // 8 * 8
+            self.layout.append((name, array.dtype.str, len(array), offset))
+            offset += array.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, dtype, length, start in self.layout:
+            target = np.ndarray((length,), dtype=dtype, buffer=self.shm.buf, offset=start)
+            target[:] = getattr(columns, name)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Release and remove the shared memory block"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedColumns":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _attach(shm_name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker, so
+        # the extra registration is harmless and the parent still unlinks
+        return shared_memory.SharedMemory(name=shm_name)
+
+
+def _score_chunk(shm_name: str, layout: Layout, start: int, stop: int,
+                 plan: ScoringPlan) -> Tuple[int, np.ndarray]:
+    """
+    Score rows [start, stop) of the shared columns in a worker process
+
+    Returns:
+        Tuple of (start, raw score matrix) for the chunk
+    """
+    shm = _attach(shm_name)
+    try:
+        arrays = {
+            name: np.ndarray((length,), dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, length, offset in layout
+        }
+        columns = ApplicationColumns(job_app_ids=None, vocabulary=None, **arrays)
+        engine = BatchScoringEngine(plan)
+        raw = engine.compute_raw_scores(columns.slice_rows(start, stop))
+        # Drop views into the block before closing it
+        del arrays, columns
+        return start, raw
+    finally:
+        shm.close()
+
+
+def resolve_workers(workers: int) -> int:
+    """Resolve a configured worker count, where 0 or less means all CPUs"""
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def compute_raw_scores_parallel(engine: BatchScoringEngine, columns: ApplicationColumns,
+                                workers: int = 0, chunk_size: int = 50000) -> np.ndarray:
+    """
+    Compute raw component scores using a process pool
+
+    Chunks are scored independently and reassembled in input order, so the
+    output is identical to BatchScoringEngine.compute_raw_scores.
+
+    Args:
+        engine: BatchScoringEngine providing the scoring plan
+        columns: ApplicationColumns instance
+        workers: Number of worker processes, 0 for all CPUs
+        chunk_size: Number of applications per chunk
+
+    Returns:
+        Float array of shape (N, 4) in COMPONENTS order
+    """
+    n_rows = len(columns)
+    chunk_size = max(int(chunk_size), 1)
+    workers = min(resolve_workers(workers), (n_rows + chunk_size - 1) // chunk_size)
+
+    raw = np.empty((n_rows, len(COMPONENTS)), dtype=np.float64)
+
+    with SharedColumns(columns) as shared:
+        with ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = [
+                executor.submit(_score_chunk, shared.name, shared.layout, start,
+                                min(start + chunk_size, n_rows), engine.plan)
+                for start in range(0, n_rows, chunk_size)
+            ]
+            for future in futures:
+                start, chunk_raw = future.result()
+                raw[start:start + len(chunk_raw)] = chunk_raw
+
+    logger.info(f"Scored {n_rows} applications in {len(futures)} chunks with {workers} workers")
+    return raw
+
+
+def compute_raw_scores(engine: BatchScoringEngine, columns: ApplicationColumns,
+                       batch_settings: Dict[str, Any]) -> np.ndarray:
+    """
+    Compute raw scores in parallel when enabled and worthwhile, serially otherwise
+
+    Args:
+        engine: BatchScoringEngine instance
+        columns: ApplicationColumns instance
+        batch_settings: The "batch" section of the scoring configuration
+
+    Returns:
+        Float array of shape (N, 4) in COMPONENTS order
+    """
+    parallel = batch_settings.get("parallel", False)
+    min_rows = batch_settings.get("parallel_min_rows", 100000)
+    chunk_size = batch_settings.get("chunk_size", 50000)
+
+    if not parallel or len(columns) < max(min_rows, chunk_size + 1):
+        return engine.compute_raw_scores(columns)
+
+    try:
+        return compute_raw_scores_parallel(engine, columns, batch_settings.get("workers", 0), chunk_size)
+    except Exception as e:
+        logger.warning(f"Parallel scoring failed, falling back to serial: {str(e)}")
+        return engine.compute_raw_scores(columns)
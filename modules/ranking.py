@@ -0,0 +1,83 @@
+"""
+Ranking utilities for the job matching system.
+Selects the best scoring results with bounded memory.
+"""
+import heapq
+import logging
+from typing import Dict, List, Any, Iterable, Optional
+
+from modules.results import ScoreResults
+
+logger = logging.getLogger(__name__)
+
+
+class TopKCollector:
+    """Keeps the K highest scoring results seen so far in a min-heap"""
+
+    def __init__(self, k: int):
+        """
+        Initialize with the number of results to keep
+
+        Args:
+            k: Maximum number of results to keep
+        """
+        self.k = max(int(k), 0)
+        # Entries are (total_score, -sequence, result); on equal scores the
+        # later result sorts lower and is evicted first
+        self._heap = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Lowest kept score once the collector is full, None before that"""
+        if self.k and len(self._heap) >= self.k:
+            return self._heap[0][0]
+        return None
+
+    def offer(self, total_score: float, sequence: int, result: Dict[str, Any]) -> bool:
+        """
+        Offer a result for inclusion in the top K
+
+        Args:
+            total_score: Result total score
+            sequence: Position of the result in the input stream, used to break ties
+            result: Scoring result dictionary
+
+        Returns:
+            True if the result was kept
+        """
+        if not self.k:
+            return False
+        entry = (total_score, -sequence, result)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Return kept results ordered by score descending, then input order"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def select_top_k(results: Iterable[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """
+    Select the K highest scoring results without sorting all of them
+
+    Args:
+        results: Iterable of scoring result dictionaries
+        k: Number of results to keep
+
+    Returns:
+        Up to K results ordered by total score descending, ties in input order
+    """
+    if isinstance(results, ScoreResults):
+        return results.top_k(k)
+    collector = TopKCollector(k)
+    for sequence, result in enumerate(results):
+        collector.offer(result["total_score"], sequence, result)
+    return collector.results()
@@ -0,0 +1,230 @@
+"""
+Compact scoring results for the job matching system.
+Stores results as one float block instead of nested dictionaries per
+application, with dictionary-compatible views for existing callers.
+"""
+import logging
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Dict, List, Any, Iterator, Union
+
+import numpy as np
+
+from modules.scoring_plan import COMPONENTS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column layout of the score block
+SCORE_FIELDS = (
+    ("total_score",)
+    + tuple(f"{name}_raw" for name in COMPONENTS)
+    + tuple(f"{name}_weighted" for name in COMPONENTS)
+)
+
+# Structured dtype giving named access to one row of the score block
+RESULT_DTYPE = np.dtype([(name, np.float64) for name in SCORE_FIELDS])
+
+# Order of components inside the "scores" dictionary of a result
+RESULT_SCORE_ORDER = ("core_skills", "education", "experience", "certifications")
+
+
+class ResultView(Mapping):
+    """Read-only view of one result with the scoring result dictionary API"""
+
+    __slots__ = ("_results", "_index")
+
+    def __init__(self, results: "ScoreResults", index: int):
+        self._results = results
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "job_app_id":
+            return self._results.job_app_ids[self._index]
+        if key == "total_score":
+            return float(self._results.block[self._index, 0])
+        if key == "scores":
+            row = self._results.block[self._index].tolist()
+            n_components = len(COMPONENTS)
+            return {
+                name: {
+                    "raw_score": row[1 + COMPONENTS.index(name)],
+                    "weighted_score": row[1 + n_components + COMPONENTS.index(name)]
+                } for name in RESULT_SCORE_ORDER
+            }
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("job_app_id", "total_score", "scores"))
+
+    def __len__(self) -> int:
+        return 3
+
+    def __repr__(self) -> str:
+        return f"ResultView({dict(self)!r})"
+
+    @property
+    def raw_scores(self) -> np.ndarray:
+        """Raw component scores in COMPONENTS order"""
+        return self._results.raw[self._index]
+
+    @property
+    def weighted_scores(self) -> np.ndarray:
+        """Weighted component scores in COMPONENTS order"""
+        return self._results.weighted[self._index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize as a plain scoring result dictionary"""
+        return {key: self[key] for key in self}
+
+
+class ScoreResults(Sequence):
+    """Scoring results held in a single (N x 9) float block"""
+
+    def __init__(self, job_app_ids: List[Any], block: np.ndarray):
+        """
+        Initialize from job application IDs and a score block
+
+        Args:
+            job_app_ids: Job application IDs in row order
+            block: C-contiguous float array of shape (N, 9) laid out as SCORE_FIELDS
+        """
+        self.job_app_ids = job_app_ids
+        self.block = np.ascontiguousarray(block, dtype=np.float64)
+
+    @classmethod
+    def from_arrays(cls, job_app_ids: List[Any], raw: np.ndarray, weighted: np.ndarray,
+                    totals: np.ndarray) -> "ScoreResults":
+        """
+        Build results from the arrays produced by the batch engine
+
+        Args:
+            job_app_ids: Job application IDs in row order
+            raw: Raw score matrix in COMPONENTS order
+            weighted: Weighted score matrix in COMPONENTS order
+            totals: Rounded total scores
+
+        Returns:
+            ScoreResults instance
+        """
+        block = np.empty((len(totals), len(SCORE_FIELDS)), dtype=np.float64)
+        block[:, 0] = totals
+        block[:, 1:1 + len(COMPONENTS)] = raw
+        block[:, 1 + len(COMPONENTS):] = weighted
+        return cls(list(job_app_ids), block)
+
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]]) -> "ScoreResults":
+        """
+        Build results from scoring result dictionaries
+
+        Args:
+            results: List of scoring result dictionaries
+
+        Returns:
+            ScoreResults instance
+        """
+        if isinstance(results, ScoreResults):
+            return results
+        block = np.array([
+            [r["total_score"]]
+            + [r["scores"][name]["raw_score"] for name in COMPONENTS]
+            + [r["scores"][name]["weighted_score"] for name in COMPONENTS]
+            for r in results
+        ], dtype=np.float64).reshape(len(results), len(SCORE_FIELDS))
+        return cls([r["job_app_id"] for r in results], block)
+
+    def __len__(self) -> int:
+        return len(self.block)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ResultView, "ScoreResults"]:
+        if isinstance(index, slice):
+            return ScoreResults(self.job_app_ids[index], self.block[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ScoreResults index out of range")
+        return ResultView(self, index)
+
+    def __iter__(self) -> Iterator[ResultView]:
+        return (ResultView(self, index) for index in range(len(self)))
+
+    @property
+    def records(self) -> np.ndarray:
+        """Structured array view of the score block (no copy)"""
+        return self.block.view(RESULT_DTYPE).reshape(len(self))
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Total scores"""
+        return self.block[:, 0]
+
+    @property
+    def raw(self) -> np.ndarray:
+        """Raw component scores in COMPONENTS order"""
+        return self.block[:, 1:1 + len(COMPONENTS)]
+
+    @property
+    def weighted(self) -> np.ndarray:
+        """Weighted component scores in COMPONENTS order"""
+        return self.block[:, 1 + len(COMPONENTS):]
+
+    def take(self, indices: np.ndarray) -> "ScoreResults":
+        """
+        Select rows by position
+
+        Args:
+            indices: Row positions
+
+        Returns:
+            ScoreResults with the selected rows in the given order
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return ScoreResults([self.job_app_ids[i] for i in indices.tolist()], self.block[indices])
+
+    def top_k(self, k: int = None) -> "ScoreResults":
+        """
+        Select the K highest scoring rows
+
+        Only the rows at or above the K-th best score are sorted, so
+        selecting a page of a large result set costs O(N + K log K).
+
+        Args:
+            k: Number of rows to keep, None for all rows
+
+        Returns:
+            ScoreResults ordered by total score descending, ties in input order
+        """
+        totals = self.totals
+        if k is not None and k < len(totals):
+            k = max(int(k), 0)
+            if k == 0:
+                return self.take([])
+            # Every row tied with the k-th best score stays a candidate, in input
+            # order, so that ties resolve like a stable sort
+            threshold = -np.partition(-totals, k - 1)[k - 1]
+            candidates = np.flatnonzero(totals >= threshold)
+        else:
+            candidates = np.arange(len(totals))
+        return self.take(candidates[np.argsort(-totals[candidates], kind="stable")[:k]])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize all results as scoring result dictionaries"""
+        return [view.to_dict() for view in self]
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Convert to a DataFrame with job_app_id followed by SCORE_FIELDS columns
+
+        Score columns share memory with the score block; the frame is a view
+        and must not be modified in place.
+
+        Returns:
+            Pandas DataFrame
+        """
+        import pandas as pd
+
+        scores_df = pd.DataFrame(self.block, columns=list(SCORE_FIELDS), copy=False)
+        scores_df.insert(0, "job_app_id", pd.Series(self.job_app_ids))
+        return scores_df
@@ -0,0 +1,549 @@
+"""
+Persistent results store for the job matching system.
+Keeps one scored run per dataset fingerprint and raw score version (the
+education hierarchy) in a local SQLite file, and answers ranked and
+paginated queries in SQL without loading whole runs into Python. Queries
+with other weights than the stored ones are re-weighted in SQL. Runs record per-application
+content hashes and their source, so a re-upload can be diffed against the
+previous version (see delta_ingestion).
+
+Usage:
+    python -m modules.results_store data/results.db runs
+    python -m modules.results_store data/results.db top --run 3 --min-score 60 --limit 20 --offset 40
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from itertools import chain
+from typing import Dict, List, Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+from modules.batch_engine import RawScores
+from modules.delta_ingestion import DatasetVersion
+from modules.results import SCORE_FIELDS, ScoreResults
+from modules.scoring_plan import COMPONENTS, DEFAULT_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+# Result rows per executemany call
+INSERT_BATCH_ROWS = 10000
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset TEXT NOT NULL,
+    config_version TEXT NOT NULL,
+    weights TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    row_count INTEGER NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_dataset ON runs (dataset, config_version, run_id);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    job_app_id,
+    {", ".join(f"{name} REAL NOT NULL" for name in SCORE_FIELDS)},
+    content_hash BLOB,
+    PRIMARY KEY (run_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_score ON results (run_id, total_score DESC, position);
+CREATE INDEX IF NOT EXISTS results_job_app_id ON results (job_app_id, run_id);
+"""
+
+# Columns added after the first schema, created on stores that predate them
+_MIGRATIONS = [
+    ("runs", "source", "TEXT"),
+    ("results", "content_hash", "BLOB")
+]
+
+# Indexes over migrated columns; runs were once unique per set of weights
+_INDEXES = """
+DROP INDEX IF EXISTS runs_version;
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source, config_version, run_id);
+"""
+
+_SCORE_COLUMNS = ", ".join(SCORE_FIELDS)
+
+# Score columns re-weighted in SQL with parameters w0-w3: the same products and
+# summation order as BatchScoringEngine.compute_weighted_scores, so scores are
+# bit-identical to re-weighting in numpy
+_WEIGHTED = [f"{name}_raw * :w{i}" for i, name in enumerate(COMPONENTS)]
+_UNROUNDED_TOTAL = f"({_WEIGHTED[0]} + {_WEIGHTED[2]} + {_WEIGHTED[1]} + {_WEIGHTED[3]})"
+_WEIGHTED_COLUMNS = ", ".join(
+    [f"round_score({_UNROUNDED_TOTAL}) AS total_score"]
+    + [f"{name}_raw" for name in COMPONENTS]
+    + [f"{expression} AS {name}_weighted" for name, expression in zip(COMPONENTS, _WEIGHTED)]
+)
+
+# Rounding moves a total by at most 0.005, so only totals this close to a bound
+# can end up on the other side of it; the Python rounding function is only
+# called for those
+_ROUNDING_MARGIN = 0.01
+_WEIGHTED_MINIMUM_FILTER = (
+    f"{_UNROUNDED_TOTAL} >= :minimum - {_ROUNDING_MARGIN} AND "
+    f"({_UNROUNDED_TOTAL} >= :minimum + {_ROUNDING_MARGIN} OR round_score({_UNROUNDED_TOTAL}) >= :minimum)"
+)
+
+
+def _weights_key(weights: Dict[str, float]) -> str:
+    """Canonical text form of a set of weights"""
+    return json.dumps(sorted(weights.items()), separators=(",", ":"))
+
+
+def _round_score(value: Optional[float]) -> Optional[float]:
+    """Total score rounding of re-weighted queries, like batch_engine.round_scores"""
+    return round(value, 2) if value is not None else None
+
+
+def _sql_value(job_app_id: Any) -> Any:
+    """job_app_id as a value SQLite stores without loss of type"""
+    if job_app_id is None or isinstance(job_app_id, (str, int, float)):
+        return job_app_id
+    if isinstance(job_app_id, np.generic):
+        return job_app_id.item()
+    return str(job_app_id)
+
+
+class ResultsStore:
+    """SQLite store of scored runs with ranked and paginated queries"""
+
+    def __init__(self, path: str, keep_runs: int = 20, insert_batch_rows: int = INSERT_BATCH_ROWS):
+        """
+        Open or create a store
+
+        One connection is shared by all threads and serialized by a lock,
+        like ScoreCache.
+
+        Args:
+            path: SQLite file
+            keep_runs: Most recent runs kept when saving, 0 keeps all
+            insert_batch_rows: Result rows per executemany call
+        """
+        self.path = path
+        self.keep_runs = keep_runs
+        self.insert_batch_rows = max(int(insert_batch_rows), 1)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.create_function("round_score", 1, _round_score, deterministic=True)
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns missing from stores created by earlier versions"""
+        for table, column, column_type in _MIGRATIONS:
+            columns = {row[1] for row in self._db.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                logger.info(f"Added column {table}.{column} to results store {self.path}")
+        self._db.executescript(_INDEXES)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["ResultsStore"]:
+        """
+        Open the store of the "results_store" configuration section
+
+        Returns:
+            ResultsStore instance, or None when the store is disabled
+        """
+        if not settings.get("enabled", False) or not settings.get("path"):
+            return None
+        return cls(
+            settings["path"],
+            keep_runs=settings.get("keep_runs", 20),
+            insert_batch_rows=settings.get("insert_batch_rows", INSERT_BATCH_ROWS)
+        )
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def find_run(self, dataset: str, config_version: str) -> Optional[int]:
+        """
+        Look up the stored run of a dataset
+
+        The run can be queried with any weights, its raw scores are the same.
+
+        Args:
+            dataset: Dataset fingerprint
+            config_version: Raw score version, see ScoringService.raw_scores_version
+
+        Returns:
+            Run ID, or None if no run matches
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT run_id FROM runs WHERE dataset = ? AND config_version = ? ORDER BY run_id DESC LIMIT 1",
+                (dataset, config_version)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def find_previous_run(self, source: str, config_version: str) -> Optional[int]:
+        """
+        Look up the latest run of a source, whose content hashes a new
+        version of the source can be diffed against
+
+        Args:
+            source: Source label, e.g. the uploaded file name
+            config_version: Raw score version, see ScoringService.raw_scores_version
+
+        Returns:
+            Run ID, or None if the source has no such run
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT run_id FROM runs WHERE source = ? AND config_version = ? ORDER BY run_id DESC LIMIT 1",
+                (source, config_version)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def save_results(self, results: Sequence[Any], dataset: str, config_version: str,
+                     weights: Dict[str, float], content_hashes: Sequence[bytes] = None,
+                     source: str = None) -> int:
+        """
+        Store the results of a scoring run in one transaction
+
+        A run with the same dataset and raw score version is replaced, and
+        runs beyond keep_runs are deleted, oldest first. The weights only
+        decide the stored total and weighted scores, which serve queries
+        with the same weights from the total score index.
+
+        Args:
+            results: ScoreResults or scoring result dictionaries in dataset order
+            dataset: Dataset fingerprint
+            config_version: Raw score version, see ScoringService.raw_scores_version
+            weights: Scoring weights the results were computed with
+            content_hashes: Optional content hashes of the applications in dataset order
+            source: Optional source label for find_previous_run, requires content_hashes
+
+        Returns:
+            Run ID
+        """
+        results = ScoreResults.from_results(results)
+        if content_hashes is not None and len(content_hashes) != len(results):
+            raise ValueError(f"{len(content_hashes)} content hashes for {len(results)} results")
+        if source is not None and content_hashes is None:
+            raise ValueError("Runs with a source need content hashes")
+        weights_key = _weights_key(weights)
+        insert = (f"INSERT INTO results (run_id, position, job_app_id, {_SCORE_COLUMNS}, content_hash) "
+                  f"VALUES ({', '.join('?' * (len(SCORE_FIELDS) + 4))})")
+        start = time.perf_counter()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "DELETE FROM runs WHERE dataset = ? AND config_version = ?", (dataset, config_version)
+                )
+                run_id = self._db.execute(
+                    "INSERT INTO runs (dataset, config_version, weights, created_at, row_count, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (dataset, config_version, weights_key, time.time(), len(results), source)
+                ).lastrowid
+                for batch_start in range(0, len(results), self.insert_batch_rows):
+                    batch_stop = min(batch_start + self.insert_batch_rows, len(results))
+                    hashes = (content_hashes[batch_start:batch_stop] if content_hashes is not None
+                              else [None] * (batch_stop - batch_start))
+                    self._db.executemany(insert, [
+                        (run_id, position, _sql_value(job_app_id), *row, content_hash)
+                        for position, job_app_id, row, content_hash in zip(
+                            range(batch_start, batch_stop),
+                            results.job_app_ids[batch_start:batch_stop],
+                            results.block[batch_start:batch_stop].tolist(),
+                            hashes
+                        )
+                    ])
+                if self.keep_runs:
+                    self._db.execute(
+                        "DELETE FROM runs WHERE run_id NOT IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)",
+                        (self.keep_runs,)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        logger.info(f"Stored run {run_id} with {len(results)} results in {time.perf_counter() - start:.3f}s")
+        return run_id
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """
+        List stored runs, most recent first
+
+        Returns:
+            Dictionaries with run_id, dataset, config_version, weights,
+            created_at, row_count and source
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT run_id, dataset, config_version, weights, created_at, row_count, source "
+                "FROM runs ORDER BY run_id DESC"
+            ).fetchall()
+        return [{
+            "run_id": run_id,
+            "dataset": dataset,
+            "config_version": config_version,
+            "weights": dict(json.loads(weights)),
+            "created_at": created_at,
+            "row_count": row_count,
+            "source": source
+        } for run_id, dataset, config_version, weights, created_at, row_count, source in rows]
+
+    def count(self, run_id: int, minimum_score: float = None, weights: Dict[str, float] = None) -> int:
+        """
+        Count the results of a run, optionally only those at or above a score
+
+        Args:
+            run_id: Run ID
+            minimum_score: Optional minimum total score
+            weights: Weights the minimum score applies to, the stored weights by default
+
+        Returns:
+            Number of results
+        """
+        if minimum_score is None:
+            with self._lock:
+                row = self._db.execute("SELECT row_count FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            return row[0] if row is not None else 0
+        weighting = self._weighting(run_id, weights)
+        minimum_filter = "total_score >= :minimum" if weighting is None else _WEIGHTED_MINIMUM_FILTER
+        with self._lock:
+            return self._db.execute(
+                f"SELECT COUNT(*) FROM results WHERE run_id = :run_id AND {minimum_filter}",
+                {**(weighting or {}), "run_id": run_id, "minimum": minimum_score}
+            ).fetchone()[0]
+
+    def query(self, run_id: int, minimum_score: float = None, limit: int = None, offset: int = 0,
+              weights: Dict[str, float] = None) -> ScoreResults:
+        """
+        Get one page of a run ranked by total score
+
+        With the stored weights, the ranking is read from the (run_id,
+        total_score) index, so a page costs its own size plus the skipped
+        offset, not the size of the run. Other weights are applied to the
+        stored raw scores in SQL: one pass over the run finds the page by
+        unrounded total, and only rows near its boundary are rounded and
+        ranked exactly.
+
+        Args:
+            run_id: Run ID
+            minimum_score: Optional minimum total score
+            limit: Page size, None for all remaining results
+            offset: Number of ranked results to skip
+            weights: Weights to rank by, the stored weights by default
+
+        Returns:
+            ScoreResults ordered by total score descending, ties in dataset order
+        """
+        weighting = self._weighting(run_id, weights)
+        parameters = {**(weighting or {}), "run_id": run_id, "minimum": minimum_score,
+                      "limit": limit if limit is not None else -1, "offset": offset}
+        where = "run_id = :run_id"
+        if weighting is None:
+            columns = _SCORE_COLUMNS
+            if minimum_score is not None:
+                where += " AND total_score >= :minimum"
+        else:
+            columns = _WEIGHTED_COLUMNS
+            if minimum_score is not None:
+                where += f" AND {_WEIGHTED_MINIMUM_FILTER}"
+            if limit:
+                # Rows ranked on or before the page by rounded total have an unrounded
+                # total within the rounding margin of the page's last unrounded total
+                with self._lock:
+                    row = self._db.execute(
+                        f"SELECT {_UNROUNDED_TOTAL} AS total FROM results WHERE {where} "
+                        f"ORDER BY total DESC LIMIT 1 OFFSET :last",
+                        {**parameters, "last": offset + limit - 1}
+                    ).fetchone()
+                if row is not None:
+                    where += f" AND {_UNROUNDED_TOTAL} >= :boundary"
+                    parameters["boundary"] = row[0] - _ROUNDING_MARGIN
+        return self._fetch_results(
+            f"SELECT job_app_id, {columns} FROM results WHERE {where} "
+            f"ORDER BY total_score DESC, position LIMIT :limit OFFSET :offset",
+            parameters
+        )
+
+    def load_results(self, run_id: int, weights: Dict[str, float] = None) -> ScoreResults:
+        """
+        Load all results of a run in dataset order
+
+        Args:
+            run_id: Run ID
+            weights: Weights to score with, the stored weights by default
+
+        Returns:
+            ScoreResults instance
+        """
+        weighting = self._weighting(run_id, weights)
+        columns = _SCORE_COLUMNS if weighting is None else _WEIGHTED_COLUMNS
+        return self._fetch_results(
+            f"SELECT job_app_id, {columns} FROM results WHERE run_id = :run_id ORDER BY position",
+            {**(weighting or {}), "run_id": run_id}
+        )
+
+    def load_raw_scores(self, run_id: int, education_hierarchy: Sequence[str]) -> RawScores:
+        """
+        Load the raw component scores of a run in dataset order
+
+        Raw scores do not depend on the weights, so any run of a dataset and
+        raw score version can be re-weighted instead of rescored.
+
+        Args:
+            run_id: Run ID
+            education_hierarchy: Education hierarchy of the run's raw score version
+
+        Returns:
+            RawScores instance
+        """
+        raw_columns = ", ".join(f"{name}_raw" for name in COMPONENTS)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT job_app_id, {raw_columns} FROM results WHERE run_id = ? ORDER BY position", (run_id,)
+            ).fetchall()
+        table = self._table(rows, len(COMPONENTS) + 1)
+        return RawScores(table[:, 0].tolist(), table[:, 1:].astype(np.float64), education_hierarchy)
+
+    def load_dataset_version(self, run_id: int, education_hierarchy: Sequence[str]) -> DatasetVersion:
+        """
+        Load the content hashes and raw scores of a run for delta ingestion
+
+        Args:
+            run_id: Run ID, e.g. from find_previous_run
+            education_hierarchy: Education hierarchy of the run's raw score version
+
+        Returns:
+            DatasetVersion instance
+        """
+        raw_columns = ", ".join(f"{name}_raw" for name in COMPONENTS)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT job_app_id, content_hash, {raw_columns} FROM results WHERE run_id = ? ORDER BY position",
+                (run_id,)
+            ).fetchall()
+        table = self._table(rows, len(COMPONENTS) + 2)
+        job_app_ids = table[:, 0].tolist()
+        raw_scores = RawScores(job_app_ids, table[:, 2:].astype(np.float64), education_hierarchy)
+        return DatasetVersion(job_app_ids, table[:, 1].tolist(), raw_scores, run_id=run_id)
+
+    def get(self, run_id: int, job_app_id: Any, weights: Dict[str, float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up the result of one job application in a run
+
+        Args:
+            run_id: Run ID
+            job_app_id: Job application ID
+            weights: Weights to score with, the stored weights by default
+
+        Returns:
+            Scoring result dictionary, or None if the run has no such ID
+        """
+        weighting = self._weighting(run_id, weights)
+        columns = _SCORE_COLUMNS if weighting is None else _WEIGHTED_COLUMNS
+        results = self._fetch_results(
+            f"SELECT job_app_id, {columns} FROM results WHERE job_app_id = :job_app_id AND run_id = :run_id "
+            f"ORDER BY position LIMIT 1",
+            {**(weighting or {}), "job_app_id": _sql_value(job_app_id), "run_id": run_id}
+        )
+        return results[0].to_dict() if len(results) else None
+
+    def _weighting(self, run_id: int, weights: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        """
+        Weight parameters of the re-weighted columns
+
+        Returns:
+            Dictionary of w0-w3 in COMPONENTS order, or None when the stored
+            scores already use the weights
+        """
+        if weights is None:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT weights FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None or row[0] == _weights_key(weights):
+            return None
+        return {f"w{i}": weights.get(name, DEFAULT_WEIGHTS[name]) for i, name in enumerate(COMPONENTS)}
+
+    def _fetch_results(self, sql: str, parameters: Dict[str, Any]) -> ScoreResults:
+        """Run a results query and build a score block from its rows"""
+        with self._lock:
+            rows = self._db.execute(sql, parameters).fetchall()
+        table = self._table(rows, len(SCORE_FIELDS) + 1)
+        return ScoreResults(table[:, 0].tolist(), table[:, 1:].astype(np.float64))
+
+    @staticmethod
+    def _table(rows: List[tuple], width: int) -> np.ndarray:
+        """Object array of fetched rows; one flat fill is several times faster than per-row tuples"""
+        return np.fromiter(chain.from_iterable(rows), dtype=object, count=len(rows) * width).reshape(len(rows), width)
+
+
+def iter_table(results: ScoreResults, offset: int = 0) -> Iterator[str]:
+    """Format ranked results as table lines"""
+    yield f"{'rank':>8}  {'job_app_id':<20} {'total_score':>11}"
+    for rank, (job_app_id, total_score) in enumerate(zip(results.job_app_ids, results.totals.tolist()),
+                                                     start=offset + 1):
+        yield f"{rank:>8}  {str(job_app_id):<20} {total_score:>11.2f}"
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m modules.results_store",
+                                     description="Query scored runs in a results store")
+    parser.add_argument("store", help="SQLite results store file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("runs", help="List stored runs")
+    top = subparsers.add_parser("top", help="Show ranked results of a run")
+    top.add_argument("--run", type=int, help="Run ID, the most recent run by default")
+    top.add_argument("--min-score", type=float, help="Only results at or above this total score")
+    top.add_argument("--limit", type=int, default=20, help="Page size")
+    top.add_argument("--offset", type=int, default=0, help="Ranked results to skip")
+    top.add_argument("--json", action="store_true", help="Print full scoring results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not os.path.isfile(args.store):
+        logger.error(f"No results store at {args.store}")
+        return 1
+    store = ResultsStore(args.store, keep_runs=0)
+    try:
+        runs = store.runs()
+        if args.command == "runs":
+            for run in runs:
+                weights = ", ".join(f"{name}={value:g}" for name, value in run["weights"].items())
+                created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["created_at"]))
+                print(f"{run['run_id']:>6}  {created}  {run['row_count']:>10} results  "
+                      f"dataset {run['dataset'][:12]}  config {run['config_version'][:12]}  {weights}"
+                      + (f"  source {run['source']}" if run["source"] else ""))
+            return 0
+
+        run_id = args.run if args.run is not None else (runs[0]["run_id"] if runs else None)
+        if run_id is None or run_id not in {run["run_id"] for run in runs}:
+            logger.error(f"No run {run_id} in {args.store}")
+            return 1
+        page = store.query(run_id, args.min_score, args.limit, args.offset)
+        if args.json:
+            print(json.dumps(page.to_dicts(), indent=2))
+        else:
+            for line in iter_table(page, args.offset):
+                print(line)
+            print(f"{len(page)} of {store.count(run_id, args.min_score)} results in run {run_id}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Score memoization for the job matching system.
+Caches scoring results by a content hash of the inputs in a bounded LRU,
+with an optional SQLite tier that survives process restarts.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional
+
+from modules.scoring_plan import ScoringPlan
+
+logger = logging.getLogger(__name__)
+
+# Disk writes are committed in batches of this size
+COMMIT_INTERVAL = 1000
+
+# Canonical JSON of a record, shared to skip building an encoder per record
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _normalize(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Sort item lists, whose order never affects scoring (duplicates are kept)"""
+    return {key: sorted(value, key=str) if isinstance(value, list) else value for key, value in section.items()}
+
+
+def plan_fingerprint(plan: ScoringPlan) -> str:
+    """Stable digest of the weights and education hierarchy of a plan"""
+    payload = json.dumps([list(plan.weight_vector), list(plan.education_hierarchy)], separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def raw_scores_fingerprint(education_hierarchy: Iterable[str]) -> str:
+    """
+    Stable digest of the configuration raw component scores depend on
+
+    Weights, thresholds and display settings do not change raw scores, so
+    stored raw scores stay valid across edits to them.
+
+    Args:
+        education_hierarchy: Education levels from highest to lowest
+
+    Returns:
+        Hex digest identifying the raw score inputs
+    """
+    payload = json.dumps(["raw", list(education_hierarchy)], separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def score_key(job_requirements: Dict[str, Any], talent_profile: Dict[str, Any], plan_digest: str) -> str:
+    """
+    Build a content-addressed cache key for one (requirements, profile) pair
+
+    Args:
+        job_requirements: Job requirements dictionary
+        talent_profile: Talent profile dictionary
+        plan_digest: Digest from plan_fingerprint
+
+    Returns:
+        Hex digest identifying the scoring inputs
+    """
+    payload = json.dumps(
+        [_normalize(job_requirements), _normalize(talent_profile), plan_digest],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def application_hash(job_app: Dict[str, Any]) -> bytes:
+    """
+    Content hash of one job application record, including its job_app_id
+
+    Unlike score_key, item order is significant, since it shows up in the
+    results.
+
+    Args:
+        job_app: Job application dictionary
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(_CANONICAL_JSON.encode(job_app).encode("utf-8"), digest_size=16).digest()
+
+
+def application_hashes(job_apps: Iterable[Dict[str, Any]]) -> List[bytes]:
+    """Content hashes of job application records in order"""
+    return [application_hash(job_app) for job_app in job_apps]
+
+
+def hashes_fingerprint(content_hashes: Iterable[bytes]) -> str:
+    """
+    Stable digest of a dataset from the content hashes of its records
+
+    Args:
+        content_hashes: Digests from application_hash in record order
+
+    Returns:
+        Hex digest identifying the dataset contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for content_hash in content_hashes:
+        digest.update(content_hash)
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(job_apps: Iterable[Dict[str, Any]]) -> str:
+    """
+    Stable digest of a whole dataset, hashed record by record
+
+    Record order is significant, since it shows up in the results.
+
+    Args:
+        job_apps: Job application dictionaries
+
+    Returns:
+        Hex digest identifying the dataset contents
+    """
+    return hashes_fingerprint(application_hash(job_app) for job_app in job_apps)
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Stable digest of a configuration dictionary"""
+    payload = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScoreCache:
+    """Bounded LRU of scoring results with an optional on-disk tier"""
+
+    def __init__(self, max_entries: int = 100000, max_bytes: int = 0, disk_path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of in-memory entries, 0 for no limit
+            max_bytes: Maximum total size of in-memory entries, 0 for no limit
+            disk_path: Optional SQLite file for the persistent tier
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["ScoreCache"]:
+        """
+        Create a cache from the "cache" configuration section
+
+        Returns:
+            ScoreCache instance, or None when caching is disabled
+        """
+        if not settings.get("enabled", False):
+            return None
+        return cls(
+            max_entries=settings.get("max_entries", 100000),
+            max_bytes=settings.get("max_bytes", 0),
+            disk_path=settings.get("disk_path") or None
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Key from score_key
+
+        Returns:
+            A fresh copy of the cached result without job_app_id, or None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(value)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM scores WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._store(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Cache a result
+
+        Args:
+            key: Key from score_key
+            result: Scoring result; job_app_id is not stored because equal
+                content may arrive under different ids
+        """
+        value = json.dumps({"total_score": result["total_score"], "scores": result["scores"]},
+                           separators=(",", ":"))
+        with self._lock:
+            self._store(key, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO scores (key, value) VALUES (?, ?)", (key, value))
+                self._pending_writes += 1
+                if self._pending_writes >= COMMIT_INTERVAL:
+                    self._db.commit()
+                    self._pending_writes = 0
+
+    def _store(self, key: str, value: str):
+        """Insert into the LRU and evict least recently used entries over budget"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def flush(self):
+        """Commit pending writes to the disk tier"""
+        with self._lock:
+            if self._db is not None and self._pending_writes:
+                self._db.commit()
+                self._pending_writes = 0
+
+    def clear(self):
+        """Drop all in-memory entries and reset counters (the disk tier is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = 0
+
+    def close(self):
+        """Flush and close the disk tier"""
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
@@ -0,0 +1,111 @@
+"""
+Compiled scoring plan for the job matching system.
+Resolves configuration lookups once per (education hierarchy, weights) pair.
+"""
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Column order of raw and weighted score matrices
+COMPONENTS = ("core_skills", "experience", "education", "certifications")
+
+# Fallback weights used when a component is missing from the weights
+DEFAULT_WEIGHTS = {
+    "core_skills": 0.5,
+    "experience": 0.2,
+    "education": 0.15,
+    "certifications": 0.15
+}
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Immutable, precomputed inputs for scoring job applications"""
+    education_hierarchy: Tuple[str, ...]
+    education_rank: Mapping[str, int]
+    education_scores: Tuple[Tuple[float, ...], ...]
+    core_skills_weight: float
+    experience_weight: float
+    education_weight: float
+    certifications_weight: float
+
+    def __reduce__(self):
+        # Rebuild from hashable inputs so plans can be sent to worker processes
+        return (_compile, (self.education_hierarchy, self.weight_vector))
+
+    @property
+    def weight_vector(self) -> Tuple[float, float, float, float]:
+        """Resolved weights in COMPONENTS order"""
+        return (self.core_skills_weight, self.experience_weight,
+                self.education_weight, self.certifications_weight)
+
+    def score_education_levels(self, required_education: str, candidate_education: str) -> float:
+        """
+        Look up the raw education score for a pair of education levels
+
+        Args:
+            required_education: Required education level
+            candidate_education: Candidate education level
+
+        Returns:
+            Raw education score, 0 if either level is missing or unknown
+        """
+        required_level = self.education_rank.get(required_education)
+        candidate_level = self.education_rank.get(candidate_education)
+        if required_level is None or candidate_level is None:
+            return 0
+        return self.education_scores[required_level][candidate_level]
+
+
+def compile_scoring_plan(education_hierarchy: List[str], weights: Dict[str, float]) -> ScoringPlan:
+    """
+    Compile a scoring plan, reusing a cached plan for identical inputs
+
+    Args:
+        education_hierarchy: Education levels from highest to lowest
+        weights: Dictionary of component weights
+
+    Returns:
+        ScoringPlan instance
+    """
+    resolved = tuple(weights.get(name, DEFAULT_WEIGHTS[name]) for name in COMPONENTS)
+    return _compile(tuple(education_hierarchy), resolved)
+
+
+@lru_cache(maxsize=64)
+def _compile(education_hierarchy: Tuple[str, ...], weights: Tuple[float, ...]) -> ScoringPlan:
+    """Build a ScoringPlan from hashable inputs"""
+    # list.index semantics: the first occurrence of a level wins
+    education_rank: Dict[str, int] = {}
+    for rank, level in enumerate(education_hierarchy):
+        education_rank.setdefault(level, rank)
+
+    # Lower index means higher level in hierarchy
+    max_distance = len(education_hierarchy) - 1
+    education_scores = []
+    for required_level in range(len(education_hierarchy)):
+        row = []
+        for candidate_level in range(len(education_hierarchy)):
+            if candidate_level <= required_level:  # Meets or exceeds
+                row.append(100)
+            else:
+                # Partial score based on distance in hierarchy
+                actual_distance = candidate_level - required_level
+                row.append(max(0, 100 - (actual_distance / max_distance) * 100))
+        education_scores.append(tuple(row))
+
+    logger.debug(f"Compiled scoring plan for {len(education_hierarchy)} education levels and weights {weights}")
+
+    return ScoringPlan(
+        education_hierarchy=education_hierarchy,
+        education_rank=MappingProxyType(education_rank),
+        education_scores=tuple(education_scores),
+        core_skills_weight=weights[0],
+        experience_weight=weights[1],
+        education_weight=weights[2],
+        certifications_weight=weights[3]
+    )
@@ -3,30 +3,105 @@ Scoring service for the job matching system.
 Handles calculating scores for job applications.
 """
 import logging
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
 
 from modules.config_manager import ConfigManager
+from modules.batch_engine import ApplicationColumns, BatchScoringEngine, RawScores, build_results
+from modules.columnar_dataset import ColumnarDataset
+from modules.cross_matching import CrossMatcher, CrossMatchResult
+from modules.delta_ingestion import DatasetVersion, DeltaReport, apply_delta
+from modules.gap_analytics import GapReport, compute_gap_report
+from modules.parallel_scoring import compute_raw_scores
+from modules.ranking import TopKCollector
+from modules.results import ScoreResults
+from modules.score_cache import ScoreCache, application_hashes, plan_fingerprint, raw_scores_fingerprint, score_key
+from modules.skill_index import SkillIndex
+from modules.scoring_plan import ScoringPlan, compile_scoring_plan
+from modules.vocabulary import ITEM_FIELDS, Vocabulary, count_matches
 
 logger = logging.getLogger(__name__)
 
 class ScoringService:
     """Service for scoring candidate matches"""
     
-    def __init__(self, config_manager: ConfigManager, custom_weights: Dict[str, float] = None):
+    ENGINES = ("python", "numpy")
+    
+    def __init__(self, config_manager: ConfigManager, custom_weights: Dict[str, float] = None,
+                 engine: str = None, score_cache: ScoreCache = None):
         """
         Initialize with configuration manager and optional custom weights
         
         Args:
             config_manager: ConfigManager instance
             custom_weights: Optional dictionary of custom weights
+            engine: Batch engine to use ("python" or "numpy"), defaults to the configured engine
+            score_cache: Optional ScoreCache memoizing results by input content
         """
         self.config = config_manager
-        self.weights = custom_weights or self.config.get_weights()
+        self.score_cache = score_cache
+        self.weights = custom_weights or None
+        self.engine = engine or self.config.get_batch_settings().get("engine", "python")
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown scoring engine '{self.engine}', expected one of {self.ENGINES}")
+    
+    @property
+    def weights(self) -> Mapping[str, float]:
+        """
+        Scoring weights; assigning new weights recompiles the scoring plan
+        
+        Without custom weights, these are the read-only weights of the
+        current configuration version.
+        """
+        return self._weights if self._weights is not None else self.config.get_weights()
+    
+    @weights.setter
+    def weights(self, weights: Dict[str, float]):
+        self._weights = weights
+        self._plan = None
+        self._plan_digest = None
+    
+    @property
+    def plan(self) -> ScoringPlan:
+        """Compiled scoring plan for the current education hierarchy and weights"""
+        # A reloaded configuration may change the education hierarchy or the default weights
+        if self._plan is None or self._plan_version != self.config.version:
+            self._plan_version = self.config.version
+            self._plan = compile_scoring_plan(self.config.get_education_hierarchy(), self.weights)
+            self._plan_digest = None
+        return self._plan
+    
+    @property
+    def raw_scores_version(self) -> str:
+        """
+        Digest of the configuration the raw scores depend on
+        
+        Stored raw scores with this version can be reused and re-weighted,
+        whatever the weights or other settings were when they were stored.
+        """
+        return raw_scores_fingerprint(self.plan.education_hierarchy)
+    
+    def _memo_key(self, job_app: Dict[str, Any]) -> Optional[str]:
+        """Content hash of a job application and the current plan, None if not memoizable"""
+        if self.score_cache is None:
+            return None
+        # Bitsets are only meaningful together with their vocabulary
+        if any(isinstance(job_app.get(section, {}).get(field), int) for section, field in ITEM_FIELDS):
+            return None
+        # The plan is checked first, a new configuration version resets the digest
+        plan = self.plan
+        if self._plan_digest is None:
+            self._plan_digest = plan_fingerprint(plan)
+        return score_key(job_app.get("job_requirements", {}), job_app.get("talent_profile", {}), self._plan_digest)
     
     def score_core_skills(self, job_requirements: Dict[str, Any], talent_profile: Dict[str, Any]) -> Dict[str, float]:
         """
         Calculate core skills score
         
+        Skill fields may be lists or bitsets encoded with a shared Vocabulary.
+        
         Args:
             job_requirements: Job requirements dictionary
             talent_profile: Talent profile dictionary
@@ -41,11 +116,11 @@ class ScoringService:
             return {"raw_score": 0, "weighted_score": 0}
         
         # Find matching skills
-        matching_skills = [skill for skill in required_skills if skill in candidate_skills]
+        matching_count, required_count = count_matches(required_skills, candidate_skills)
         
         # Calculate percentage match
-        match_percentage = (len(matching_skills) / len(required_skills)) * 100
-        weighted_score = match_percentage * self.weights.get("core_skills", 0.5)
+        match_percentage = (matching_count / required_count) * 100
+        weighted_score = match_percentage * self.plan.core_skills_weight
         
         return {
             "raw_score": match_percentage,
@@ -74,7 +149,7 @@ class ScoringService:
         
         return {
             "raw_score": raw_score,
-            "weighted_score": raw_score * self.weights.get("experience", 0.2)
+            "weighted_score": raw_score * self.plan.experience_weight
         }
     
     def score_education(self, job_requirements: Dict[str, Any], talent_profile: Dict[str, Any]) -> Dict[str, float]:
@@ -88,38 +163,27 @@ class ScoringService:
         Returns:
             Dictionary with raw_score and weighted_score
         """
-        education_hierarchy = self.config.get_education_hierarchy()
+        plan = self.plan
         required_education = job_requirements.get("education", "")
         candidate_education = talent_profile.get("education", "")
         
         if not required_education or not candidate_education:
             return {"raw_score": 0, "weighted_score": 0}
         
-        try:
-            required_level = education_hierarchy.index(required_education)
-            candidate_level = education_hierarchy.index(candidate_education)
-            
-            # Lower index means higher level in hierarchy
-            if candidate_level <= required_level:  # Meets or exceeds
-                raw_score = 100
-            else:
-                # Calculate partial score based on distance in hierarchy
-                max_distance = len(education_hierarchy) - 1
-                actual_distance = candidate_level - required_level
-                raw_score = max(0, 100 - (actual_distance / max_distance) * 100)
-                
-        except ValueError:
-            raw_score = 0
+        # Precomputed score for the (required, candidate) pair, 0 for unknown levels
+        raw_score = plan.score_education_levels(required_education, candidate_education)
         
         return {
             "raw_score": raw_score,
-            "weighted_score": raw_score * self.weights.get("education", 0.15)
+            "weighted_score": raw_score * plan.education_weight
         }
     
     def score_certifications(self, job_requirements: Dict[str, Any], talent_profile: Dict[str, Any]) -> Dict[str, float]:
         """
         Calculate certifications score
         
+        Certification fields may be lists or bitsets encoded with a shared Vocabulary.
+        
         Args:
             job_requirements: Job requirements dictionary
             talent_profile: Talent profile dictionary
@@ -131,29 +195,37 @@ class ScoringService:
         candidate_certs = talent_profile.get("certifications", [])
         
         if not required_certs:
-            return {"raw_score": 100, "weighted_score": 100 * self.weights.get("certifications", 0.15)}
+            return {"raw_score": 100, "weighted_score": 100 * self.plan.certifications_weight}
         
         # Find matching certifications
-        matching_certs = [cert for cert in required_certs if cert in candidate_certs]
+        matching_count, required_count = count_matches(required_certs, candidate_certs)
         
         # Calculate percentage match
-        match_percentage = (len(matching_certs) / len(required_certs)) * 100
+        match_percentage = (matching_count / required_count) * 100
         
         return {
             "raw_score": match_percentage,
-            "weighted_score": match_percentage * self.weights.get("certifications", 0.15)
+            "weighted_score": match_percentage * self.plan.certifications_weight
         }
     
-    def score_job_application(self, job_app: Dict[str, Any]) -> Dict[str, Any]:
+    def score_job_application(self, job_app: Dict[str, Any], flush: bool = True) -> Dict[str, Any]:
         """
         Score a job application
         
         Args:
             job_app: Job application dictionary
+            flush: Commit a newly cached result to the score cache's disk tier
+                right away; batch callers pass False and flush once at the end
             
         Returns:
             Dictionary with scoring results
         """
+        memo_key = self._memo_key(job_app)
+        if memo_key is not None:
+            cached = self.score_cache.get(memo_key)
+            if cached is not None:
+                return {"job_app_id": job_app.get("job_app_id"), **cached}
+        
         job_requirements = job_app.get("job_requirements", {})
         talent_profile = job_app.get("talent_profile", {})
         
@@ -175,7 +247,7 @@ class ScoringService:
             logger.error(f"Error calculating total score: {str(e)}")
             total_weighted_score = 0
         
-        return {
+        result = {
             "job_app_id": job_app.get("job_app_id"),
             "total_score": round(total_weighted_score, 2),
             "scores": {
@@ -185,15 +257,329 @@ class ScoringService:
                 "certifications": certifications_score
             }
         }
+        
+        if memo_key is not None:
+            self.score_cache.put(memo_key, result)
+            if flush:
+                self.score_cache.flush()
+        
+        return result
+    
+    def encode_applications(self, job_apps: List[Dict[str, Any]]) -> Tuple[Vocabulary, List[Dict[str, Any]]]:
+        """
+        Intern all skills and certifications once and encode applications as bitsets
+        
+        Args:
+            job_apps: List of job application dictionaries
+            
+        Returns:
+            Tuple of (vocabulary, encoded job applications)
+        """
+        vocabulary = Vocabulary.from_job_apps(job_apps)
+        return vocabulary, [vocabulary.encode_job_app(job_app) for job_app in job_apps]
+    
+    def compute_raw_scores(self, job_apps: List[Dict[str, Any]], vocabulary: Vocabulary = None,
+                           parallel: bool = None) -> RawScores:
+        """
+        Compute the weight-independent raw component scores for a dataset
+        
+        The result can be cached per dataset and re-weighted with apply_weights
+        whenever only the weights change.
+        
+        Args:
+            job_apps: List of job application dictionaries
+            vocabulary: Vocabulary used to encode bitset fields, if any
+            parallel: Optional override of the batch.parallel setting
+            
+        Returns:
+            RawScores instance
+        """
+        batch_settings = dict(self.config.get_batch_settings())
+        if parallel is not None:
+            batch_settings["parallel"] = parallel
+        batch_engine = BatchScoringEngine(self.plan)
+        columns = batch_engine.load(job_apps, vocabulary)
+        raw = compute_raw_scores(batch_engine, columns, batch_settings)
+        return RawScores(columns.job_app_ids, raw, self.plan.education_hierarchy,
+                         batch_engine.compute_int_scores(columns, raw))
+    
+    def compute_dataset_raw_scores(self, dataset: ColumnarDataset, parallel: bool = None) -> RawScores:
+        """
+        Compute raw component scores for a memory-mapped columnar dataset
+        
+        The dataset arrays are scored in place; no JSON is parsed.
+        
+        Args:
+            dataset: Opened ColumnarDataset
+            parallel: Optional override of the batch.parallel setting
+            
+        Returns:
+            RawScores instance
+        """
+        batch_settings = dict(self.config.get_batch_settings())
+        if parallel is not None:
+            batch_settings["parallel"] = parallel
+        batch_engine = BatchScoringEngine(self.plan)
+        columns = dataset.to_columns(self.plan)
+        raw = compute_raw_scores(batch_engine, columns, batch_settings)
+        return RawScores(columns.job_app_ids, raw, self.plan.education_hierarchy,
+                         batch_engine.compute_int_scores(columns, raw))
+    
+    def compute_delta_raw_scores(self, job_apps: List[Dict[str, Any]], previous: DatasetVersion,
+                                 content_hashes: List[bytes] = None,
+                                 parallel: bool = None) -> Tuple[RawScores, DeltaReport]:
+        """
+        Compute raw component scores for a new version of a dataset, scoring
+        only applications that were added or changed since the previous version
+        
+        Args:
+            job_apps: List of job application dictionaries
+            previous: Previous version, e.g. from ResultsStore.load_dataset_version
+            content_hashes: Content hashes of job_apps, computed if omitted
+            parallel: Optional override of the batch.parallel setting
+            
+        Returns:
+            Tuple of (RawScores equal to compute_raw_scores(job_apps), DeltaReport)
+        """
+        if content_hashes is None:
+            content_hashes = application_hashes(job_apps)
+        return apply_delta(
+            previous, job_apps, content_hashes,
+            lambda delta: self.compute_raw_scores(delta, parallel=parallel),
+            self.plan.education_hierarchy
+        )
+    
+    def analyze_gaps(self, job_apps: List[Dict[str, Any]], raw_scores: RawScores = None,
+                     minimum_score: float = None, vocabulary: Vocabulary = None) -> GapReport:
+        """
+        Compute missing skill and certification aggregates for a dataset
+        
+        Args:
+            job_apps: List of job application dictionaries
+            raw_scores: Optional RawScores of job_apps from compute_raw_scores
+            minimum_score: Minimum total score, defaults to thresholds.minimum_match_score
+            vocabulary: Vocabulary used to encode bitset fields, if any
+            
+        Returns:
+            GapReport instance
+        """
+        batch_engine = BatchScoringEngine(self.plan)
+        columns = batch_engine.load(job_apps, vocabulary)
+        return self._gap_report(batch_engine, columns, raw_scores, minimum_score)
+    
+    def analyze_dataset_gaps(self, dataset: ColumnarDataset, raw_scores: RawScores = None,
+                             minimum_score: float = None) -> GapReport:
+        """
+        Compute missing skill and certification aggregates for a columnar dataset
+        
+        Args:
+            dataset: Opened ColumnarDataset
+            raw_scores: Optional RawScores of the dataset from compute_dataset_raw_scores
+            minimum_score: Minimum total score, defaults to thresholds.minimum_match_score
+            
+        Returns:
+            GapReport instance
+        """
+        return self._gap_report(BatchScoringEngine(self.plan), dataset.to_columns(self.plan), raw_scores,
+                                minimum_score)
+    
+    def _gap_report(self, batch_engine: BatchScoringEngine, columns: ApplicationColumns,
+                    raw_scores: Optional[RawScores], minimum_score: Optional[float]) -> GapReport:
+        if minimum_score is None:
+            minimum_score = self.config.get_thresholds().get("minimum_match_score", 0)
+        if raw_scores is None:
+            raw = batch_engine.compute_raw_scores(columns)
+        elif raw_scores.education_hierarchy != self.plan.education_hierarchy or len(raw_scores) != len(columns):
+            raise ValueError("Raw scores were computed for a different dataset or education hierarchy")
+        else:
+            raw = raw_scores.raw
+        return compute_gap_report(columns, raw, self.plan, minimum_score)
+    
+    def score_dataset(self, dataset: ColumnarDataset, parallel: bool = None,
+                      compact: bool = False) -> Union[List[Dict[str, Any]], ScoreResults]:
+        """
+        Score every application of a columnar dataset
+        
+        Args:
+            dataset: Opened ColumnarDataset
+            parallel: Optional override of the batch.parallel setting
+            compact: Return a ScoreResults block instead of result dictionaries
+            
+        Returns:
+            Scoring results in dataset order
+        """
+        return self.apply_weights(self.compute_dataset_raw_scores(dataset, parallel), compact)
+    
+    def apply_weights(self, raw_scores: RawScores, compact: bool = False) -> Union[List[Dict[str, Any]], ScoreResults]:
+        """
+        Build scoring results from cached raw scores using the current weights
+        
+        Args:
+            raw_scores: RawScores computed by compute_raw_scores
+            compact: Return a ScoreResults block instead of result dictionaries
+            
+        Returns:
+            Scoring results in dataset order
+        """
+        if raw_scores.education_hierarchy != self.plan.education_hierarchy:
+            raise ValueError("Raw scores were computed with a different education hierarchy")
+        weighted, totals = BatchScoringEngine(self.plan).compute_weighted_scores(raw_scores.raw)
+        if compact:
+            return ScoreResults.from_arrays(raw_scores.job_app_ids, raw_scores.raw, weighted, totals)
+        return build_results(raw_scores.job_app_ids, raw_scores.raw, weighted, totals,
+                             raw_scores.int_scores, self.plan.weight_vector)
     
-    def score_all_applications(self, job_apps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def score_all_applications(self, job_apps: List[Dict[str, Any]], engine: str = None,
+                               vocabulary: Vocabulary = None, parallel: bool = None,
+                               compact: bool = False) -> Union[List[Dict[str, Any]], ScoreResults]:
         """
         Score all job applications
         
         Args:
             job_apps: List of job application dictionaries
+            engine: Optional engine override ("python" or "numpy")
+            vocabulary: Vocabulary used to encode bitset fields, if any
+            parallel: Optional override of the batch.parallel setting (numpy engine only)
+            compact: Return a ScoreResults block instead of result dictionaries
+            
+        Returns:
+            Scoring results in input order
+        """
+        engine = engine or self.engine
+        if engine == "numpy":
+            if self.score_cache is not None and vocabulary is None:
+                results = self._score_all_memoized(job_apps, parallel)
+            else:
+                return self.apply_weights(self.compute_raw_scores(job_apps, vocabulary, parallel), compact)
+        else:
+            results = [self.score_job_application(job_app, flush=False) for job_app in job_apps]
+            if self.score_cache is not None:
+                self.score_cache.flush()
+        return ScoreResults.from_results(results) if compact else results
+    
+    def _score_all_memoized(self, job_apps: List[Dict[str, Any]], parallel: bool = None) -> List[Dict[str, Any]]:
+        """
+        Score applications on the numpy engine, taking cached results where
+        available and batch scoring only the misses
+        """
+        keys = [self._memo_key(job_app) for job_app in job_apps]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job_apps)
+        misses = []
+        for position, (job_app, key) in enumerate(zip(job_apps, keys)):
+            cached = self.score_cache.get(key) if key is not None else None
+            if cached is not None:
+                results[position] = {"job_app_id": job_app.get("job_app_id"), **cached}
+            else:
+                misses.append(position)
+        
+        if misses:
+            scored = self.apply_weights(self.compute_raw_scores([job_apps[i] for i in misses], parallel=parallel))
+            for position, result in zip(misses, scored):
+                results[position] = result
+                if keys[position] is not None:
+                    self.score_cache.put(keys[position], result)
+            self.score_cache.flush()
+        
+        logger.info(f"Score cache: {len(job_apps) - len(misses)} hits, {len(misses)} misses")
+        return results
+    
+    def rank_top_k(self, job_apps: Iterable[Dict[str, Any]], k: int, chunk_size: int = None,
+                   engine: str = None, vocabulary: Vocabulary = None) -> List[Dict[str, Any]]:
+        """
+        Score a stream of job applications and keep only the K best results
+        
+        Applications are consumed in chunks, so memory is bounded by K plus one
+        chunk regardless of the stream length. Result dictionaries are only
+        built for applications that can enter the top K.
+        
+        Args:
+            job_apps: Iterable of job application dictionaries
+            k: Number of results to keep
+            chunk_size: Applications scored per chunk, defaults to batch.chunk_size
+            engine: Optional engine override ("python" or "numpy")
+            vocabulary: Vocabulary used to encode bitset fields, if any
+            
+        Returns:
+            Up to K scoring results ordered by total score descending, ties in input order
+        """
+        engine = engine or self.engine
+        chunk_size = chunk_size or self.config.get_batch_settings().get("chunk_size", 50000)
+        collector = TopKCollector(k)
+        if not collector.k:
+            return []
+        
+        batch_engine = BatchScoringEngine(self.plan)
+        iterator = iter(job_apps)
+        sequence = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            if engine == "numpy":
+                columns = batch_engine.load(chunk, vocabulary)
+                raw, weighted, totals = batch_engine.compute_scores(columns)
+                
+                # Only rows that can beat the current K-th score are candidates
+                candidates = np.arange(len(chunk))
+                if collector.threshold is not None:
+                    candidates = candidates[totals >= collector.threshold]
+                if len(candidates) > collector.k:
+                    # Keep every row tied with the K-th best so ties resolve by input order
+                    kth_score = np.partition(totals[candidates], len(candidates) - collector.k)[len(candidates) - collector.k]
+                    candidates = candidates[totals[candidates] >= kth_score]
+                
+                ids = [columns.job_app_ids[i] for i in candidates.tolist()]
+                int_scores = batch_engine.compute_int_scores(columns, raw)[candidates]
+                chunk_results = build_results(ids, raw[candidates], weighted[candidates], totals[candidates],
+                                              int_scores, self.plan.weight_vector)
+                for i, result in zip(candidates.tolist(), chunk_results):
+                    collector.offer(result["total_score"], sequence + i, result)
+            else:
+                for i, job_app in enumerate(chunk):
+                    result = self.score_job_application(job_app, flush=False)
+                    collector.offer(result["total_score"], sequence + i, result)
+            
+            sequence += len(chunk)
+        
+        if self.score_cache is not None:
+            self.score_cache.flush()
+        
+        logger.info(f"Ranked {sequence} applications, kept top {len(collector)}")
+        return collector.results()
+    
+    def cross_match(self, jobs: List[Dict[str, Any]], talents: List[Dict[str, Any]],
+                    top_k: int = None, vocabulary: Vocabulary = None) -> CrossMatchResult:
+        """
+        Score every talent in a pool against every job in a pool
+        
+        Args:
+            jobs: Job requirement dictionaries, optionally with a "job_id"
+            talents: Talent profile dictionaries, optionally with a "talent_id"
+            top_k: Keep only the K best talents per job instead of the dense matrix
+            vocabulary: Vocabulary used to encode bitset fields, if any
+            
+        Returns:
+            CrossMatchResult with a (jobs x talents) or (jobs x K) score matrix
+        """
+        block_cells = self.config.get_batch_settings().get("cross_match_block_cells", 4000000)
+        return CrossMatcher(self.plan).match(jobs, talents, top_k, block_cells, vocabulary)
+    
+    def search_skill_index(self, index: SkillIndex, job_requirements: Dict[str, Any],
+                           minimum_score: float = None, top_k: int = None) -> List[Dict[str, Any]]:
+        """
+        Match one job against an indexed talent pool, skipping talents that
+        cannot reach the minimum match score
+        
+        Args:
+            index: SkillIndex built with SkillIndex.build or loaded from disk
+            job_requirements: Job requirements dictionary
+            minimum_score: Minimum total score, defaults to thresholds.minimum_match_score
+            top_k: Optional maximum number of results
             
         Returns:
-            List of scoring result dictionaries
+            Result dictionaries with talent_id, total_score and scores, best first
         """
-        return [self.score_job_application(job_app) for job_app in job_apps]
\ No newline at end of file
+        if minimum_score is None:
+            minimum_score = self.config.get_thresholds().get("minimum_match_score", 0)
+        return index.search(job_requirements, self.plan, minimum_score, top_k)
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""
+Inverted skill index for the job matching system.
+Maps skill and certification ids to talents so a job can be matched
+against a large talent pool without scoring every profile.
+"""
+import json
+import logging
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from modules.batch_engine import round_scores
+from modules.cross_matching import Incidence
+from modules.scoring_plan import ScoringPlan
+from modules.vocabulary import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+def _overlap_scores(rows: np.ndarray, overlap_rows: np.ndarray, overlap_counts: np.ndarray,
+                    n_required: int, empty_score: float) -> np.ndarray:
+    """
+    Raw overlap scores of talent rows
+
+    Args:
+        rows: Talent rows to score
+        overlap_rows: Sorted talent rows with any overlap, from SkillIndex._overlap
+        overlap_counts: Overlap counts of overlap_rows
+        n_required: Number of required items
+        empty_score: Score of every talent when nothing is required
+
+    Returns:
+        Percentage of required items each talent has, aligned with rows
+    """
+    if not n_required:
+        return np.full(len(rows), empty_score)
+    counts = np.zeros(len(rows))
+    if len(overlap_rows):
+        positions = np.minimum(np.searchsorted(overlap_rows, rows), len(overlap_rows) - 1)
+        hits = overlap_rows[positions] == rows
+        counts[hits] = overlap_counts[positions[hits]]
+    return (counts / n_required) * 100
+
+
+class SkillIndex:
+    """Inverted index from skill and certification ids to talents"""
+
+    def __init__(self, vocabulary: Vocabulary, talent_ids: List[Any], skills: Incidence,
+                 certifications: Incidence, experience: np.ndarray, education: np.ndarray):
+        """
+        Initialize from prebuilt parts
+
+        Args:
+            vocabulary: Vocabulary shared by skills and certifications
+            talent_ids: Talent ids in row order
+            skills: Item-to-talents incidence of skills
+            certifications: Item-to-talents incidence of certifications
+            experience: Talent experience in years
+            education: Talent education level strings ("" when missing)
+        """
+        self.vocabulary = vocabulary
+        self.talent_ids = talent_ids
+        self.skills = skills
+        self.certifications = certifications
+        self.experience = experience
+        self.education = education
+        # Pool-wide maxima bound the experience and education scores in search()
+        self._max_experience = float(np.max(experience, initial=0.0, where=~np.isnan(experience)))
+        self._education_levels = np.unique(education).tolist()
+
+    def __len__(self) -> int:
+        return len(self.talent_ids)
+
+    @classmethod
+    def build(cls, talents: List[Dict[str, Any]], vocabulary: Vocabulary = None) -> "SkillIndex":
+        """
+        Build an index from talent profiles
+
+        Args:
+            talents: Talent profile dictionaries, optionally with a "talent_id"
+            vocabulary: Vocabulary used to encode bitset fields, if any
+
+        Returns:
+            SkillIndex instance
+        """
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        skills = Incidence.from_lists([talent.get("skills", []) for talent in talents], vocabulary, unique=True)
+        certifications = Incidence.from_lists([talent.get("certifications", []) for talent in talents],
+                                              vocabulary, unique=True)
+        for incidence in (skills, certifications):
+            incidence.n_items = len(vocabulary)
+
+        index = cls(
+            vocabulary=vocabulary,
+            talent_ids=[talent.get("talent_id", position) for position, talent in enumerate(talents)],
+            skills=skills.transpose(),
+            certifications=certifications.transpose(),
+            experience=np.array([talent.get("experience", 0) for talent in talents], dtype=np.float64),
+            education=np.array([talent.get("education") or "" for talent in talents], dtype=str)
+        )
+        logger.info(f"Built skill index over {len(talents)} talents and {len(vocabulary)} items")
+        return index
+
+    def save(self, file_path: str):
+        """
+        Save the index in .npz format
+
+        The file is written to file_path as given; np.savez would append
+        ".npz" to a bare path, which load() could then not find.
+
+        Args:
+            file_path: Path to save the index
+        """
+        # numpy scalar ids (e.g. from a DataFrame column) are not JSON serializable
+        talent_ids = [talent_id.item() if isinstance(talent_id, np.generic) else talent_id
+                      for talent_id in self.talent_ids]
+        with open(file_path, "wb") as f:
+            np.savez(
+                f,
+                vocabulary=np.array(self.vocabulary.items, dtype=str),
+                talent_ids=np.array(json.dumps(talent_ids)),
+                skill_ptr=self.skills.ptr,
+                skill_talents=self.skills.ids,
+                cert_ptr=self.certifications.ptr,
+                cert_talents=self.certifications.ids,
+                experience=self.experience,
+                education=self.education
+            )
+        logger.info(f"Skill index saved to {file_path}")
+
+    @classmethod
+    def load(cls, file_path: str) -> "SkillIndex":
+        """
+        Load an index saved with save()
+
+        Args:
+            file_path: Path of the .npz file
+
+        Returns:
+            SkillIndex instance
+        """
+        with np.load(file_path, allow_pickle=False) as data:
+            vocabulary = Vocabulary(data["vocabulary"].tolist())
+            talent_ids = json.loads(str(data["talent_ids"]))
+            n_talents = len(talent_ids)
+            index = cls(
+                vocabulary=vocabulary,
+                talent_ids=talent_ids,
+                skills=Incidence(data["skill_ptr"], data["skill_talents"], n_talents),
+                certifications=Incidence(data["cert_ptr"], data["cert_talents"], n_talents),
+                experience=data["experience"],
+                education=data["education"]
+            )
+        logger.info(f"Skill index loaded from {file_path}")
+        return index
+
+    def _overlap(self, incidence: Incidence, items: Any) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Count required items per talent using the inverted lists
+
+        Returns:
+            Tuple of (sorted talent rows with any overlap, overlap counts, required count)
+        """
+        if isinstance(items, int):
+            item_ids = self.vocabulary.to_ids(items)
+        else:
+            item_ids = [self.vocabulary.ids.get(item, -1) for item in items]
+        known = np.array([item_id for item_id in item_ids if 0 <= item_id < incidence.n_rows], dtype=np.int64)
+        if len(known) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), len(item_ids)
+
+        # Duplicated requirements gather their talent list once per occurrence
+        gathered = np.concatenate([incidence.ids[incidence.ptr[i]:incidence.ptr[i + 1]] for i in known.tolist()])
+        rows, counts = np.unique(gathered, return_counts=True)
+        return rows, counts.astype(np.float64), len(item_ids)
+
+    def search(self, job_requirements: Dict[str, Any], plan: ScoringPlan,
+               minimum_score: float = 0, top_k: int = None) -> List[Dict[str, Any]]:
+        """
+        Find talents whose total score reaches a minimum for one job
+
+        Every talent gets an upper bound on total_score from its skill and
+        certification overlap plus the best experience and education scores
+        in the pool. Only talents whose bound reaches the minimum are fully
+        scored. Talents without overlap share one bound, so unless that bound
+        reaches the minimum, a search only touches the talents in the inverted
+        lists.
+
+        A job without required certifications gives every talent the full
+        certification score. With the shipped weights, a pool holding a talent
+        with enough experience and the required education then bounds talents
+        without overlap at 50, so such jobs scan every talent unless the
+        minimum is above 50.
+
+        Args:
+            job_requirements: Job requirements dictionary
+            plan: Compiled scoring plan
+            minimum_score: Minimum total score to include
+            top_k: Optional maximum number of results
+
+        Returns:
+            Result dictionaries with talent_id, total_score and scores, best first
+        """
+        n_talents = len(self)
+        weights = plan.weight_vector
+
+        skill_rows, skill_counts, n_skills = self._overlap(self.skills, job_requirements.get("core_skills", []))
+        cert_rows, cert_counts, n_certs = self._overlap(self.certifications, job_requirements.get("certifications", []))
+
+        # Best experience and education scores in the pool
+        min_experience = job_requirements.get("min_experience", 0)
+        required_education = job_requirements.get("education", "")
+        experience_bound = min(self._max_experience / min_experience * 100, 100) if min_experience > 0 else 100.0
+        education_bound = max([
+            plan.score_education_levels(required_education, level) if required_education and level else 0
+            for level in self._education_levels
+        ], default=0)
+        headroom = weights[1] * experience_bound + weights[2] * education_bound
+
+        # Bound for talents that overlap on nothing decides whether a scan is needed
+        no_overlap_bound = (0.0 if n_certs else weights[3] * 100) + headroom
+        # Rounding to 2 decimals can lift a total by at most 0.005
+        cutoff = minimum_score - 0.01
+        if no_overlap_bound >= cutoff:
+            logger.info(f"Skill index scans all {n_talents} talents: talents without overlap "
+                        f"may score up to {no_overlap_bound:.2f}, minimum is {minimum_score}")
+            candidates = np.arange(n_talents)
+            core = _overlap_scores(candidates, skill_rows, skill_counts, n_skills, 0.0)
+            cert = _overlap_scores(candidates, cert_rows, cert_counts, n_certs, 100.0)
+        else:
+            touched = np.union1d(skill_rows, cert_rows)
+            core = _overlap_scores(touched, skill_rows, skill_counts, n_skills, 0.0)
+            cert = _overlap_scores(touched, cert_rows, cert_counts, n_certs, 100.0)
+            keep = weights[0] * core + weights[3] * cert + headroom >= cutoff
+            candidates, core, cert = touched[keep], core[keep], cert[keep]
+            logger.info(f"Skill index pruned {n_talents} talents to {len(candidates)} candidates")
+
+        # Fully score the remaining candidates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if min_experience == 0:
+                experience = np.full(len(candidates), 100.0)
+            else:
+                experience = np.minimum((self.experience[candidates] / min_experience) * 100, 100)
+        education = self._education_scores(required_education, candidates, plan)
+
+        raw = np.column_stack([core, experience, education, cert])
+        weighted = raw * np.asarray(weights)
+        totals = round_scores(weighted[:, 0] + weighted[:, 2] + weighted[:, 1] + weighted[:, 3])
+
+        keep = np.flatnonzero(totals >= minimum_score)
+        order = keep[np.lexsort((candidates[keep], -totals[keep]))]
+        if top_k:
+            order = order[:top_k]
+
+        results = []
+        for row in order.tolist():
+            results.append({
+                "talent_id": self.talent_ids[candidates[row]],
+                "total_score": totals[row],
+                "scores": {
+                    "core_skills": {"raw_score": raw[row, 0], "weighted_score": weighted[row, 0]},
+                    "education": {"raw_score": raw[row, 2], "weighted_score": weighted[row, 2]},
+                    "experience": {"raw_score": raw[row, 1], "weighted_score": weighted[row, 1]},
+                    "certifications": {"raw_score": raw[row, 3], "weighted_score": weighted[row, 3]}
+                }
+            })
+        return results
+
+    def _education_scores(self, required_education: str, candidates: np.ndarray, plan: ScoringPlan) -> np.ndarray:
+        """Education raw scores of candidate talents for one required level"""
+        levels, inverse = np.unique(self.education[candidates], return_inverse=True)
+        level_scores = np.array([
+            plan.score_education_levels(required_education, level) if required_education and level else 0
+            for level in levels.tolist()
+        ], dtype=np.float64)
+        return level_scores[inverse] if len(candidates) else np.empty(0)
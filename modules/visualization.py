@@ -2,11 +2,42 @@
 Visualization module for the job matching system.
 Handles creating charts and visualizations for job matching data.
 """
-import json
 import pandas as pd
 import numpy as np
 import streamlit as st
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from modules.delta_ingestion import DeltaReport
+from modules.gap_analytics import GapReport
+from modules.job_index import JobAppIndex
+from modules.ranking import select_top_k
+from modules.results import SCORE_FIELDS, ScoreResults
+from modules.results_store import ResultsStore
+from utils.helpers import format_percentage, gzip_chunks, iter_results_csv, iter_results_json
+
+# Results DataFrame columns and the score field each one shows
+RESULT_COLUMNS = {
+    "Total Score": "total_score",
+    "Core Skills": "core_skills_raw",
+    "Experience": "experience_raw",
+    "Education": "education_raw",
+    "Certifications": "certifications_raw"
+}
+COMPONENT_COLUMNS = ["Core Skills", "Experience", "Education", "Certifications"]
+
+# Numeric table column displayed as a percentage with 2 decimal places
+PERCENT_COLUMN = st.column_config.NumberColumn(format="%.2f%%")
+
+# Chart defaults used when the configuration has no "charts" section
+DEFAULT_LARGE_DATA_ROWS = 2000
+DEFAULT_HISTOGRAM_BINS = 20
+DEFAULT_TOP_N = 25
+
+# Score columns of the downloadable results
+EXPORT_SCORE_COLUMNS = ["total_score"]
+
+# Rows per page of stored results when the configuration sets no page size
+DEFAULT_PAGE_SIZE = 50
 
 class Visualizer:
     """Handles visualization of job matching data"""
@@ -17,30 +48,26 @@ class Visualizer:
         Create a DataFrame from scoring results
         
         Args:
-            results: List of scoring result dictionaries
+            results: List of scoring result dictionaries or ScoreResults
             
         Returns:
-            Pandas DataFrame with formatted results
-        """
-        # Convert to dataframe for display
-        results_df = pd.DataFrame([
-            {
-                "Job App ID": r["job_app_id"],
-                "Total Score": r["total_score"],
-                "Core Skills": r["scores"]["core_skills"]["raw_score"],
-                "Experience": r["scores"]["experience"]["raw_score"],
-                "Education": r["scores"]["education"]["raw_score"],
-                "Certifications": r["scores"]["certifications"]["raw_score"]
-            } for r in results
-        ])
-        
-        return results_df
+            Pandas DataFrame with one numeric column per score
+        """
+        # Built column by column from the score block, no per-result dictionaries
+        results = ScoreResults.from_results(results)
+        columns = {"Job App ID": pd.Series(results.job_app_ids)}
+        for label, field in RESULT_COLUMNS.items():
+            columns[label] = results.block[:, SCORE_FIELDS.index(field)]
+        return pd.DataFrame(columns, copy=False)
     
     @staticmethod
     def format_results_dataframe(results_df: pd.DataFrame) -> pd.DataFrame:
         """
         Format results DataFrame with percentages
         
+        Only needed where text is required; tables keep numeric columns and
+        format them with PERCENT_COLUMN instead.
+        
         Args:
             results_df: Raw results DataFrame
             
@@ -49,9 +76,8 @@ class Visualizer:
         """
         # Format the results dataframe to include % signs and round to 2 decimal places
         formatted_df = results_df.copy()
-        for col in ['Core Skills', 'Experience', 'Education', 'Certifications']:
-            formatted_df[col] = formatted_df[col].apply(lambda x: f"{x:.2f}%")
-        formatted_df["Total Score"] = formatted_df["Total Score"].apply(lambda x: f"{x:.2f}%")
+        for col in RESULT_COLUMNS:
+            formatted_df[col] = [f"{x:.2f}%" for x in formatted_df[col].tolist()]
         
         return formatted_df
     
@@ -63,100 +89,366 @@ class Visualizer:
         Args:
             results_df: Results DataFrame
         """
-        # Format the dataframe
-        formatted_df = Visualizer.format_results_dataframe(results_df)
-        
-        # Display as a dataframe
+        # Percentages are formatted by the frontend, the columns stay numeric
         st.dataframe(
-            formatted_df, 
+            results_df, 
             hide_index=True,
-            use_container_width=True
+            use_container_width=True,
+            column_config={col: PERCENT_COLUMN for col in RESULT_COLUMNS}
         )
     
     @staticmethod
-    def display_total_scores_chart(results_df: pd.DataFrame):
+    def is_large_result_set(results_df: pd.DataFrame, chart_settings: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Check whether charts should summarize the results instead of plotting every row
+        
+        Args:
+            results_df: Results DataFrame
+            chart_settings: Chart settings from ConfigManager.get_chart_settings
+            
+        Returns:
+            True above the configured large_data_rows
+        """
+        chart_settings = chart_settings or {}
+        return len(results_df) > chart_settings.get("large_data_rows", DEFAULT_LARGE_DATA_ROWS)
+    
+    @staticmethod
+    def score_histogram(results_df: pd.DataFrame, columns: List[str], bins: int = DEFAULT_HISTOGRAM_BINS) -> pd.DataFrame:
+        """
+        Count scores in equal-width bins over 0-100
+        
+        Args:
+            results_df: Results DataFrame
+            columns: Score columns to count
+            bins: Number of bins
+            
+        Returns:
+            DataFrame indexed by bin start with one count column per score column
+        """
+        edges = np.linspace(0.0, 100.0, bins + 1)
+        counts = {}
+        for col in columns:
+            # Clipped so that every result is counted, 100 falls in the last bin
+            values = np.clip(results_df[col].to_numpy(dtype=np.float64), 0.0, 100.0)
+            counts[col] = np.histogram(values, bins=edges)[0]
+        return pd.DataFrame(counts, index=pd.Index(edges[:-1], name="Score"))
+    
+    @staticmethod
+    def score_summary(results_df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """
+        Summarize the distribution of each score column
+        
+        Args:
+            results_df: Results DataFrame
+            columns: Score columns to summarize
+            
+        Returns:
+            DataFrame with one row per score column
+        """
+        values = results_df[columns].to_numpy(dtype=np.float64)
+        if not len(values):
+            return pd.DataFrame(columns=["Mean", "Min", "25%", "Median", "75%", "Max"], index=columns)
+        quantiles = np.quantile(values, [0.0, 0.25, 0.5, 0.75, 1.0], axis=0)
+        return pd.DataFrame({
+            "Mean": values.mean(axis=0),
+            "Min": quantiles[0],
+            "25%": quantiles[1],
+            "Median": quantiles[2],
+            "75%": quantiles[3],
+            "Max": quantiles[4]
+        }, index=pd.Index(columns, name="Component"))
+    
+    @staticmethod
+    def top_results(results_df: pd.DataFrame, top_n: int = DEFAULT_TOP_N) -> pd.DataFrame:
+        """
+        Select the best results by total score
+        
+        Args:
+            results_df: Results DataFrame
+            top_n: Number of results
+            
+        Returns:
+            Best rows ordered by descending total score, ties in input order
+        """
+        totals = results_df["Total Score"].to_numpy()
+        top_n = max(int(top_n), 1)
+        if top_n < len(totals):
+            # Every row tied with the k-th best score stays a candidate, in input
+            # order, so that ties resolve like a stable sort
+            threshold = -np.partition(-totals, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(totals >= threshold)
+        else:
+            candidates = np.arange(len(totals))
+        order = candidates[np.argsort(-totals[candidates], kind="stable")[:top_n]]
+        return results_df.iloc[order]
+    
+    @staticmethod
+    def display_total_scores_chart(results_df: pd.DataFrame, chart_settings: Optional[Dict[str, Any]] = None):
         """
         Display total scores as a bar chart
         
+        Large result sets are shown as a score histogram and the top results,
+        so the chart payload does not grow with the number of applications.
+        
         Args:
             results_df: Results DataFrame
+            chart_settings: Chart settings from ConfigManager.get_chart_settings
         """
+        chart_settings = chart_settings or {}
+        if Visualizer.is_large_result_set(results_df, chart_settings):
+            st.write(f"Total Score Distribution of {len(results_df)} Job Applications")
+            st.bar_chart(Visualizer.score_histogram(
+                results_df, ["Total Score"], chart_settings.get("histogram_bins", DEFAULT_HISTOGRAM_BINS)
+            ))
+            top_df = Visualizer.top_results(results_df, chart_settings.get("top_n", DEFAULT_TOP_N))
+            st.write(f"Top {len(top_df)} Total Scores")
+            st.bar_chart(top_df.set_index("Job App ID")["Total Score"])
+            return
+        
         # Create a bar chart of total scores
         st.write("Total Scores by Job Application")
         st.bar_chart(results_df.set_index("Job App ID")["Total Score"])
     
     @staticmethod
-    def display_component_scores_chart(results_df: pd.DataFrame):
+    def display_component_scores_chart(results_df: pd.DataFrame, chart_settings: Optional[Dict[str, Any]] = None):
         """
         Display component scores as a grouped bar chart
         
+        Large result sets are shown as per-component score histograms and
+        distribution summaries instead.
+        
         Args:
             results_df: Results DataFrame
+            chart_settings: Chart settings from ConfigManager.get_chart_settings
         """
-        st.write("Component Scores by Job Application")
+        chart_settings = chart_settings or {}
+        if Visualizer.is_large_result_set(results_df, chart_settings):
+            st.write("Component Score Distributions")
+            st.bar_chart(Visualizer.score_histogram(
+                results_df, COMPONENT_COLUMNS, chart_settings.get("histogram_bins", DEFAULT_HISTOGRAM_BINS)
+            ), stack=False)
+            st.dataframe(
+                Visualizer.score_summary(results_df, COMPONENT_COLUMNS),
+                use_container_width=True,
+                column_config={col: PERCENT_COLUMN for col in ["Mean", "Min", "25%", "Median", "75%", "Max"]}
+            )
+            return
         
-        # Reshape data for grouped bar chart
-        component_df = results_df.melt(
-            id_vars=["Job App ID"],
-            value_vars=["Core Skills", "Experience", "Education", "Certifications"],
-            var_name="Component",
-            value_name="Score"
-        )
+        st.write("Component Scores by Job Application")
         
-        # Create pivot table for visualization
-        # Using "mean" as a string instead of np.mean function to avoid FutureWarning
-        chart_data = pd.pivot_table(
-            component_df,
-            values="Score",
-            index=["Job App ID"],
-            columns=["Component"],
-            aggfunc="mean"  # Changed from np.mean to "mean"
-        )
+        # Component columns are already one series per component
+        chart_data = results_df.set_index("Job App ID")[COMPONENT_COLUMNS]
         
         # Display the chart
         st.bar_chart(chart_data)
     
     @staticmethod
-    def display_final_scores_table(results: List[Dict[str, Any]]):
+    def display_gap_analysis(report: GapReport, top_n: int = DEFAULT_TOP_N):
+        """
+        Display population-wide skill and certification gaps
+        
+        Args:
+            report: GapReport of the scored dataset
+            top_n: Number of skills and certifications shown
+        """
+        st.write(f"**{report.below_minimum} of {len(report)} job applications score below "
+                 f"{format_percentage(report.minimum_score)}**")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("Most Frequently Missing Required Skills")
+            missing_df = pd.DataFrame(report.top_missing_skills(top_n),
+                                      columns=["skill", "required", "missing", "missing_rate"])
+            st.bar_chart(missing_df.set_index("skill")["missing"])
+            st.dataframe(
+                missing_df.rename(columns={
+                    "skill": "Skill", "required": "Required", "missing": "Missing", "missing_rate": "Missing Rate"
+                }),
+                hide_index=True,
+                use_container_width=True,
+                column_config={"Missing Rate": PERCENT_COLUMN}
+            )
+        
+        with col2:
+            st.write("Certifications Lifting the Most Applications Over the Minimum Score")
+            lift_df = pd.DataFrame(report.top_lift_certifications(top_n),
+                                   columns=["certification", "lifted", "missing", "required"])
+            st.bar_chart(lift_df.set_index("certification")["lifted"])
+            st.dataframe(
+                lift_df.rename(columns={
+                    "certification": "Certification", "lifted": "Applications Lifted",
+                    "missing": "Missing", "required": "Required"
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        # Coverage is summarized, so the payload does not grow with the dataset
+        coverage = report.coverage()
+        coverage_df = pd.DataFrame({
+            "Skill Coverage": coverage["skill_coverage"],
+            "Certification Coverage": coverage["certification_coverage"]
+        }, copy=False)
+        st.write("Requirement Coverage per Job Application")
+        st.bar_chart(Visualizer.score_histogram(coverage_df, list(coverage_df.columns)), stack=False)
+        st.dataframe(
+            Visualizer.score_summary(coverage_df, list(coverage_df.columns)),
+            use_container_width=True,
+            column_config={col: PERCENT_COLUMN for col in ["Mean", "Min", "25%", "Median", "75%", "Max"]}
+        )
+    
+    @staticmethod
+    def display_final_scores_table(results: List[Dict[str, Any]], top_k: int = None):
         """
         Display final scores as a sorted table
         
         Args:
-            results: List of scoring result dictionaries
+            results: List of scoring result dictionaries, or the already ranked
+                output of ScoringService.rank_top_k
+            top_k: Optional number of best results to show
         """
-        # Create a simplified dataframe with just ID and total score
-        final_scores_df = pd.DataFrame([
-            {
-                "Job Application ID": r["job_app_id"],
-                "Total Match Score (%)": r["total_score"]
-            } for r in results
-        ]).sort_values(by="Total Match Score (%)", ascending=False)
+        # Select the best results with a bounded heap instead of a full sort
+        if top_k:
+            ranked = select_top_k(results, top_k)
+            if len(results) > len(ranked):
+                st.caption(f"Showing top {len(ranked)} of {len(results)} job applications")
+        elif isinstance(results, ScoreResults):
+            ranked = results.top_k()
+        else:
+            ranked = sorted(results, key=lambda r: r["total_score"], reverse=True)
         
-        # Format the total score with 2 decimal places
-        final_scores_df["Total Match Score (%)"] = final_scores_df["Total Match Score (%)"].apply(lambda x: f"{x:.2f}%")
+        # Create a simplified dataframe with just ID and total score
+        if isinstance(ranked, ScoreResults):
+            final_scores_df = pd.DataFrame({
+                "Job Application ID": ranked.job_app_ids,
+                "Total Match Score (%)": ranked.totals
+            })
+        else:
+            final_scores_df = pd.DataFrame([
+                {
+                    "Job Application ID": r["job_app_id"],
+                    "Total Match Score (%)": r["total_score"]
+                } for r in ranked
+            ], columns=["Job Application ID", "Total Match Score (%)"])
         
-        # Display as a styled table
+        # Display as a styled table, the total score shown with 2 decimal places
         st.dataframe(
             final_scores_df,
             hide_index=True,
-            use_container_width=True
+            use_container_width=True,
+            column_config={"Total Match Score (%)": PERCENT_COLUMN}
+        )
+    
+    @staticmethod
+    def display_stored_results(results_store: ResultsStore, run_id: int, page_size: int = DEFAULT_PAGE_SIZE,
+                               key: str = "stored_results", weights: Optional[Dict[str, float]] = None):
+        """
+        Display the ranked results of a stored run one page at a time
+        
+        Only the rows of the current page are read from the store; filtering
+        by minimum score, re-weighting and ranking run as SQL queries.
+        
+        Args:
+            results_store: ResultsStore holding the run
+            run_id: Run ID
+            page_size: Rows per page
+            key: Prefix of the widget keys, unique per page
+            weights: Weights to rank by, the weights the run was stored with by default
+        """
+        page_size = max(int(page_size), 1)
+        col1, col2 = st.columns(2)
+        with col1:
+            minimum_score = st.number_input("Minimum score (%)", min_value=0.0, max_value=100.0, value=0.0,
+                                            step=5.0, key=f"{key}_minimum_score")
+        minimum_score = minimum_score or None
+        total = results_store.count(run_id, minimum_score, weights)
+        pages = max((total + page_size - 1) // page_size, 1)
+        
+        # A higher minimum score may leave fewer pages than the one selected
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        with col2:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=page_key)
+        
+        offset = (page - 1) * page_size
+        ranked = results_store.query(run_id, minimum_score, page_size, offset, weights)
+        if len(ranked):
+            st.caption(f"Showing ranks {offset + 1}-{offset + len(ranked)} of {total} job applications")
+        else:
+            st.caption("No job applications reach the minimum score")
+        
+        st.dataframe(
+            pd.DataFrame({
+                "Rank": np.arange(offset + 1, offset + len(ranked) + 1),
+                "Job Application ID": ranked.job_app_ids,
+                "Total Match Score (%)": ranked.totals
+            }),
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Total Match Score (%)": PERCENT_COLUMN}
         )
     
     @staticmethod
-    def export_results(results: List[Dict[str, Any]]):
+    def display_delta_report(report: DeltaReport):
+        """
+        Display what changed since the previous version of an uploaded dataset
+        
+        Args:
+            report: DeltaReport of the dataset
+        """
+        if not report:
+            st.info(f"No changes since the previous version; all {report.total} scores were reused")
+            return
+        st.info(f"Rescored {report.rescored} of {report.total} job applications in {report.seconds:.2f}s; "
+                f"the other scores were reused from the previous version")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Added", len(report.added))
+        col2.metric("Changed", len(report.changed))
+        col3.metric("Removed", len(report.removed))
+        
+        with st.expander("Changed job application IDs"):
+            summary = report.to_dict()
+            for label, name in [("Added", "added"), ("Changed", "changed"), ("Removed", "removed")]:
+                ids = summary[f"{name}_ids"]
+                if ids:
+                    more = len(getattr(report, name)) - len(ids)
+                    st.write(f"**{label}:** " + ", ".join(str(job_app_id) for job_app_id in ids)
+                             + (f" and {more} more" if more else ""))
+    
+    @staticmethod
+    def export_results(results: List[Dict[str, Any]], payload_cache: Optional[Dict[Tuple[str, bool], bytes]] = None):
         """
         Create export buttons for results
         
+        Download payloads are only generated when a button is clicked, by a
+        chunked writer, and are kept in payload_cache for later clicks.
+        
         Args:
-            results: List of scoring result dictionaries
+            results: List of scoring result dictionaries or ScoreResults
+            payload_cache: Optional dictionary reused across reruns while the
+                dataset and weights are unchanged (see ui.common.get_export_cache)
         """
         st.subheader("Export Results")
         
-        # Convert results to various formats for export
-        results_json = json.dumps([{
-            "job_app_id": r["job_app_id"],
-            "total_score": r["total_score"]
-        } for r in results], indent=2)
+        compress = st.checkbox("Compress downloads (gzip)", key="export_gzip")
+        if payload_cache is None:
+            payload_cache = {}
+        
+        def payload(export_format: str) -> Callable[[], bytes]:
+            def build() -> bytes:
+                key = (export_format, compress)
+                if key not in payload_cache:
+                    writer = iter_results_json if export_format == "json" else iter_results_csv
+                    chunks = writer(results, EXPORT_SCORE_COLUMNS)
+                    if compress:
+                        chunks = gzip_chunks(chunks)
+                    payload_cache[key] = b"".join(chunks)
+                return payload_cache[key]
+            return build
+        
+        suffix = ".gz" if compress else ""
         
         # Create download buttons for different formats
         col1, col2 = st.columns(2)
@@ -165,34 +457,47 @@ class Visualizer:
             # JSON download
             st.download_button(
                 label="Download JSON Results",
-                data=results_json,
-                file_name="job_matching_results.json",
-                mime="application/json"
+                data=payload("json"),
+                file_name=f"job_matching_results.json{suffix}",
+                mime="application/gzip" if compress else "application/json"
             )
         
         with col2:
             # CSV download
-            csv_data = pd.DataFrame([{
-                "job_app_id": r["job_app_id"],
-                "total_score": r["total_score"]
-            } for r in results]).to_csv(index=False).encode('utf-8')
-            
             st.download_button(
                 label="Download CSV Results",
-                data=csv_data,
-                file_name="job_matching_results.csv",
-                mime="text/csv"
+                data=payload("csv"),
+                file_name=f"job_matching_results.csv{suffix}",
+                mime="application/gzip" if compress else "text/csv"
             )
     
     @staticmethod
-    def display_debug_information(results: List[Dict[str, Any]]):
+    def display_debug_information(results: List[Dict[str, Any]], job_index: Optional[JobAppIndex] = None,
+                                  job_apps: Optional[List[Dict[str, Any]]] = None):
         """
         Display detailed debug information for results
         
+        With a job index, one selected job application and its result are
+        shown, looked up by ID, instead of one expander per result.
+        
         Args:
-            results: List of scoring result dictionaries
+            results: List of scoring result dictionaries or ScoreResults
+            job_index: Optional JobAppIndex of the scored dataset
+            job_apps: Optional job applications of the scored dataset
         """
         st.header("Debug Information")
-        for result in results:
-            with st.expander(f"Job Application {result['job_app_id']} - Score: {result['total_score']}"):
-                st.json(result)
\ No newline at end of file
+        if job_index is None:
+            for result in results:
+                with st.expander(f"Job Application {result['job_app_id']} - Score: {result['total_score']}"):
+                    st.json(dict(result))
+            return
+        
+        selected_label = st.selectbox("Job application:", job_index.labels, key="debug_job_selector")
+        position = job_index.label_position(selected_label) if selected_label is not None else None
+        if position is None:
+            return
+        result = results[position]
+        st.write(f"**Job Application {result['job_app_id']} - Score: {result['total_score']}**")
+        st.json(dict(result))
+        if job_apps is not None:
+            st.json(job_apps[position])
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+Skill and certification vocabulary for the job matching system.
+Interns item strings to integer ids and encodes item lists as packed bitsets.
+"""
+import logging
+from collections import defaultdict
+from itertools import count, islice
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# An item collection is either a list of strings or a packed bitset of ids
+Items = Union[List[str], int]
+
+# (section, field) pairs holding skill or certification lists
+ITEM_FIELDS = (
+    ("job_requirements", "core_skills"),
+    ("job_requirements", "certifications"),
+    ("talent_profile", "skills"),
+    ("talent_profile", "certifications")
+)
+
+# (job_requirements field, talent_profile field) pairs matched against each other
+MATCHED_FIELDS = (
+    ("core_skills", "skills"),
+    ("certifications", "certifications")
+)
+
+
+def popcount(bits: int) -> int:
+    """Count set bits in a packed bitset"""
+    return bits.bit_count() if hasattr(bits, "bit_count") else bin(bits).count("1")
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Yield the ids of set bits in ascending order"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def count_matches(required: Items, provided: Items) -> Tuple[int, int]:
+    """
+    Count required items that are present in the provided items
+
+    Lists keep the per-item semantics of the original scorer (duplicated
+    requirements count once per occurrence). Bitsets are sets, so matching
+    is an AND plus a popcount; Vocabulary.encode_job_app only encodes
+    requirements without duplicates, so both give the same counts.
+
+    Args:
+        required: Required items as a list or bitset
+        provided: Provided items as a list or bitset of the same kind
+
+    Returns:
+        Tuple of (matching_count, required_count)
+    """
+    if isinstance(required, int) != isinstance(provided, int):
+        raise TypeError(
+            "Required and provided items must both be lists or both be bitsets of one Vocabulary, "
+            f"got {type(required).__name__} and {type(provided).__name__}"
+        )
+    if isinstance(required, int):
+        return popcount(required & provided), popcount(required)
+    provided_set = set(provided)
+    return sum(1 for item in required if item in provided_set), len(required)
+
+
+class Vocabulary:
+    """Interns skill and certification strings to stable integer ids"""
+
+    def __init__(self, items: Optional[Iterable[str]] = None):
+        """
+        Initialize with optional initial items
+
+        Args:
+            items: Strings to intern in order
+        """
+        self.ids: Dict[str, int] = {}
+        self.items: List[str] = []
+        for item in items or []:
+            self.intern(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.ids
+
+    @classmethod
+    def from_job_apps(cls, job_apps: List[Dict[str, Any]]) -> "Vocabulary":
+        """
+        Build a vocabulary from every skill and certification in a dataset
+
+        Args:
+            job_apps: List of job application dictionaries
+
+        Returns:
+            Vocabulary instance
+        """
+        vocabulary = cls()
+        for job_app in job_apps:
+            for section, field in ITEM_FIELDS:
+                items = job_app.get(section, {}).get(field, [])
+                if not isinstance(items, int):
+                    vocabulary.intern_all(items)
+        return vocabulary
+
+    def intern(self, item: str) -> int:
+        """Return the id of an item, assigning a new id if unseen"""
+        item_id = self.ids.get(item)
+        if item_id is None:
+            item_id = len(self.items)
+            self.ids[item] = item_id
+            self.items.append(item)
+        return item_id
+
+    def intern_all(self, items: Iterable[str]) -> List[int]:
+        """Intern a sequence of items, preserving order and duplicates"""
+        return [self.intern(item) for item in items]
+
+    def to_id_array(self, items: List[str]) -> np.ndarray:
+        """
+        Intern a flat list of items and return their ids as an array
+
+        Unseen items are interned in order of first occurrence, like
+        intern_all, but every lookup and new id assignment runs in C.
+
+        Args:
+            items: Item strings, with duplicates
+
+        Returns:
+            Int64 array of ids aligned with items
+        """
+        known = len(self.items)
+        lookup = defaultdict(count(known).__next__, self.ids)
+        id_array = np.fromiter(map(lookup.__getitem__, items), dtype=np.int64, count=len(items))
+        # Keys keep insertion order, so new items follow the known ones in id order
+        new_items = list(islice(lookup, known, None))
+        self.items.extend(new_items)
+        self.ids.update(zip(new_items, range(known, known + len(new_items))))
+        return id_array
+
+    def to_ids(self, items: Items) -> List[int]:
+        """
+        Convert an item list or bitset to ids
+
+        Lists keep order and duplicates; bitsets yield ascending ids.
+        """
+        if isinstance(items, int):
+            return list(iter_bits(items))
+        return self.intern_all(items)
+
+    def encode(self, items: Items) -> int:
+        """
+        Encode items as a packed bitset (a Python int)
+
+        Args:
+            items: List of item strings, or an existing bitset
+
+        Returns:
+            Bitset with one bit set per distinct item id
+        """
+        if isinstance(items, int):
+            return items
+        bits = 0
+        for item in items:
+            bits |= 1 << self.intern(item)
+        return bits
+
+    def decode(self, bits: int) -> List[str]:
+        """Decode a bitset back to item strings in id order"""
+        return [self.items[item_id] for item_id in iter_bits(bits)]
+
+    def to_words(self, bits: int) -> np.ndarray:
+        """
+        Convert a bitset to little-endian uint64 words sized for this vocabulary
+
+        Args:
+            bits: Packed bitset
+
+        Returns:
+            uint64 array of length ceil(len(vocabulary) / 64)
+        """
+        n_words = max((len(self.items) + 63) // 64, 1)
+        return np.frombuffer(bits.to_bytes(n_words * 8, "little"), dtype="<u8").copy()
+
+    @staticmethod
+    def from_words(words: np.ndarray) -> int:
+        """Convert little-endian uint64 words back to a bitset"""
+        return int.from_bytes(np.asarray(words, dtype="<u8").tobytes(), "little")
+
+    def encode_job_app(self, job_app: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encode a job application's skill and certification lists as bitsets
+
+        A bitset holds each item once, while a requirement listed twice
+        counts twice. Requirements with duplicates and the talent items
+        matched against them therefore stay lists, so scores never change.
+
+        Args:
+            job_app: Job application dictionary
+
+        Returns:
+            Copy of the job application with bitsets in place of item lists
+        """
+        encoded = dict(job_app)
+        requirements = encoded["job_requirements"] = dict(job_app.get("job_requirements", {}))
+        profile = encoded["talent_profile"] = dict(job_app.get("talent_profile", {}))
+        for required_field, provided_field in MATCHED_FIELDS:
+            required = requirements.get(required_field, [])
+            if not isinstance(required, int) and len(set(required)) != len(required):
+                continue
+            requirements[required_field] = self.encode(required)
+            profile[provided_field] = self.encode(profile.get(provided_field, []))
+        return encoded
+
+    def decode_job_app(self, job_app: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Restore item lists in a job application encoded with encode_job_app
+
+        Args:
+            job_app: Encoded job application dictionary
+
+        Returns:
+            Copy of the job application in the original JSON schema
+        """
+        decoded = dict(job_app)
+        for section in ("job_requirements", "talent_profile"):
+            decoded[section] = dict(job_app.get(section, {}))
+        for section, field in ITEM_FIELDS:
+            items = decoded[section].get(field, [])
+            if isinstance(items, int):
+                decoded[section][field] = self.decode(items)
+        return decoded
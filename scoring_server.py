@@ -0,0 +1,363 @@
+"""
+HTTP scoring service for the job matching system.
+Exposes ScoringService over JSON endpoints on a stdlib asyncio server, so other
+services can score applications without the Streamlit UI. Concurrent
+single-application requests are scored together in micro-batches.
+
+Usage:
+    python -m scoring_server --port 8080
+    curl -X POST localhost:8080/score -d @application.json
+    curl -X POST localhost:8080/score/batch -d @applications.json
+    curl -X POST "localhost:8080/top-k?k=10" -d @applications.json
+
+Endpoints:
+    POST /score          One job application, returns its scoring result
+    POST /score/batch    JSON array of job applications, returns results in input order
+    POST /top-k?k=K      JSON array of job applications, returns the K best results
+    GET  /health         Liveness and configuration version
+    GET  /stats          Request and micro-batching statistics
+"""
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Any, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from modules.config_manager import ConfigManager
+from modules.data_manager import DataManager
+from modules.micro_batching import BatcherOverloaded, MicroBatcher
+from modules.score_cache import ScoreCache
+from modules.scoring_service import ScoringService
+
+logger = logging.getLogger(__name__)
+
+# Largest accepted request line and header block
+MAX_HEADER_BYTES = 65536
+# Pending connections the kernel queues, large enough for bursts of new clients
+LISTEN_BACKLOG = 1024
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON error message"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ScoringServer:
+    """Asyncio HTTP/1.1 server scoring job applications with a ScoringService"""
+
+    def __init__(self, config_manager: ConfigManager, scoring_service: ScoringService,
+                 settings: Dict[str, Any] = None):
+        """
+        Initialize the server
+
+        All scoring runs in one worker thread, so the ScoringService is never
+        used concurrently and the event loop stays free to parse requests
+        while a batch is scored. The configuration is checked for changes
+        before each batch.
+
+        Args:
+            config_manager: ConfigManager instance
+            scoring_service: ScoringService used for all requests
+            settings: Server settings, config_manager.get_server_settings() by default
+        """
+        self.config = config_manager
+        self.scoring_service = scoring_service
+        self.settings = settings if settings is not None else config_manager.get_server_settings()
+        self.max_body_bytes = self.settings.get("max_body_bytes", 10485760)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batcher: Optional[MicroBatcher] = None
+        self.requests: Dict[str, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: str = None, port: int = None) -> Tuple[str, int]:
+        """
+        Start listening and batching
+
+        Args:
+            host: Interface to bind, defaults to server.host
+            port: Port to bind, defaults to server.port, 0 picks a free port
+
+        Returns:
+            Tuple of (host, port) actually bound
+        """
+        self.batcher = MicroBatcher(
+            self._score_applications,
+            max_batch_size=self.settings.get("max_batch_size", 256),
+            max_delay=self.settings.get("max_batch_delay_ms", 5) / 1000,
+            max_pending=self.settings.get("max_pending", 10000),
+            executor=self.executor
+        )
+        self.batcher.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            host if host is not None else self.settings.get("host", "127.0.0.1"),
+            port if port is not None else self.settings.get("port", 8080),
+            limit=MAX_HEADER_BYTES,
+            backlog=LISTEN_BACKLOG
+        )
+        address = self._server.sockets[0].getsockname()
+        logger.info(f"Scoring service listening on http://{address[0]}:{address[1]}")
+        return address[0], address[1]
+
+    async def serve_forever(self):
+        """Serve until cancelled"""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections, cancel queued requests and release the worker thread"""
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would keep wait_closed waiting
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+        if self.batcher is not None:
+            await self.batcher.stop()
+        self.executor.shutdown(wait=True)
+
+    def _score_applications(self, job_apps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score applications on the batch path, runs in the worker thread"""
+        self.config.reload_if_changed()
+        return self.scoring_service.score_all_applications(job_apps, compact=True).to_dicts()
+
+    def _rank_applications(self, job_apps: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """Rank applications, runs in the worker thread"""
+        self.config.reload_if_changed()
+        return self.scoring_service.rank_top_k(job_apps, k)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests of one keep-alive connection in order"""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                                {"error": "Request headers too large"}, keep_alive=False))
+                    break
+
+                keep_alive = False
+                body = None
+                try:
+                    method, target, version, headers = self._parse_head(head)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    body = await self._read_body(reader, headers)
+                    status, payload = await self._dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                    # The unread body of a rejected request would be parsed as the next request
+                    keep_alive = keep_alive and body is not None
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """Parse the request line and headers"""
+        request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+        parts = request_line.split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers = {}
+        for line in header_lines:
+            name, separator, value = line.partition(":")
+            if not separator:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed header")
+            headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], parts[2], headers
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+        """Read a Content-Length delimited request body"""
+        if "transfer-encoding" in headers:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request body exceeds {self.max_body_bytes} bytes")
+        return await reader.readexactly(length) if length else b""
+
+    @staticmethod
+    def _response(status: HTTPStatus, payload: Any, keep_alive: bool) -> bytes:
+        """Serialize a JSON response"""
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head += "Retry-After: 1\r\n"
+        return (head + "\r\n").encode("latin-1") + body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        """Route a request to its endpoint"""
+        url = urlsplit(target)
+        routes = {
+            "/score": ("POST", self._score),
+            "/score/batch": ("POST", self._score_batch),
+            "/top-k": ("POST", self._top_k),
+            "/health": ("GET", self._health),
+            "/stats": ("GET", self._stats)
+        }
+        if url.path not in routes:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        allowed, handler = routes[url.path]
+        if method != allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{url.path} expects {allowed}")
+
+        self.requests[url.path] = self.requests.get(url.path, 0) + 1
+        try:
+            return HTTPStatus.OK, await handler(parse_qs(url.query), body)
+        except HTTPError:
+            raise
+        except BatcherOverloaded as e:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, f"Scoring queue is full: {str(e)}")
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            # Applications that pass validation but have values of the wrong type
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Could not score job application: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error handling {url.path}: {str(e)}")
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error")
+
+    @staticmethod
+    def _parse_json(body: bytes) -> Any:
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {str(e)}")
+
+    @classmethod
+    def _parse_job_apps(cls, body: bytes) -> List[Dict[str, Any]]:
+        """Parse and validate a JSON array of job applications"""
+        job_apps = cls._parse_json(body)
+        if not isinstance(job_apps, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON array of job applications")
+        for job_app in job_apps:
+            is_valid, message = DataManager.validate_job_application(job_app)
+            if not is_valid:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, message)
+        return job_apps
+
+    async def _score(self, query: Dict[str, List[str]], body: bytes) -> Dict[str, Any]:
+        job_app = self._parse_json(body)
+        is_valid, message = DataManager.validate_job_application(job_app)
+        if not is_valid:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, message)
+        return await self.batcher.submit(job_app)
+
+    async def _score_batch(self, query: Dict[str, List[str]], body: bytes) -> List[Dict[str, Any]]:
+        job_apps = self._parse_job_apps(body)
+        if not job_apps:
+            return []
+        # Already a batch; scored as one in the worker thread between micro-batches
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._score_applications, job_apps)
+
+    async def _top_k(self, query: Dict[str, List[str]], body: bytes) -> List[Dict[str, Any]]:
+        try:
+            k = int(query["k"][0])
+        except (KeyError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Query parameter k must be an integer")
+        job_apps = self._parse_job_apps(body)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._rank_applications, job_apps, k)
+
+    async def _health(self, query: Dict[str, List[str]], body: bytes) -> Dict[str, Any]:
+        return {"status": "ok", "config_version": self.config.version}
+
+    async def _stats(self, query: Dict[str, List[str]], body: bytes) -> Dict[str, Any]:
+        return {"requests": dict(self.requests), "batching": self.batcher.stats()}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m scoring_server",
+                                     description="Serve job application scoring over HTTP")
+    parser.add_argument("-c", "--config", default="config/scoring_config.yaml", help="Scoring configuration file")
+    parser.add_argument("--host", help="Interface to bind, defaults to server.host")
+    parser.add_argument("-p", "--port", type=int, help="Port to bind, defaults to server.port")
+    parser.add_argument("--engine", choices=ScoringService.ENGINES, help="Scoring engine override")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    return parser
+
+
+async def serve(config_manager: ConfigManager, scoring_service: ScoringService, host: str = None,
+                port: int = None):
+    """
+    Run a ScoringServer until cancelled
+
+    Args:
+        config_manager: ConfigManager instance
+        scoring_service: ScoringService used for all requests
+        host: Interface to bind, defaults to server.host
+        port: Port to bind, defaults to server.port
+    """
+    server = ScoringServer(config_manager, scoring_service)
+    await server.start(host, port)
+    try:
+        # Shut down cleanly when a process manager terminates the service
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Run the scoring service
+
+    Args:
+        argv: Command line arguments, sys.argv[1:] by default
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr
+    )
+
+    config_manager = ConfigManager(args.config)
+    score_cache = ScoreCache.from_settings(config_manager.get_cache_settings())
+    scoring_service = ScoringService(config_manager, engine=args.engine, score_cache=score_cache)
+    try:
+        asyncio.run(serve(config_manager, scoring_service, args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    except OSError as e:
+        logger.error(f"Could not start the scoring service: {str(e)}")
+        return 1
+    finally:
+        if score_cache is not None:
+            score_cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,43 @@
 """
 Common UI elements for the job matching system.
 """
+import logging
+import sqlite3
+import uuid
+import pandas as pd
 import streamlit as st
-from typing import Dict
+from typing import Dict, List, Any, Optional, Tuple
 
+from modules.batch_engine import RawScores
 from modules.config_manager import ConfigManager
+from modules.data_manager import DataManager
+from modules.delta_ingestion import DeltaReport
+from modules.gap_analytics import GapReport
+from modules.job_index import JobAppIndex
+from modules.results import ScoreResults
+from modules.results_store import ResultsStore
+from modules.score_cache import ScoreCache, application_hashes, hashes_fingerprint
+from modules.scoring_service import ScoringService
+from modules.visualization import Visualizer
+
+logger = logging.getLogger(__name__)
+
+# Scored datasets kept for all sessions, and how long an unused one is kept
+RESULTS_CACHE_MAX_ENTRIES = 16
+RESULTS_CACHE_TTL_SECONDS = 3600
+
+# Job applications rendered in upload previews
+PREVIEW_RECORDS = 20
+
+@st.cache_data
+def load_sample_jobs() -> List[Dict[str, Any]]:
+    """
+    Load sample job data, cached across Streamlit reruns and sessions
+    
+    Returns:
+        List of job application dictionaries
+    """
+    return DataManager.load_sample_jobs()
 
 def display_weight_sliders(config_manager: ConfigManager) -> Dict[str, float]:
     """
@@ -71,6 +104,354 @@ def display_weight_sliders(config_manager: ConfigManager) -> Dict[str, float]:
         "certifications": certifications_weight / 100
     }
 
+def parse_upload(uploaded_file) -> Tuple[bool, Optional[List[Dict[str, Any]]], str]:
+    """
+    Parse an uploaded file once per upload
+    
+    Streamlit reruns the script on every interaction, so the parse result is
+    kept in session state under the upload's file_id and returned as is until
+    another file is uploaded. The upload's fingerprint is kept with it.
+    
+    Args:
+        uploaded_file: File returned by st.file_uploader
+        
+    Returns:
+        Tuple of (success, job applications, message) from DataManager.parse_uploaded_stream
+    """
+    upload = st.session_state.get('upload')
+    if upload is None or upload['file_id'] != uploaded_file.file_id:
+        success, data, message = DataManager.parse_uploaded_stream(uploaded_file)
+        upload = {'file_id': uploaded_file.file_id, 'success': success, 'data': data, 'message': message}
+        st.session_state.upload = upload
+    return upload['success'], upload['data'], upload['message']
+
+def _fingerprint_entry(job_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Get the session state entry holding the content hashes of a dataset
+    
+    The current upload is hashed once per file_id, even when other datasets
+    are scored in between; any other dataset is hashed when it replaces the
+    last one hashed.
+    """
+    entry = st.session_state.get('upload')
+    if entry is None or entry['data'] is not job_data:
+        entry = st.session_state.get('dataset_hashes')
+        if entry is None or entry['data'] is not job_data:
+            entry = {'data': job_data}
+            st.session_state.dataset_hashes = entry
+    if 'fingerprint' not in entry:
+        entry['content_hashes'] = application_hashes(job_data)
+        entry['fingerprint'] = hashes_fingerprint(entry['content_hashes'])
+    return entry
+
+def get_dataset_fingerprint(job_data: List[Dict[str, Any]]) -> str:
+    """
+    Get the content fingerprint of a dataset, hashing it once per session
+    
+    Args:
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        Hex digest identifying the dataset contents
+    """
+    return _fingerprint_entry(job_data)['fingerprint']
+
+def get_content_hashes(job_data: List[Dict[str, Any]]) -> List[bytes]:
+    """
+    Get the per-application content hashes of a dataset, hashed with its fingerprint
+    
+    Args:
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        Content hashes in dataset order
+    """
+    return _fingerprint_entry(job_data)['content_hashes']
+
+def get_session_id() -> str:
+    """Random ID of the browser session, created on first use"""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+def set_dataset_source(job_data: List[Dict[str, Any]], source: str):
+    """
+    Record where a dataset came from, so a new version from the same source
+    is scored as a delta against the previous one
+    
+    The results store is shared by all sessions, so the label is scoped to
+    this session; another user's upload of a file with the same name is
+    never diffed against, which would show their job application IDs.
+    
+    Args:
+        job_data: List of job application dictionaries held in session state
+        source: Source label, e.g. "upload:applications.json"
+    """
+    st.session_state.dataset_source = f"session:{get_session_id()}:{source}"
+    st.session_state.source_data = job_data
+
+def get_dataset_source(job_data: List[Dict[str, Any]]) -> Optional[str]:
+    """Get the source label recorded for a dataset, None if it has none"""
+    if st.session_state.get('source_data') is not job_data:
+        return None
+    return st.session_state.get('dataset_source')
+
+@st.cache_resource(show_spinner=False)
+def _open_results_store(settings: Tuple[Tuple[str, Any], ...]) -> Optional[ResultsStore]:
+    """Results store connection shared by all sessions"""
+    try:
+        return ResultsStore.from_settings(dict(settings))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Results store unavailable, results are kept in memory only: {str(e)}")
+        return None
+
+def get_results_store(config_manager: ConfigManager) -> Optional[ResultsStore]:
+    """
+    Get the persistent results store
+    
+    Args:
+        config_manager: ConfigManager instance
+        
+    Returns:
+        ResultsStore instance, or None when the store is disabled or cannot be opened
+    """
+    return _open_results_store(tuple(sorted(config_manager.get_results_store_settings().items())))
+
+@st.cache_resource(show_spinner=False)
+def _open_score_cache(settings: Tuple[Tuple[str, Any], ...]) -> Optional[ScoreCache]:
+    """Score cache shared by all sessions"""
+    try:
+        return ScoreCache.from_settings(dict(settings))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Score cache disk tier unavailable, scoring without a cache: {str(e)}")
+        return None
+
+def get_score_cache(config_manager: ConfigManager) -> Optional[ScoreCache]:
+    """
+    Get the score cache for ScoringService instances
+    
+    Args:
+        config_manager: ConfigManager instance
+        
+    Returns:
+        ScoreCache instance, or None when caching is disabled or the cache cannot be opened
+    """
+    return _open_score_cache(tuple(sorted(config_manager.get_cache_settings().items())))
+
+@st.cache_resource(max_entries=RESULTS_CACHE_MAX_ENTRIES, ttl=RESULTS_CACHE_TTL_SECONDS, show_spinner=False)
+def _compute_raw_scores(data_fingerprint: str, raw_scores_version: str, source: Optional[str],
+                        _scoring_service: ScoringService, _job_data: List[Dict[str, Any]],
+                        _content_hashes: List[bytes]) -> Tuple[RawScores, Optional[DeltaReport]]:
+    """Raw scores shared by all sessions holding the same dataset, source and education hierarchy"""
+    education_hierarchy = _scoring_service.plan.education_hierarchy
+    results_store = get_results_store(_scoring_service.config)
+    if results_store is not None:
+        # Any stored run of the dataset and education hierarchy has the same raw
+        # scores, so a restarted app re-weights them instead of rescoring
+        run_id = results_store.find_run(data_fingerprint, raw_scores_version)
+        if run_id is not None:
+            return results_store.load_raw_scores(run_id, education_hierarchy), None
+        # A new version of a source only scores applications that changed
+        run_id = results_store.find_previous_run(source, raw_scores_version) if source else None
+        if run_id is not None:
+            previous = results_store.load_dataset_version(run_id, education_hierarchy)
+            raw_scores, delta_report = _scoring_service.compute_delta_raw_scores(_job_data, previous, _content_hashes)
+        else:
+            raw_scores, delta_report = _scoring_service.compute_raw_scores(_job_data), None
+        # Stored once per dataset; other weights are applied when the run is read
+        try:
+            results_store.save_results(
+                _scoring_service.apply_weights(raw_scores, compact=True), data_fingerprint, raw_scores_version,
+                _scoring_service.weights, content_hashes=_content_hashes, source=source
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not store results, they are kept in memory only: {str(e)}")
+        return raw_scores, delta_report
+    return _scoring_service.compute_raw_scores(_job_data), None
+
+@st.cache_resource(max_entries=RESULTS_CACHE_MAX_ENTRIES, ttl=RESULTS_CACHE_TTL_SECONDS, show_spinner=False)
+def _apply_weights(data_fingerprint: str, raw_scores_version: str, weights: Tuple[Tuple[str, float], ...],
+                   _scoring_service: ScoringService, _raw_scores: RawScores) -> Tuple[ScoreResults, pd.DataFrame]:
+    """Results and results DataFrame shared by all sessions with the same inputs and weights"""
+    results = _scoring_service.apply_weights(_raw_scores, compact=True)
+    return results, Visualizer.create_results_dataframe(results)
+
+def _get_raw_scores(scoring_service: ScoringService,
+                    job_data: List[Dict[str, Any]]) -> Tuple[RawScores, Optional[DeltaReport]]:
+    """Raw scores of a dataset and the delta report of how they were computed"""
+    return _compute_raw_scores(
+        get_dataset_fingerprint(job_data), scoring_service.raw_scores_version, get_dataset_source(job_data),
+        scoring_service, job_data, get_content_hashes(job_data)
+    )
+
+@st.cache_resource(max_entries=RESULTS_CACHE_MAX_ENTRIES, ttl=RESULTS_CACHE_TTL_SECONDS, show_spinner=False)
+def _build_job_index(data_fingerprint: str, _job_data: List[Dict[str, Any]]) -> JobAppIndex:
+    """Job application index shared by all sessions holding the same dataset"""
+    return JobAppIndex.from_job_apps(_job_data)
+
+def get_job_app_index(job_data: List[Dict[str, Any]]) -> JobAppIndex:
+    """
+    Get the job_app_id index of a dataset, built once per dataset
+    
+    Positions in the index are row positions in job_data and in its results.
+    
+    Args:
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        JobAppIndex instance
+    """
+    return _build_job_index(get_dataset_fingerprint(job_data), job_data)
+
+@st.cache_resource(max_entries=RESULTS_CACHE_MAX_ENTRIES, ttl=RESULTS_CACHE_TTL_SECONDS, show_spinner=False)
+def _analyze_gaps(data_fingerprint: str, raw_scores_version: str, weights: Tuple[Tuple[str, float], ...],
+                  minimum_score: float, _scoring_service: ScoringService, _job_data: List[Dict[str, Any]],
+                  _raw_scores: RawScores) -> GapReport:
+    """Gap report shared by all sessions with the same inputs and weights"""
+    return _scoring_service.analyze_gaps(_job_data, _raw_scores)
+
+def get_cached_gap_report(scoring_service: ScoringService, job_data: List[Dict[str, Any]]) -> GapReport:
+    """
+    Get the gap report of a dataset, cached across reruns and sessions
+    
+    Certification lift depends on the weights and the minimum match score,
+    so the report is keyed on both next to the raw scores.
+    
+    Args:
+        scoring_service: ScoringService instance with the weights to apply
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        GapReport instance
+    """
+    raw_scores = get_cached_raw_scores(scoring_service, job_data)
+    return _analyze_gaps(
+        get_dataset_fingerprint(job_data), scoring_service.raw_scores_version,
+        tuple(sorted(scoring_service.weights.items())),
+        scoring_service.config.get_thresholds().get("minimum_match_score", 0),
+        scoring_service, job_data, raw_scores
+    )
+
+def get_cached_raw_scores(scoring_service: ScoringService, job_data: List[Dict[str, Any]]) -> RawScores:
+    """
+    Get raw component scores for a dataset, computing them once per dataset
+    
+    Raw scores do not depend on the weights, so moving a weight slider only
+    re-applies weights to the cached matrix instead of rescoring. The cache
+    is keyed by content, so sessions viewing the same data share it.
+    
+    Args:
+        scoring_service: ScoringService instance
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        RawScores instance
+    """
+    return _get_raw_scores(scoring_service, job_data)[0]
+
+def get_delta_report(scoring_service: ScoringService, job_data: List[Dict[str, Any]]) -> Optional[DeltaReport]:
+    """
+    Get the changes of a dataset relative to the previous version of its source
+    
+    Only available when the results store holds a previous version of the
+    source recorded with set_dataset_source and the dataset was scored as
+    a delta against it.
+    
+    Args:
+        scoring_service: ScoringService instance
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        DeltaReport instance, or None when the dataset was not scored as a delta
+    """
+    return _get_raw_scores(scoring_service, job_data)[1]
+
+def get_cached_results(scoring_service: ScoringService,
+                       job_data: List[Dict[str, Any]]) -> Tuple[ScoreResults, pd.DataFrame]:
+    """
+    Get scored results and their DataFrame, cached across reruns and sessions
+    
+    Results are keyed by the dataset fingerprint, the weights and the
+    education hierarchy, so widget interactions and other sessions viewing the
+    same data reuse them without rescoring. Both are shared and must not
+    be modified.
+    
+    Args:
+        scoring_service: ScoringService instance with the weights to apply
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        Tuple of (ScoreResults, results DataFrame)
+    """
+    raw_scores = get_cached_raw_scores(scoring_service, job_data)
+    return _apply_weights(
+        get_dataset_fingerprint(job_data), scoring_service.raw_scores_version,
+        tuple(sorted(scoring_service.weights.items())), scoring_service, raw_scores
+    )
+
+def get_stored_run(scoring_service: ScoringService,
+                   job_data: List[Dict[str, Any]]) -> Tuple[Optional[ResultsStore], Optional[int]]:
+    """
+    Find the stored run of a dataset's results
+    
+    Raw scores are stored once per dataset, so after get_cached_results was
+    called the run can be queried page by page instead of holding all
+    results. Pass the scoring service's weights to the queries; the stored
+    totals may have been computed with other weights.
+    
+    Args:
+        scoring_service: ScoringService instance
+        job_data: List of job application dictionaries held in session state
+        
+    Returns:
+        Tuple of (ResultsStore, run ID), (None, None) when the store is disabled
+    """
+    results_store = get_results_store(scoring_service.config)
+    if results_store is None:
+        return None, None
+    run_id = results_store.find_run(get_dataset_fingerprint(job_data), scoring_service.raw_scores_version)
+    return results_store, run_id
+
+def get_export_cache(job_data: List[Dict[str, Any]], weights: Dict[str, float],
+                     config_version: int = None) -> Dict[Any, bytes]:
+    """
+    Get the download payload cache for a dataset and set of weights
+    
+    The cache is emptied whenever the dataset, the weights or the
+    configuration version change, so a payload generated on one click is
+    reused until the results change.
+    
+    Args:
+        job_data: List of job application dictionaries held in session state
+        weights: Scoring weights the results were computed with
+        config_version: Configuration version the results were computed with
+        
+    Returns:
+        Dictionary to pass to Visualizer.export_results
+    """
+    export_cache = st.session_state.get('export_cache')
+    if (export_cache is None
+            or export_cache['data'] is not job_data
+            or export_cache['weights'] != weights
+            or export_cache['config_version'] != config_version):
+        export_cache = {'data': job_data, 'weights': dict(weights), 'config_version': config_version, 'payloads': {}}
+        st.session_state.export_cache = export_cache
+    return export_cache['payloads']
+
+def display_data_preview(job_data: List[Dict[str, Any]]):
+    """
+    Display the first job applications of a dataset in an expander
+    
+    Rendering a whole upload as JSON would send every record to the browser.
+    
+    Args:
+        job_data: List of job application dictionaries
+    """
+    with st.expander("Preview uploaded data", expanded=False):
+        if len(job_data) > PREVIEW_RECORDS:
+            st.caption(f"Showing the first {PREVIEW_RECORDS} of {len(job_data)} job applications")
+        st.json(job_data[:PREVIEW_RECORDS])
+
 def display_json_structure_example():
     """Display example JSON structure in an expander"""
     with st.expander("View expected JSON structure"):
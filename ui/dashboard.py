@@ -5,10 +5,10 @@ import streamlit as st
 from typing import Dict, List, Any
 
 from modules.config_manager import ConfigManager
-from modules.data_manager import DataManager
 from modules.scoring_service import ScoringService
 from modules.visualization import Visualizer
-from ui.common import display_weight_sliders
+from ui.common import (display_weight_sliders, get_cached_gap_report, get_cached_results, get_delta_report,
+                       get_export_cache, get_job_app_index, get_stored_run, load_sample_jobs)
 
 def render_dashboard(config_manager: ConfigManager):
     """
@@ -41,11 +41,12 @@ def render_dashboard(config_manager: ConfigManager):
         # Initialize scoring service with custom weights
         scoring_service = ScoringService(config_manager, custom_weights)
         
-        # Score all applications
-        results = scoring_service.score_all_applications(job_data)
-        
-        # Convert to dataframe for visualization
-        results_df = Visualizer.create_results_dataframe(results)
+        # Score all applications and build the results dataframe, cached by dataset
+        # content, weights and configuration across reruns and sessions
+        results, results_df = get_cached_results(scoring_service, job_data)
+        delta_report = get_delta_report(scoring_service, job_data)
+        if delta_report is not None:
+            Visualizer.display_delta_report(delta_report)
         
         # Display component scores table
         st.subheader("Job Application Component Scores")
@@ -55,21 +56,37 @@ def render_dashboard(config_manager: ConfigManager):
         st.subheader("Score Visualization")
         
         # Display total scores chart
-        Visualizer.display_total_scores_chart(results_df)
+        Visualizer.display_total_scores_chart(results_df, config_manager.get_chart_settings())
         
         # Display component scores chart
-        Visualizer.display_component_scores_chart(results_df)
+        Visualizer.display_component_scores_chart(results_df, config_manager.get_chart_settings())
+        
+        # Display skill and certification gaps across all applications
+        st.subheader("Skill Gap Analysis")
+        Visualizer.display_gap_analysis(
+            get_cached_gap_report(scoring_service, job_data),
+            top_n=config_manager.get_chart_settings().get("top_n", 25)
+        )
         
-        # Display final scores table
+        # Display final scores table, paged from the results store when results are persisted
         st.header("Final Match Scores")
-        Visualizer.display_final_scores_table(results)
+        results_store, run_id = get_stored_run(scoring_service, job_data)
+        if run_id is not None:
+            Visualizer.display_stored_results(
+                results_store, run_id, config_manager.get_results_store_settings().get("page_size", 50),
+                key="dashboard_results_page", weights=scoring_service.weights
+            )
+        else:
+            Visualizer.display_final_scores_table(
+                results, top_k=config_manager.get_ranking_settings().get("display_top_k")
+            )
         
         # Export options
-        Visualizer.export_results(results)
+        Visualizer.export_results(results, get_export_cache(job_data, scoring_service.weights, config_manager.version))
         
         # Show detailed breakdown if debug mode is on
         if st.session_state.get('debug_mode', False):
-            Visualizer.display_debug_information(results)
+            Visualizer.display_debug_information(results, get_job_app_index(job_data), job_data)
             
     else:
         # No data to analyze, show instructions
@@ -77,7 +94,7 @@ def render_dashboard(config_manager: ConfigManager):
         
         if st.button("Use Sample Data"):
             # Load sample data
-            sample_data = DataManager.load_sample_jobs()
+            sample_data = load_sample_jobs()
             
             # Store in session state
             st.session_state.data_to_analyze = sample_data
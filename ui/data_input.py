@@ -8,6 +8,7 @@ from typing import Dict, List, Any
 from modules.config_manager import ConfigManager
 from modules.data_manager import DataManager
 from modules.scoring_service import ScoringService
+from ui.common import get_score_cache
 
 def render_data_input(config_manager: ConfigManager):
     """
@@ -82,9 +83,10 @@ def display_custom_job_form(config_manager: ConfigManager):
             
             # Get custom weights if they've been set
             if 'custom_weights' in st.session_state:
-                scoring_service = ScoringService(config_manager, st.session_state.custom_weights)
+                scoring_service = ScoringService(config_manager, st.session_state.custom_weights,
+                                                 score_cache=get_score_cache(config_manager))
             else:
-                scoring_service = ScoringService(config_manager)
+                scoring_service = ScoringService(config_manager, score_cache=get_score_cache(config_manager))
             
             # Score the job application
             result = scoring_service.score_job_application(job_app)
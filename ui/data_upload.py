@@ -6,7 +6,8 @@ import json
 from typing import Dict, List, Any
 
 from modules.data_manager import DataManager
-from ui.common import display_json_structure_example
+from ui.common import (display_data_preview, display_json_structure_example, load_sample_jobs, parse_upload,
+                       set_dataset_source)
 
 def render_data_upload():
     """Render the data upload tab with file upload and JSON input options"""
@@ -31,7 +32,7 @@ def render_data_upload():
     st.write("### Or use sample data")
     
     if st.button("Load Sample Data"):
-        sample_data = DataManager.load_sample_jobs()
+        sample_data = load_sample_jobs()
         st.session_state.data_to_analyze = sample_data
         st.session_state.using_uploaded_data = False
         st.rerun()
@@ -41,15 +42,12 @@ def render_data_upload():
 
 def handle_file_upload():
     """Handle file upload functionality"""
-    uploaded_file = st.file_uploader("Choose a JSON file", type="json")
+    uploaded_file = st.file_uploader("Choose a JSON file", type=["json", "ndjson", "jsonl"])
     
     if uploaded_file is not None:
         try:
-            # Read the uploaded file
-            content = uploaded_file.read().decode('utf-8')
-            
-            # Process the uploaded content
-            success, data, message = DataManager.parse_uploaded_json(content)
+            # Parse the uploaded bytes (JSON array or NDJSON) once per uploaded file
+            success, data, message = parse_upload(uploaded_file)
             
             if success:
                 st.success(f"File uploaded successfully! {len(data)} job applications loaded.")
@@ -58,13 +56,14 @@ def handle_file_upload():
                 st.session_state.uploaded_data = data
                 
                 # Show preview
-                with st.expander("Preview uploaded data", expanded=False):
-                    st.json(data)
+                display_data_preview(data)
                 
                 # Add button to run analysis on uploaded data
                 if st.button("Process Uploaded Data", key="process_upload"):
                     st.session_state.data_to_analyze = data
                     st.session_state.using_uploaded_data = True
+                    # Re-uploads of the same file are scored as a delta
+                    set_dataset_source(data, f"upload:{uploaded_file.name}")
                     st.rerun()
             else:
                 st.error(f"Invalid data format: {message}")
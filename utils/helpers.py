@@ -2,14 +2,36 @@
 Helper utilities for the job matching system.
 Contains common functions used across multiple modules.
 """
+import csv
+import io
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
-import pandas as pd
+import zipfile
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from modules.job_index import JobAppIndex
+from modules.ranking import select_top_k
+from modules.results import SCORE_FIELDS, ResultView, ScoreResults
+from modules.vocabulary import Items, Vocabulary
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Column order of CSV exports
+CSV_EXPORT_COLUMNS = [
+    "job_app_id", "total_score",
+    "core_skills_raw", "core_skills_weighted",
+    "experience_raw", "experience_weighted",
+    "education_raw", "education_weighted",
+    "certifications_raw", "certifications_weighted"
+]
+
 def ensure_directory_exists(directory_path: str) -> bool:
     """
     Ensure a directory exists, creating it if necessary
@@ -104,34 +126,37 @@ def calculate_percentage(numerator: Union[int, float], denominator: Union[int, f
         return default
     return (numerator / denominator) * 100.0
 
-def export_results_to_csv(results: List[Dict[str, Any]], file_path: str) -> bool:
+def export_results_to_csv(results: List[Dict[str, Any]], file_path: str, top_k: Optional[int] = None) -> bool:
     """
     Export scoring results to a CSV file
     
     Args:
-        results: List of scoring result dictionaries
+        results: Scoring result dictionaries (e.g. from ScoringService.rank_top_k) or ScoreResults
         file_path: Path to save the CSV file
+        top_k: Optional number of best results to export, ordered by score
         
     Returns:
         True if successful, False on error
     """
     try:
-        # Create a simplified dataframe with results
-        df = pd.DataFrame([{
-            "job_app_id": r["job_app_id"],
-            "total_score": r["total_score"],
-            "core_skills_raw": r["scores"]["core_skills"]["raw_score"],
-            "core_skills_weighted": r["scores"]["core_skills"]["weighted_score"],
-            "experience_raw": r["scores"]["experience"]["raw_score"],
-            "experience_weighted": r["scores"]["experience"]["weighted_score"],
-            "education_raw": r["scores"]["education"]["raw_score"],
-            "education_weighted": r["scores"]["education"]["weighted_score"],
-            "certifications_raw": r["scores"]["certifications"]["raw_score"],
-            "certifications_weighted": r["scores"]["certifications"]["weighted_score"]
-        } for r in results])
+        if top_k:
+            results = select_top_k(results, top_k)
+        
+        # Score columns are always written as floats, matching a float64 DataFrame column
+        if isinstance(results, ScoreResults):
+            columns = results.block[:, [SCORE_FIELDS.index(name) for name in CSV_EXPORT_COLUMNS[1:]]].tolist()
+            rows = ([job_app_id] + scores for job_app_id, scores in zip(results.job_app_ids, columns))
+        else:
+            rows = ([r["job_app_id"], float(r["total_score"])] + [
+                float(r["scores"][name][key]) for name in ("core_skills", "experience", "education", "certifications")
+                for key in ("raw_score", "weighted_score")
+            ] for r in results)
         
-        # Save to CSV
-        df.to_csv(file_path, index=False)
+        # Write with the csv module so exports do not need pandas
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(CSV_EXPORT_COLUMNS)
+            writer.writerows(rows)
         
         logger.info(f"Results exported to {file_path}")
         return True
@@ -139,42 +164,266 @@ def export_results_to_csv(results: List[Dict[str, Any]], file_path: str) -> bool
         logger.error(f"Error exporting results to {file_path}: {str(e)}")
         return False
 
-def export_results_to_json(results: List[Dict[str, Any]], file_path: str) -> bool:
+def export_results_to_json(results: List[Dict[str, Any]], file_path: str, top_k: Optional[int] = None) -> bool:
     """
     Export scoring results to a JSON file
     
     Args:
-        results: List of scoring result dictionaries
+        results: Scoring result dictionaries (e.g. from ScoringService.rank_top_k) or ScoreResults
         file_path: Path to save the JSON file
+        top_k: Optional number of best results to export, ordered by score
         
     Returns:
         True if successful, False on error
     """
+    if top_k:
+        results = select_top_k(results, top_k)
+    
     # Create a simplified version for export
-    export_data = [{
-        "job_app_id": r["job_app_id"],
-        "total_score": r["total_score"],
-        "component_scores": {
-            "core_skills": r["scores"]["core_skills"]["raw_score"],
-            "experience": r["scores"]["experience"]["raw_score"],
-            "education": r["scores"]["education"]["raw_score"],
-            "certifications": r["scores"]["certifications"]["raw_score"]
-        }
-    } for r in results]
+    if isinstance(results, ScoreResults):
+        # Raw columns are in COMPONENTS order: core skills, experience, education, certifications
+        export_data = [{
+            "job_app_id": job_app_id,
+            "total_score": total_score,
+            "component_scores": {
+                "core_skills": core_skills,
+                "experience": experience,
+                "education": education,
+                "certifications": certifications
+            }
+        } for job_app_id, total_score, core_skills, experience, education, certifications
+            in zip(results.job_app_ids, results.totals.tolist(), *results.raw.T.tolist())]
+    else:
+        export_data = [{
+            "job_app_id": r["job_app_id"],
+            "total_score": r["total_score"],
+            "component_scores": {
+                "core_skills": r["scores"]["core_skills"]["raw_score"],
+                "experience": r["scores"]["experience"]["raw_score"],
+                "education": r["scores"]["education"]["raw_score"],
+                "certifications": r["scores"]["certifications"]["raw_score"]
+            }
+        } for r in results]
     
     # Save to file
     return save_json_file(export_data, file_path)
 
-def create_component_breakdown(result: Dict[str, Any]) -> pd.DataFrame:
+def _id_column(job_app_ids: List[Any]) -> np.ndarray:
+    """Job application IDs as an int64 array, or as strings when not all integers"""
+    if all(type(job_app_id) is int for job_app_id in job_app_ids):
+        return np.array(job_app_ids, dtype=np.int64)
+    return np.array([str(job_app_id) for job_app_id in job_app_ids], dtype=str)
+
+def export_results_to_columnar(results: List[Dict[str, Any]], file_path: str, top_k: Optional[int] = None,
+                               row_group_size: int = 100000, file_format: Optional[str] = None) -> bool:
+    """
+    Export scoring results column by column in fixed-size row groups
+    
+    Writes Parquet when pyarrow is installed, otherwise a compressed .npz
+    archive holding one "<group>/<column>.npy" member per row group and column.
+    Columns are those of the CSV export.
+    
+    Args:
+        results: Scoring result dictionaries or ScoreResults
+        file_path: Path to save the file
+        top_k: Optional number of best results to export, ordered by score
+        row_group_size: Number of rows per row group
+        file_format: "parquet" or "npz"; by default taken from the file extension,
+            else Parquet when pyarrow is available
+        
+    Returns:
+        True if successful, False on error
+    """
+    try:
+        results = ScoreResults.from_results(results)
+        if top_k:
+            results = results.top_k(top_k)
+        
+        try:
+            import pyarrow
+            import pyarrow.parquet as parquet
+        except ImportError:  # Optional dependency, .npz is written instead
+            pyarrow = None
+        
+        if file_format is None:
+            extension = os.path.splitext(file_path)[1].lower()
+            file_format = {".parquet": "parquet", ".npz": "npz"}.get(extension)
+            file_format = file_format or ("parquet" if pyarrow is not None else "npz")
+        if file_format == "parquet" and pyarrow is None:
+            logger.error("Parquet export requires pyarrow; use a .npz file instead")
+            return False
+        
+        if os.path.dirname(file_path):
+            ensure_directory_exists(os.path.dirname(file_path))
+        job_app_ids = _id_column(results.job_app_ids)
+        score_columns = [SCORE_FIELDS.index(name) for name in CSV_EXPORT_COLUMNS[1:]]
+        row_group_size = max(int(row_group_size), 1)
+        groups = range(0, len(results), row_group_size)
+        
+        if file_format == "parquet":
+            schema = pyarrow.schema(
+                [("job_app_id", pyarrow.from_numpy_dtype(job_app_ids.dtype) if job_app_ids.dtype.kind == "i"
+                  else pyarrow.string())]
+                + [(name, pyarrow.float64()) for name in CSV_EXPORT_COLUMNS[1:]]
+            )
+            with parquet.ParquetWriter(file_path, schema) as writer:
+                for start in groups:
+                    block = results.block[start:start + row_group_size]
+                    writer.write_table(pyarrow.Table.from_arrays(
+                        [pyarrow.array(job_app_ids[start:start + row_group_size])]
+                        + [pyarrow.array(block[:, column]) for column in score_columns],
+                        schema=schema
+                    ))
+        else:
+            with zipfile.ZipFile(file_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for group, start in enumerate(groups):
+                    block = results.block[start:start + row_group_size]
+                    columns = [job_app_ids[start:start + row_group_size]] + [
+                        np.ascontiguousarray(block[:, column]) for column in score_columns
+                    ]
+                    for name, column in zip(CSV_EXPORT_COLUMNS, columns):
+                        with archive.open(f"{group:05d}/{name}.npy", "w", force_zip64=True) as member:
+                            np.lib.format.write_array(member, column, allow_pickle=False)
+        
+        logger.info(f"Results exported to {file_path} ({file_format}, {len(groups)} row groups)")
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting results to {file_path}: {str(e)}")
+        return False
+
+def read_columnar_results(file_path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a file written by export_results_to_columnar
+    
+    Args:
+        file_path: Parquet or .npz file
+        
+    Returns:
+        Dictionary mapping column names to arrays
+    """
+    if not zipfile.is_zipfile(file_path):
+        import pyarrow.parquet as parquet
+        
+        table = parquet.read_table(file_path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    
+    with np.load(file_path, allow_pickle=False) as archive:
+        groups = sorted({key.split("/")[0] for key in archive.files})
+        return {
+            name: np.concatenate([archive[f"{group}/{name}"] for group in groups]) if groups
+            else np.empty(0, dtype=np.int64 if name == "job_app_id" else np.float64)
+            for name in CSV_EXPORT_COLUMNS
+        }
+
+# Rows serialized per chunk by the streaming exporters
+EXPORT_CHUNK_ROWS = 10000
+
+def iter_results_csv(results: List[Dict[str, Any]], score_columns: List[str],
+                     chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Serialize scoring results to UTF-8 CSV, one chunk of rows at a time
+    
+    Args:
+        results: Scoring result dictionaries or ScoreResults
+        score_columns: SCORE_FIELDS names written after the job_app_id column
+        chunk_rows: Number of rows per yielded chunk
+        
+    Returns:
+        Iterator over CSV byte chunks, the header first
+    """
+    results = ScoreResults.from_results(results)
+    fields = [SCORE_FIELDS.index(name) for name in score_columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator=os.linesep)
+    writer.writerow(["job_app_id"] + list(score_columns))
+    yield buffer.getvalue().encode("utf-8")
+    
+    for start in range(0, len(results), chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        job_app_ids = results.job_app_ids[start:start + chunk_rows]
+        scores = results.block[start:start + chunk_rows, fields].tolist()
+        writer.writerows([job_app_id] + row for job_app_id, row in zip(job_app_ids, scores))
+        yield buffer.getvalue().encode("utf-8")
+
+def iter_results_json(results: List[Dict[str, Any]], score_columns: List[str],
+                      chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Serialize scoring results to a UTF-8 JSON array, one chunk of rows at a time
+    
+    The output matches json.dumps of the equivalent list of records with indent=2.
+    
+    Args:
+        results: Scoring result dictionaries or ScoreResults
+        score_columns: SCORE_FIELDS names written after the job_app_id key
+        chunk_rows: Number of records per yielded chunk
+        
+    Returns:
+        Iterator over JSON byte chunks
+    """
+    results = ScoreResults.from_results(results)
+    if not len(results):
+        yield b"[]"
+        return
+    
+    fields = [SCORE_FIELDS.index(name) for name in score_columns]
+    keys = ["job_app_id"] + list(score_columns)
+    template = "  {{\n" + ",\n".join(f"    {json.dumps(key)}: {{}}" for key in keys) + "\n  }}"
+    
+    yield b"[\n"
+    for start in range(0, len(results), chunk_rows):
+        job_app_ids = results.job_app_ids[start:start + chunk_rows]
+        scores = results.block[start:start + chunk_rows, fields].tolist()
+        records = ",\n".join(
+            template.format(*map(json.dumps, [job_app_id] + row))
+            for job_app_id, row in zip(job_app_ids, scores)
+        )
+        yield ((",\n" if start else "") + records).encode("utf-8")
+    yield b"\n]"
+
+def gzip_chunks(chunks: Iterable[bytes], compression_level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of byte chunks incrementally
+    
+    Args:
+        chunks: Byte chunks to compress
+        compression_level: zlib compression level (1-9)
+        
+    Returns:
+        Iterator over chunks of one gzip stream
+    """
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def create_component_breakdown(result: Dict[str, Any]) -> "pd.DataFrame":
     """
     Create a component breakdown DataFrame for a single job application result
     
     Args:
-        result: Scoring result dictionary
+        result: Scoring result dictionary or ResultView
         
     Returns:
         Pandas DataFrame with component breakdown
     """
+    import pandas as pd
+    
+    if isinstance(result, ResultView):
+        # Compact results already hold both score rows in component order
+        raw_scores = result.raw_scores.tolist()
+        weighted_scores = result.weighted_scores.tolist()
+        total_score = result["total_score"]
+        return pd.DataFrame({
+            "Component": ["Core Skills", "Experience", "Education", "Certifications"],
+            "Raw Score": raw_scores,
+            "Weighted Score": weighted_scores,
+            "Contribution (%)": [(score / total_score) * 100 for score in weighted_scores]
+            if total_score > 0 else [0, 0, 0, 0]
+        })
+    
     component_data = {
         "Component": ["Core Skills", "Experience", "Education", "Certifications"],
         "Raw Score": [
@@ -205,57 +454,84 @@ def create_component_breakdown(result: Dict[str, Any]) -> pd.DataFrame:
     
     return pd.DataFrame(component_data)
 
-def find_job_app_by_id(job_apps: List[Dict[str, Any]], job_app_id: int) -> Optional[Dict[str, Any]]:
+def find_job_app_by_id(job_apps: List[Dict[str, Any]], job_app_id: int,
+                       index: Optional[JobAppIndex] = None) -> Optional[Dict[str, Any]]:
     """
     Find a job application by ID
     
     Args:
         job_apps: List of job applications
         job_app_id: ID to search for
+        index: Optional JobAppIndex of job_apps for a constant-time lookup
         
     Returns:
         Job application dictionary or None if not found
     """
+    if index is not None:
+        return index.get(job_apps, job_app_id)
+    
     for job_app in job_apps:
         if job_app.get("job_app_id") == job_app_id:
             return job_app
     return None
 
-def get_matching_items(required_items: List[str], provided_items: List[str]) -> List[str]:
+def get_matching_items(required_items: Items, provided_items: Items,
+                       vocabulary: Optional[Vocabulary] = None) -> Union[List[str], int]:
     """
     Get list of matching items between two lists
     
     Args:
-        required_items: List of required items
-        provided_items: List of provided items
+        required_items: List or bitset of required items
+        provided_items: List or bitset of provided items
+        vocabulary: Vocabulary used to decode bitsets; if omitted, bitset
+            inputs return a bitset
         
     Returns:
         List of matching items
     """
-    return [item for item in required_items if item in provided_items]
+    if isinstance(required_items, int):
+        return _bitset_result(required_items & provided_items, vocabulary)
+    provided_set = set(provided_items)
+    return [item for item in required_items if item in provided_set]
 
-def get_missing_items(required_items: List[str], provided_items: List[str]) -> List[str]:
+def get_missing_items(required_items: Items, provided_items: Items,
+                      vocabulary: Optional[Vocabulary] = None) -> Union[List[str], int]:
     """
     Get list of missing items that are required but not provided
     
     Args:
-        required_items: List of required items
-        provided_items: List of provided items
+        required_items: List or bitset of required items
+        provided_items: List or bitset of provided items
+        vocabulary: Vocabulary used to decode bitsets; if omitted, bitset
+            inputs return a bitset
         
     Returns:
         List of missing items
     """
-    return [item for item in required_items if item not in provided_items]
+    if isinstance(required_items, int):
+        return _bitset_result(required_items & ~provided_items, vocabulary)
+    provided_set = set(provided_items)
+    return [item for item in required_items if item not in provided_set]
 
-def get_extra_items(required_items: List[str], provided_items: List[str]) -> List[str]:
+def get_extra_items(required_items: Items, provided_items: Items,
+                    vocabulary: Optional[Vocabulary] = None) -> Union[List[str], int]:
     """
     Get list of extra items that are provided but not required
     
     Args:
-        required_items: List of required items
-        provided_items: List of provided items
+        required_items: List or bitset of required items
+        provided_items: List or bitset of provided items
+        vocabulary: Vocabulary used to decode bitsets; if omitted, bitset
+            inputs return a bitset
         
     Returns:
         List of extra items
     """
-    return [item for item in provided_items if item not in required_items]
\ No newline at end of file
+    if isinstance(required_items, int):
+        return _bitset_result(provided_items & ~required_items, vocabulary)
+    required_set = set(required_items)
+    return [item for item in provided_items if item not in required_set]
+
+def _bitset_result(bits: int, vocabulary: Optional[Vocabulary]) -> Union[List[str], int]:
+    """Decode a bitset result when a vocabulary is available"""
+    return vocabulary.decode(bits) if vocabulary is not None else bits
\ No newline at end of file